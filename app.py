@@ -9,18 +9,18 @@ Esta aplicação oferece interface interativa para:
 """
 
 import streamlit as st
-import pandas as pd
-from decimal import Decimal
 import os
+from datetime import datetime
 from dotenv import load_dotenv
 
-from src.infrastructure.google_sheets_adapter import GoogleSheetsAdapter
-from src.domain.cost_analysis_service import CostAnalysisService
-from src.ports.data_source import DataSourceError
-
-# Carregar variáveis de ambiente
+# Carregar variáveis de ambiente (antes dos módulos que leem configurações)
 load_dotenv()
 
+# Só o necessário para desenhar o cabeçalho e a barra lateral é importado aqui:
+# gspread, pandas, pyarrow e as páginas (src/ui/pages) são carregados sob
+# demanda, dentro das funções que os usam.
+from src.ui import common  # noqa: E402
+
 # Configuração da página
 st.set_page_config(
     page_title="Vava Doces - Análise de Custos",
@@ -85,51 +85,201 @@ st.markdown("""
 # INICIALIZAÇÃO E CACHE
 # =====================================================================
 
+# Tempo (s) em que cada planilha é servida da memória antes de conferir a revisão
+CACHE_TTL_POR_PLANILHA = {
+    "Cadastro Produtos": 300.0,
+    "Matéria Prima": 300.0,
+    "Análise por Categoria": 300.0,
+}
+
+
+def get_lojas():
+    """
+    Planilhas das lojas, de GOOGLE_SHEET_IDS ("Centro=<id>,Shopping=<id>";
+    um id sem nome vira "Loja N"). Vazio quando há uma loja só (GOOGLE_SHEET_ID).
+    """
+    lojas = {}
+    for i, item in enumerate(os.getenv("GOOGLE_SHEET_IDS", "").split(","), start=1):
+        nome, _, sheet_id = item.strip().rpartition("=")
+        if sheet_id.strip():
+            lojas[nome.strip() or f"Loja {i}"] = sheet_id.strip()
+    return lojas
+
+
+@st.cache_resource
+def get_rate_limiter():
+    """Cota da API (por usuário, não por planilha): compartilhada por todas as lojas."""
+    from src.infrastructure.throttling import TokenBucket
+
+    return TokenBucket(rate_per_minute=float(os.getenv("VAVA_SHEETS_QUOTA_PER_MIN", "60")))
+
+
+@st.cache_resource
+def get_sheets_adapter(sheet_id=None):
+    """Cria o adaptador Google Sheets (com os tipos de coluna de cada planilha)."""
+    from src.infrastructure.google_sheets_adapter import GoogleSheetsAdapter
+    from src.infrastructure.sheet_schemas import SHEET_SCHEMAS
+
+    credential_file = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    sheet_id = sheet_id or os.getenv("GOOGLE_SHEET_ID")
+
+    return GoogleSheetsAdapter(
+        credential_file=credential_file,
+        sheet_id=sheet_id,
+        schemas=SHEET_SCHEMAS,
+        rate_limiter=get_rate_limiter(),
+        # Servidor local que imita a API (benchmarks/sheets_server.py), para uso offline
+        endpoint=os.getenv("VAVA_SHEETS_ENDPOINT"),
+        # Linhas incluídas (ex.: vendas) vão em lote; o diário guarda as que ainda não foram enviadas
+        write_batch_rows=int(os.getenv("VAVA_WRITE_BATCH_ROWS", "100")),
+        write_delay=float(os.getenv("VAVA_WRITE_DELAY", "5")),
+        journal_path=os.path.join(os.getenv("VAVA_JOURNAL_DIR", ".journal"), f"{sheet_id or 'planilha'}.jsonl"),
+    )
+
+
+def sheets_adapters():
+    """Adaptadores Google Sheets em uso (um por loja)."""
+    lojas = get_lojas()
+    return [get_sheets_adapter(sheet_id) for sheet_id in lojas.values()] if lojas else [get_sheets_adapter()]
+
+
+def store_source(sheet_id=None, snapshot_dir=None):
+    """Planilha de uma loja com sincronização incremental e snapshots em disco."""
+    from src.infrastructure.incremental_sync import IncrementalSyncDataSource
+    from src.infrastructure.snapshot_data_source import SnapshotDataSource
+
+    append_only = os.getenv("VAVA_APPEND_ONLY_SHEETS", "Vendas Diárias")
+    adapter = IncrementalSyncDataSource(
+        get_sheets_adapter(sheet_id),
+        append_only=[name.strip() for name in append_only.split(",") if name.strip()],
+        full_sync_every=int(os.getenv("VAVA_FULL_SYNC_EVERY", "20")),
+        full_sync_interval=float(os.getenv("VAVA_FULL_SYNC_INTERVAL", "600")),
+    )
+    return SnapshotDataSource(
+        adapter,
+        directory=snapshot_dir or os.getenv("VAVA_SNAPSHOT_DIR", ".snapshots"),
+        max_age=float(os.getenv("VAVA_SNAPSHOT_MAX_AGE", "60")),
+    )
+
+
 @st.cache_resource
 def get_adapter():
-    """Cria instância do adaptador Google Sheets com cache."""
+    """
+    Cria o adaptador Google Sheets envolto em:
+    - sincronização incremental das planilhas só de inclusão (ex.: vendas);
+    - snapshots em disco (partida instantânea e modo offline);
+    - com várias lojas, leitura das planilhas de todas em paralelo, com
+      cache por loja e coluna "loja" em cada linha;
+    - cache em memória compartilhado entre sessões.
+    """
     try:
-        credential_file = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        sheet_id = os.getenv("GOOGLE_SHEET_ID")
+        from src.infrastructure.cached_data_source import CachedDataSource
+
+        excel_path = os.getenv("VAVA_EXCEL_PATH")
+        max_bytes = int(float(os.getenv("VAVA_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        ttl = float(os.getenv("VAVA_CACHE_TTL", "60"))
+
+        if excel_path:
+            from src.infrastructure.excel_data_source import ExcelDataSource
+
+            # Planilha local: sem rede, sem necessidade de snapshots
+            return CachedDataSource(ExcelDataSource(excel_path), ttl=ttl)
+
+        lojas = get_lojas()
+        if lojas:
+            from src.infrastructure.federated_data_source import FederatedDataSource
+
+            # Cada loja tem seu cache: quando só uma planilha muda, só ela é lida de novo
+            snapshot_dir = os.getenv("VAVA_SNAPSHOT_DIR", ".snapshots")
+            compartilhadas = os.getenv("VAVA_SHARED_SHEETS", "Custos,Cadastro Produtos,Matéria Prima")
+            fonte = FederatedDataSource(
+                {
+                    nome: CachedDataSource(
+                        store_source(sheet_id, os.path.join(snapshot_dir, sheet_id)),
+                        max_bytes=max_bytes // len(lojas),
+                        ttl=ttl,
+                        ttl_per_sheet=CACHE_TTL_POR_PLANILHA,
+                    )
+                    for nome, sheet_id in lojas.items()
+                },
+                shared=[name.strip() for name in compartilhadas.split(",") if name.strip()],
+            )
+        else:
+            fonte = store_source()
 
-        adapter = GoogleSheetsAdapter(
-            credential_file=credential_file,
-            sheet_id=sheet_id
+        return CachedDataSource(
+            fonte,
+            max_bytes=max_bytes,
+            ttl=ttl,
+            ttl_per_sheet=CACHE_TTL_POR_PLANILHA,
         )
-        return adapter
     except Exception as e:
         st.error(f"❌ Erro ao conectar com Google Sheets: {e}")
         return None
 
 
-def get_service(adapter):
-    """Cria instância do serviço de análise de custos."""
-    if adapter is None:
+@st.cache_resource
+def get_refresher(_adapter):
+    """Inicia (uma vez por servidor) a atualização periódica do cache em segundo plano."""
+    from src.infrastructure.background_refresher import BackgroundRefresher
+
+    sheets = os.getenv("VAVA_REFRESH_SHEETS")
+    sheet_names = [name.strip() for name in sheets.split(",") if name.strip()] if sheets else common.PLANILHAS_ATUALIZADAS
+    refresher = BackgroundRefresher(
+        _adapter,
+        sheet_names=sheet_names,
+        interval=float(os.getenv("VAVA_REFRESH_INTERVAL", "30")),
+    )
+    return refresher.start()
+
+
+@st.cache_resource
+def get_instrumented(_adapter):
+    """Envolve a fonte de dados com métricas por planilha e por página."""
+    from src.infrastructure.instrumented_data_source import InstrumentedDataSource
+
+    return InstrumentedDataSource(_adapter)
+
+
+@st.cache_resource
+def get_margin_service(_adapter):
+    """Serviço de margens (resultados guardados pelas versões de Custos e Faturamento)."""
+    from src.domain.margin_analysis import MarginAnalysisService
+
+    return MarginAnalysisService(_adapter)
+
+
+@st.cache_resource
+def get_sales_series(_adapter):
+    """Agregados diários/semanais/mensais de Vendas Diárias, atualizados só com as linhas novas."""
+    from src.domain.sales_timeseries import SalesTimeSeriesService
+
+    return SalesTimeSeriesService(_adapter)
+
+
+@st.cache_resource
+def get_service(_adapter):
+    """Serviço de análise de custos, um por servidor (grafo de receitas guardado pela versão de Custos)."""
+    if _adapter is None:
         return None
-    return CostAnalysisService(data_source=adapter)
+    from src.domain.cost_analysis_service import CostAnalysisService
+    from src.infrastructure.sheet_diff import diff_frames
+
+    return CostAnalysisService(data_source=_adapter, loader=common.get_loader(_adapter), differ=diff_frames)
 
 
 # =====================================================================
-# FUNÇÕES AUXILIARES
+# FUNÇÕES AUXILIARES (implementadas em src/ui/common.py)
 # =====================================================================
 
 def format_currency(value):
     """Formata um valor em moeda brasileira."""
-    if isinstance(value, Decimal):
-        return f"R$ {float(value):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    return f"R$ {float(value):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return common.format_currency(value)
 
 
 def load_data_from_sheet(adapter, sheet_name):
     """Carrega dados de uma planilha específica."""
-    try:
-        return adapter.get_data(sheet_name)
-    except DataSourceError as e:
-        st.error(f"❌ Erro ao carregar dados de '{sheet_name}': {e}")
-        return None
-    except Exception as e:
-        st.error(f"❌ Erro inesperado: {e}")
-        return None
+    return common.load_data_from_sheet(adapter, sheet_name)
 
 
 # =====================================================================
@@ -163,11 +313,48 @@ def main():
         # Status de conexão
         adapter = get_adapter()
         if adapter:
-            st.success("✅ Conectado ao Google Sheets")
+            lojas = get_lojas()
+            st.success(f"✅ Conectado ao Google Sheets ({len(lojas)} lojas)" if lojas else "✅ Conectado ao Google Sheets")
         else:
             st.error("❌ Desconectado - Configure as credenciais")
             st.stop()
 
+        # Atualização em segundo plano e contadores do cache de planilhas
+        refresher = get_refresher(adapter)
+        if refresher.last_refreshed_at:
+            data_as_of = datetime.fromtimestamp(refresher.last_refreshed_at).strftime("%d/%m/%Y %H:%M:%S")
+            st.caption(f"🕒 Dados de {data_as_of}")
+        if refresher.last_error:
+            st.warning(f"⚠️ Dados podem estar desatualizados: {refresher.last_error}")
+        cache_stats = adapter.stats()
+        st.caption(
+            f"🗄️ Cache: {cache_stats['hits']} acertos · {cache_stats['misses']} leituras · "
+            f"{cache_stats['hit_ratio']:.0%} de aproveitamento"
+        )
+        if not os.getenv("VAVA_EXCEL_PATH"):
+            adaptadores = sheets_adapters()
+            saved = sum(report.bytes_saved for a in adaptadores for report in a.ingest_reports.values())
+            if saved > 0:
+                st.caption(f"🧮 Tipagem das planilhas: {saved / 1024 / 1024:.1f} MB economizados")
+            # A cota é uma só para todas as lojas; novas tentativas e leituras compartilhadas somam
+            por_loja = [a.throttle_stats() for a in adaptadores]
+            throttle = dict(por_loja[0])
+            for chave in ("retries", "coalesced", "rate_limited_responses"):
+                throttle[chave] = sum(stats[chave] for stats in por_loja)
+            if throttle["throttled"] or throttle["retries"]:
+                st.caption(
+                    f"⏳ Cota da API: {throttle['throttled']} esperas ({throttle['throttled_seconds']:.0f}s) · "
+                    f"{throttle['retries']} novas tentativas · {throttle['coalesced']} leituras compartilhadas"
+                )
+            falhas = getattr(adapter.inner, "failures", None)
+            if falhas:
+                lojas = sorted({loja for erros in falhas.values() for loja in erros})
+                st.warning(f"⚠️ Sem dados de: {', '.join(lojas)} (tentando de novo)")
+            aguardando = sum(a.writer.pending() for a in adaptadores)
+            if aguardando:
+                erro = next((a.writer.last_error for a in adaptadores if a.writer.last_error), None)
+                st.caption(f"📝 {aguardando} linha(s) aguardando envio" + (f" · ⚠️ {erro}" if erro else ""))
+
         # Menu de navegação
         page = st.radio(
             "Selecione uma página:",
@@ -182,414 +369,115 @@ def main():
             ]
         )
 
+    # Leituras das páginas passam pela instrumentação (métricas por planilha/página)
+    fonte = get_instrumented(adapter)
+
     # Inicializar serviço
-    service = get_service(adapter)
+    service = get_service(fonte)
     if service is None:
         st.error("❌ Falha ao inicializar serviço de análise")
         st.stop()
 
-    # Renderizar página selecionada
-    if page == "📊 Dashboard":
-        show_dashboard(service, adapter)
-    elif page == "📦 Cadastro de Produtos":
-        show_produtos(adapter)
-    elif page == "🥘 Matéria Prima":
-        show_materia_prima(adapter)
-    elif page == "💳 Vendas Diárias":
-        show_vendas_diarias(adapter)
-    elif page == "📈 Resumo Diário":
-        show_resumo_diario(adapter)
-    elif page == "📊 Análise por Categoria":
-        show_analise_categoria(adapter)
-    elif page == "🔍 Análise Detalhada":
-        show_analise_detalhada(service)
+    # Renderizar página selecionada (o módulo da página só é importado aqui)
+    from src.infrastructure.instrumented_data_source import page_label
+
+    with page_label(page):
+        if page == "📊 Dashboard":
+            show_dashboard(service, fonte)
+        elif page == "📦 Cadastro de Produtos":
+            show_produtos(fonte)
+        elif page == "🥘 Matéria Prima":
+            show_materia_prima(fonte)
+        elif page == "💳 Vendas Diárias":
+            show_vendas_diarias(fonte, get_sales_series(fonte))
+        elif page == "📈 Resumo Diário":
+            show_resumo_diario(fonte)
+        elif page == "📊 Análise por Categoria":
+            show_analise_categoria(fonte)
+        elif page == "🔍 Análise Detalhada":
+            show_analise_detalhada(service, get_margin_service(fonte))
+
+    metrics_file = os.getenv("VAVA_METRICS_FILE")
+    if metrics_file:
+        try:
+            fonte.write_prometheus(metrics_file)
+        except OSError as e:
+            st.sidebar.caption(f"⚠️ Não foi possível gravar métricas em '{metrics_file}': {e}")
+
+    with st.sidebar:
+        show_diagnostico(fonte)
+
+
+def show_diagnostico(fonte):
+    """Seção opcional da barra lateral com as métricas da fonte de dados."""
+    ativo = st.checkbox("🩺 Diagnóstico da fonte de dados", value=os.getenv("VAVA_DIAGNOSTICS") == "1")
+    if not ativo:
+        return
+
+    import pandas as pd
+
+    linhas = fonte.snapshot()
+    if not linhas:
+        st.caption("Nenhuma leitura registrada ainda.")
+        return
+
+    diagnostico_df = pd.DataFrame(linhas)
+    diagnostico_df["bytes"] = diagnostico_df["bytes"] / 1024 / 1024
+    for col in ["mean_s", "p50_s", "p95_s"]:
+        diagnostico_df[col] = diagnostico_df[col] * 1000
+    diagnostico_df = diagnostico_df.rename(columns={
+        "sheet": "Planilha",
+        "page": "Página",
+        "calls": "Leituras",
+        "errors": "Erros",
+        "rows": "Linhas",
+        "bytes": "MB",
+        "mean_s": "Média (ms)",
+        "p50_s": "p50 (ms)",
+        "p95_s": "p95 (ms)",
+        "cache_hit_ratio": "Acerto do cache",
+    }).sort_values("p95 (ms)", ascending=False)
+    st.dataframe(diagnostico_df.round(2), use_container_width=True, hide_index=True)
 
 
 # =====================================================================
-# PÁGINA: DASHBOARD
+# PÁGINAS (src/ui/pages; cada módulo é importado na primeira vez que a
+# página é aberta)
 # =====================================================================
 
 def show_dashboard(service, adapter):
-    st.header("📊 Dashboard")
-    st.markdown("---")
-
-    try:
-        # Carregar dados
-        produtos_df = load_data_from_sheet(adapter, "Cadastro Produtos")
-        vendas_df = load_data_from_sheet(adapter, "Vendas Diárias")
-        resumo_df = load_data_from_sheet(adapter, "Resumo Diário")
-
-        if produtos_df is None or produtos_df.empty:
-            st.warning("⚠️ Nenhum dado disponível")
-            return
-
-        # Métricas principais
-        col1, col2, col3, col4 = st.columns(4)
-
-        # Renderizar cards métricos
-        def render_metric(col, title, value):
-            with col:
-                st.markdown(f"<div class='metric-card'><div class='card-title'>{title}</div><div class='card-value'>{value}</div></div>", unsafe_allow_html=True)
-
-        total_produtos = len(produtos_df) if produtos_df is not None else 0
-        total_vendas = len(vendas_df) if vendas_df is not None else 0
-
-        # Tentar calcular totais de vendas se existirem colunas numéricas
-        total_valor_vendas = "R$ 0,00"
-        if vendas_df is not None and not vendas_df.empty:
-            numeric_cols = vendas_df.select_dtypes(include=['number']).columns
-            if len(numeric_cols) > 0:
-                total_valor_vendas = format_currency(vendas_df[numeric_cols[0]].sum())
+    from src.ui.pages import dashboard
+    dashboard.show_dashboard(service, adapter)
 
-        render_metric(col1, '📦 Total de Produtos', f"{total_produtos}")
-        render_metric(col2, '💳 Total de Vendas', f"{total_vendas}")
-        render_metric(col3, '💰 Valor Total Vendas', total_valor_vendas)
-        render_metric(col4, '📊 Categorias', f"{len(produtos_df['Categoria'].unique()) if 'Categoria' in produtos_df.columns else 0}")
-
-        st.markdown("---")
-
-        # Gráficos
-        st.subheader("📈 Produtos por Categoria")
-
-        if "Categoria" in produtos_df.columns:
-            categoria_count = produtos_df['Categoria'].value_counts()
-            st.bar_chart(categoria_count)
-
-        st.markdown("---")
-
-        # Tabelas com resumo
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.subheader("📋 Últimos Produtos Cadastrados")
-            if produtos_df is not None and not produtos_df.empty:
-                display_df = produtos_df.tail(5).copy()
-                st.dataframe(display_df, use_container_width=True)
-            else:
-                st.info("Nenhum dado disponível")
-
-        with col2:
-            st.subheader("💳 Últimas Vendas")
-            if vendas_df is not None and not vendas_df.empty:
-                display_df = vendas_df.tail(5).copy()
-                st.dataframe(display_df, use_container_width=True)
-            else:
-                st.info("Nenhum dado disponível")
-
-
-    except Exception as e:
-        st.error(f"❌ Erro ao processar dashboard: {e}")
-# =====================================================================
-# PÁGINA: CADASTRO DE PRODUTOS
-# =====================================================================
 
 def show_produtos(adapter):
-    st.header("📦 Cadastro de Produtos")
-    st.markdown("---")
-
-    try:
-        df = load_data_from_sheet(adapter, "Cadastro Produtos")
-
-        if df is None or df.empty:
-            st.warning("⚠️ Nenhum produto cadastrado")
-            return
-
-        # Estatísticas
-        col1, col2, col3 = st.columns(3)
+    from src.ui.pages import produtos
+    produtos.show_produtos(adapter)
 
-        with col1:
-            st.metric("📦 Total de Produtos", len(df))
-
-        with col2:
-            if "Categoria" in df.columns:
-                st.metric("📊 Categorias", df["Categoria"].nunique())
-
-        with col3:
-            if "Preço" in df.columns or "preco" in [c.lower() for c in df.columns]:
-                price_col = [c for c in df.columns if c.lower() == "preco" or c.lower() == "preço"][0] if any(c.lower() in ["preco", "preço"] for c in df.columns) else None
-                if price_col:
-                    st.metric("💰 Preço Médio", format_currency(df[price_col].mean()))
-
-        st.markdown("---")
-
-        # Filtros
-        col1, col2 = st.columns(2)
-
-        selected_category = None
-        if "Categoria" in df.columns:
-            with col1:
-                categories = df["Categoria"].unique()
-                selected_category = st.multiselect(
-                    "Filtrar por categoria:",
-                    options=categories,
-                    default=categories if len(categories) <= 5 else list(categories[:5])
-                )
-
-        # Aplicar filtro
-        if selected_category:
-            df_filtered = df[df["Categoria"].isin(selected_category)]
-        else:
-            df_filtered = df
-
-        # Exibir tabela
-        st.subheader("📋 Lista de Produtos")
-        st.dataframe(df_filtered, use_container_width=True)
-
-        # Download
-        st.markdown("---")
-        st.subheader("📥 Download")
-        csv = df_filtered.to_csv(index=False)
-        st.download_button(
-            label="📥 Baixar como CSV",
-            data=csv,
-            file_name="produtos.csv",
-            mime="text/csv"
-        )
-
-    except Exception as e:
-        st.error(f"❌ Erro ao exibir produtos: {e}")
-
-
-# =====================================================================
-# PÁGINA: MATÉRIA PRIMA
-# =====================================================================
 
 def show_materia_prima(adapter):
-    st.header("🥘 Matéria Prima")
-    st.markdown("---")
+    from src.ui.pages import materia_prima
+    materia_prima.show_materia_prima(adapter)
 
-    try:
-        df = load_data_from_sheet(adapter, "Matéria Prima")
-
-        if df is None or df.empty:
-            st.warning("⚠️ Nenhum dado de matéria prima disponível")
-            return
-
-        # Estatísticas
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.metric("🥘 Total de Itens", len(df))
-
-        with col2:
-            if "Unidade" in df.columns:
-                st.metric("📏 Unidades", df["Unidade"].nunique())
-
-        with col3:
-            if "Preço" in df.columns or "preco" in [c.lower() for c in df.columns]:
-                price_col = [c for c in df.columns if c.lower() == "preco" or c.lower() == "preço"][0] if any(c.lower() in ["preco", "preço"] for c in df.columns) else None
-                if price_col:
-                    st.metric("💰 Preço Médio", format_currency(df[price_col].mean()))
-
-        st.markdown("---")
-
-        # Exibir tabela
-        st.subheader("📋 Tabela de Matéria Prima")
-        st.dataframe(df, use_container_width=True)
-
-        # Download
-        st.markdown("---")
-        st.subheader("📥 Download")
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Baixar como CSV",
-            data=csv,
-            file_name="materia_prima.csv",
-            mime="text/csv"
-        )
-
-    except Exception as e:
-        st.error(f"❌ Erro ao exibir matéria prima: {e}")
-
-
-# =====================================================================
-# PÁGINA: VENDAS DIÁRIAS
-# =====================================================================
-
-def show_vendas_diarias(adapter):
-    st.header("💳 Vendas Diárias")
-    st.markdown("---")
-
-    try:
-        df = load_data_from_sheet(adapter, "Vendas Diárias")
-
-        if df is None or df.empty:
-            st.warning("⚠️ Nenhum dado de vendas disponível")
-            return
-
-        # Estatísticas
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.metric("💳 Total de Vendas", len(df))
-
-        with col2:
-            # Tentar encontrar coluna de valor
-            numeric_cols = df.select_dtypes(include=['number']).columns
-            if len(numeric_cols) > 0:
-                st.metric("💰 Valor Total", format_currency(df[numeric_cols[0]].sum()))
-
-        with col3:
-            if len(numeric_cols) > 0:
-                st.metric("📊 Valor Médio", format_currency(df[numeric_cols[0]].mean()))
-
-        st.markdown("---")
-
-        # Gráfico de vendas
-        if len(numeric_cols) > 0:
-            st.subheader("📈 Gráfico de Vendas")
-            # Tentar agrupar por data se existir coluna de data
-            st.line_chart(df[numeric_cols[0]])
-
-        st.markdown("---")
-
-        # Exibir tabela
-        st.subheader("📋 Tabela de Vendas Diárias")
-        st.dataframe(df, use_container_width=True)
-
-        # Download
-        st.markdown("---")
-        st.subheader("📥 Download")
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Baixar como CSV",
-            data=csv,
-            file_name="vendas_diarias.csv",
-            mime="text/csv"
-        )
-
-    except Exception as e:
-        st.error(f"❌ Erro ao exibir vendas diárias: {e}")
 
+def show_vendas_diarias(adapter, sales_series=None):
+    from src.ui.pages import vendas_diarias
+    vendas_diarias.show_vendas_diarias(adapter, sales_series)
 
-# =====================================================================
-# PÁGINA: RESUMO DIÁRIO
-# =====================================================================
 
 def show_resumo_diario(adapter):
-    st.header("📈 Resumo Diário")
-    st.markdown("---")
+    from src.ui.pages import resumo_diario
+    resumo_diario.show_resumo_diario(adapter)
 
-    try:
-        df = load_data_from_sheet(adapter, "Resumo Diário")
-
-        if df is None or df.empty:
-            st.warning("⚠️ Nenhum dado de resumo disponível")
-            return
-
-        # Exibir tabela
-        st.subheader("📊 Resumo Diário")
-        st.dataframe(df, use_container_width=True)
-
-        # Download
-        st.markdown("---")
-        st.subheader("📥 Download")
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Baixar como CSV",
-            data=csv,
-            file_name="resumo_diario.csv",
-            mime="text/csv"
-        )
-
-    except Exception as e:
-        st.error(f"❌ Erro ao exibir resumo diário: {e}")
-
-
-# =====================================================================
-# PÁGINA: ANÁLISE POR CATEGORIA
-# =====================================================================
 
 def show_analise_categoria(adapter):
-    st.header("📊 Análise por Categoria")
-    st.markdown("---")
-
-    try:
-        df = load_data_from_sheet(adapter, "Análise por Categoria")
-
-        if df is None or df.empty:
-            st.warning("⚠️ Nenhum dado de análise disponível")
-            return
-
-        # Exibir tabela
-        st.subheader("📊 Análise por Categoria")
-        st.dataframe(df, use_container_width=True)
-
-        # Download
-        st.markdown("---")
-        st.subheader("📥 Download")
-        csv = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Baixar como CSV",
-            data=csv,
-            file_name="analise_categoria.csv",
-            mime="text/csv"
-        )
-
-    except Exception as e:
-        st.error(f"❌ Erro ao exibir análise por categoria: {e}")
-
-
-# =====================================================================
-# PÁGINA: ANÁLISE DETALHADA
-# =====================================================================
-
-def show_analise_detalhada(service):
-    st.header("🔍 Análise Detalhada")
-    st.markdown("---")
+    from src.ui.pages import analise_categoria
+    analise_categoria.show_analise_categoria(adapter)
 
-    try:
-        # Tabs para diferentes análises
-        tab1, tab2, tab3 = st.tabs(["Custos por Receita", "Margens", "Relatórios"])
-
-        with tab1:
-            st.subheader("Custo Total por Receita")
-
-            custo_por_receita = service.calculate_cost_per_recipe("Custos")
-
-            if custo_por_receita:
-                # Criar DataFrame
-                analise_df = pd.DataFrame(
-                    [(k, float(v)) for k, v in sorted(custo_por_receita.items(), key=lambda x: x[1], reverse=True)],
-                    columns=["Receita", "Custo Total (R$)"]
-                )
-
-                # Métricas
-                col1, col2, col3 = st.columns(3)
-
-                with col1:
-                    st.metric("Total de Receitas", len(analise_df))
-
-                with col2:
-                    total = analise_df["Custo Total (R$)"].sum()
-                    st.metric("Custo Total", format_currency(total))
 
-                with col3:
-                    media = analise_df["Custo Total (R$)"].mean()
-                    st.metric("Custo Médio", format_currency(media))
-
-                # Gráfico
-                st.bar_chart(analise_df.set_index("Receita"))
-
-                # Tabela
-                display_df = analise_df.copy()
-                display_df["Custo Total (R$)"] = display_df["Custo Total (R$)"].apply(
-                    lambda x: f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-                )
-                st.dataframe(display_df, use_container_width=True, hide_index=True)
-            else:
-                st.info("ℹ️ Nenhum dado disponível para análise")
-
-        with tab2:
-            st.subheader("Análise de Margens")
-            st.info("ℹ️ Esta funcionalidade será implementada após integração de dados de faturamento com custos")
-
-        with tab3:
-            st.subheader("Relatórios")
-            st.info("ℹ️ Relatórios personalizados em desenvolvimento")
-
-    except Exception as e:
-        st.error(f"❌ Erro ao processar análise: {e}")
+def show_analise_detalhada(service, margin_service=None):
+    from src.ui.pages import analise_detalhada
+    analise_detalhada.show_analise_detalhada(service, margin_service)
 
 
 # =====================================================================
@@ -598,4 +486,3 @@ def show_analise_detalhada(service):
 
 if __name__ == "__main__":
     main()
-
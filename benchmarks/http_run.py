@@ -0,0 +1,84 @@
+"""
+Benchmarks the real HTTP path of `GoogleSheetsAdapter` against the local
+stand-in server: per-sheet reads vs one batch request, cached reads, and
+reads under injected 429 answers (backoff).
+
+    python -m benchmarks.http_run --rows 10000 --latency 0.1
+    python -m benchmarks.http_run --rows 100000 --latency 0.2 --error-rate 0.2
+
+Results are written to benchmarks/results like `benchmarks.run`.
+"""
+import argparse
+from typing import Dict, List, Optional
+
+from benchmarks.run import _metadata, save, time_call
+from benchmarks.sheets_server import SheetsStubServer
+from benchmarks.synthetic import generate_workbook
+from src.infrastructure.cached_data_source import CachedDataSource
+from src.infrastructure.google_sheets_adapter import GoogleSheetsAdapter
+from src.infrastructure.sheet_schemas import SHEET_SCHEMAS
+from src.infrastructure.throttling import Backoff, TokenBucket
+
+SHEETS = ["Cadastro Produtos", "Vendas Diárias", "Resumo Diário", "Custos"]
+
+
+def _adapter(server: SheetsStubServer, backoff_base: float = 0.05) -> GoogleSheetsAdapter:
+    # No quota wait: the stub measures the HTTP path, not the limiter.
+    return GoogleSheetsAdapter(
+        sheet_id="bench",
+        endpoint=server.url,
+        schemas=SHEET_SCHEMAS,
+        rate_limiter=TokenBucket(rate_per_minute=1e9, burst=1_000_000),
+        backoff=Backoff(max_retries=8, base=backoff_base, cap=1.0),
+    )
+
+
+def run(rows: int, latency: float, error_rate: float, repeat: int) -> Dict:
+    frames = generate_workbook(rows, typed=False)
+    results: List[Dict] = []
+
+    def record(case: str, timing: Dict[str, float], **extra) -> None:
+        results.append({"case": case, "rows": rows, "repeat": repeat, "latency_s": latency, **timing, **extra})
+        print(f"{case:<28} {rows:>9,} rows  best {timing['best_s'] * 1000:10.2f} ms  "
+              f"mean {timing['mean_s'] * 1000:10.2f} ms", flush=True)
+
+    with SheetsStubServer.from_frames(frames, latency=latency) as server:
+        adapter = _adapter(server)
+        adapter.get_version(SHEETS[0])  # opens the spreadsheet once
+
+        record("get_data_per_sheet", time_call(lambda: [adapter.get_data(name) for name in SHEETS], repeat))
+        record("get_many_batch", time_call(lambda: adapter.get_many(SHEETS), repeat))
+
+        cache = CachedDataSource(adapter, ttl=0)
+        cache.get_many(SHEETS)
+        record("cached_revalidated", time_call(lambda: cache.get_many(SHEETS), repeat))
+        cache = CachedDataSource(adapter, ttl=3600)
+        cache.get_many(SHEETS)
+        record("cached_within_ttl", time_call(lambda: cache.get_many(SHEETS), repeat))
+
+        if error_rate:
+            server.error_rates = {429: error_rate}
+            flaky = _adapter(server)
+            timing = time_call(lambda: flaky.get_many(SHEETS), repeat)
+            record("get_many_with_429", timing, error_rate=error_rate, **flaky.throttle_stats())
+        requests = dict(server.request_counts)
+
+    return {"meta": {**_metadata(), "kind": "http", "server_requests": requests}, "results": results}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the adapter's HTTP path against the local stand-in.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.1, help="server latency per request (s)")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="share of requests answered with 429")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = run(args.rows, args.latency, args.error_rate, args.repeat)
+    if not args.no_save:
+        print(f"\nResults written to {save(report)}")
+
+
+if __name__ == "__main__":
+    main()
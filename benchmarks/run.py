@@ -0,0 +1,163 @@
+"""
+Times the hot paths of the app against synthetic workbooks.
+
+    python -m benchmarks.run                       # 1k, 10k, 100k and 1M rows
+    python -m benchmarks.run --sizes 1000 10000 --repeat 5
+    python -m benchmarks.run --compare benchmarks/results/<previous>.json
+
+Each run writes benchmarks/results/<timestamp>-<commit>.json; with
+--compare, timings are printed next to the ones of a previous run.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.synthetic import InMemoryDataSource, generate_workbook  # noqa: E402
+from src.domain.cost_analysis_service import CostAnalysisService  # noqa: E402
+from src.domain.margin_analysis import MarginAnalysisService, margins  # noqa: E402
+from src.domain.recipe_graph import RecipeGraph  # noqa: E402
+from src.infrastructure.sheet_diff import diff_frames  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Runs `fn` `repeat` times and returns the best and mean wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"best_s": min(timings), "mean_s": sum(timings) / len(timings)}
+
+
+def _load_app():
+    # The page functions live in app.py; importing it outside `streamlit run`
+    # works in "bare mode", where st.* calls build their elements and drop them.
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    import app
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    return app
+
+
+def cases(frames: Dict[str, pd.DataFrame], app) -> Dict[str, Callable[[], object]]:
+    """The hot paths to time, as zero-argument callables."""
+    source = InMemoryDataSource(frames)
+    service = CostAnalysisService(source)
+    margin_service = MarginAnalysisService(source)
+    values = frames["Vendas Diárias"]["Valor"].tolist()
+    # Custos with a few rows edited and deleted in the middle, as after a manual fix
+    custos = frames["Custos"]
+    edited = custos.drop(index=custos.index[len(custos) // 2:len(custos) // 2 + 5])
+    edited.iloc[:5, edited.columns.get_loc("qty")] += 1
+    result = {
+        "calculate_cost_per_recipe": lambda: service.calculate_cost_per_recipe("Custos"),
+        "diff_frames": lambda: diff_frames(custos, edited, ["recipe", "ingredient"]),
+        "format_currency": lambda: [app.format_currency(v) for v in values],
+        "margins_monthly": lambda: margins(frames["Custos"], frames["Faturamento"], "M"),
+        "recipe_graph_costs": lambda: RecipeGraph(frames["Custos"]).costs(),
+    }
+    result.update({
+        "show_dashboard": lambda: app.show_dashboard(service, source),
+        "show_produtos": lambda: app.show_produtos(source),
+        "show_materia_prima": lambda: app.show_materia_prima(source),
+        "show_vendas_diarias": lambda: app.show_vendas_diarias(source),
+        "show_resumo_diario": lambda: app.show_resumo_diario(source),
+        "show_analise_categoria": lambda: app.show_analise_categoria(source),
+        "show_analise_detalhada": lambda: app.show_analise_detalhada(service, margin_service),
+    })
+    return result
+
+
+def run(sizes: List[int], repeat: int = 3, only: Optional[List[str]] = None, seed: int = 0) -> Dict:
+    app = _load_app()
+    results = []
+    for rows in sizes:
+        frames = generate_workbook(rows, seed=seed)
+        for name, fn in cases(frames, app).items():
+            if only and name not in only:
+                continue
+            timing = time_call(fn, repeat)
+            results.append({"case": name, "rows": rows, "repeat": repeat, **timing})
+            print(f"{name:<28} {rows:>9,} rows  best {timing['best_s'] * 1000:10.2f} ms  "
+                  f"mean {timing['mean_s'] * 1000:10.2f} ms", flush=True)
+    return {"meta": _metadata(), "results": results}
+
+
+def _metadata() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def save(report: Dict, directory: str = RESULTS_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(directory, f"{stamp}-{report['meta']['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare(report: Dict, previous: Dict) -> List[Dict]:
+    """Pairs each timing with the same case and size of a previous report (ratio > 1 is slower)."""
+    before = {(r["case"], r["rows"]): r["best_s"] for r in previous["results"]}
+    rows = []
+    for r in report["results"]:
+        old = before.get((r["case"], r["rows"]))
+        if old:
+            rows.append({"case": r["case"], "rows": r["rows"], "before_s": old, "after_s": r["best_s"],
+                         "ratio": r["best_s"] / old})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the Vava Doces hot paths on synthetic workbooks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="rows per large sheet")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="case names to run (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", help="previous results JSON to compare with")
+    parser.add_argument("--no-save", action="store_true", help="do not write a results file")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, repeat=args.repeat, only=args.only, seed=args.seed)
+    if not args.no_save:
+        print(f"\nResults written to {save(report)}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"\nCompared with {previous['meta']['commit']} ({previous['meta']['created_at']}):")
+        for row in compare(report, previous):
+            print(f"{row['case']:<28} {row['rows']:>9,} rows  {row['before_s'] * 1000:10.2f} ms -> "
+                  f"{row['after_s'] * 1000:10.2f} ms  x{row['ratio']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
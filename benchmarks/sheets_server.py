@@ -0,0 +1,431 @@
+"""
+Local stand-in for the Google Sheets v4 / Drive v3 endpoints used by
+`GoogleSheetsAdapter`, for offline benchmarks and HTTP-level tests.
+
+    python -m benchmarks.sheets_server --xlsx "RECEITAS AWI.xlsx" --latency 0.15 --error-rate 429=0.05
+    python -m benchmarks.sheets_server --synthetic-rows 100000 --port 8765
+
+Then point the app at it:
+
+    VAVA_SHEETS_ENDPOINT=http://127.0.0.1:8765 GOOGLE_SHEET_ID=stub streamlit run app.py
+
+Served endpoints (any spreadsheet id is accepted):
+- GET /v4/spreadsheets/<id>                     spreadsheet metadata
+- GET /v4/spreadsheets/<id>/values/<range>      values.get
+- GET /v4/spreadsheets/<id>/values:batchGet     values.batchGet
+- POST /v4/spreadsheets/<id>/values/<range>:append  values.append
+- GET /drive/v3/files/<id>                      Drive metadata (modifiedTime)
+"""
+import argparse
+import csv
+import datetime as dt
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+_ERROR_STATUS = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 502: "UNAVAILABLE", 503: "UNAVAILABLE"}
+_CELL = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+class SheetsStubServer:
+    """
+    Threaded HTTP server holding a workbook in memory (sheet -> rows of cells).
+
+    - `latency` (+ up to `jitter`) seconds are slept before every answer.
+    - `error_rates` maps an HTTP status (429, 500, ...) to the probability
+      that a request fails with it; `fail_next` queues exact failures.
+    - `set_values` / `append_rows` edit a sheet and bump the Drive
+      `modifiedTime`, so revision-based caching can be exercised.
+    - `request_counts` counts answered requests per endpoint kind and
+      `status_counts` per HTTP status.
+
+    Cells are returned as formatted strings (dates as dd/mm/yyyy), or raw
+    with valueRenderOption=UNFORMATTED_VALUE; trailing empty cells and rows
+    are trimmed like the real API does.
+    """
+
+    def __init__(
+        self,
+        sheets: Dict[str, List[List]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rates: Optional[Dict[int, float]] = None,
+        seed: int = 0,
+        title: str = "Vava Doces (stub)",
+    ):
+        self.sheets = {name: [list(row) for row in rows] for name, rows in sheets.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rates = dict(error_rates or {})
+        self.title = title
+        self.request_counts: Counter = Counter()
+        self.status_counts: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._forced: deque = deque()
+        self._lock = threading.RLock()
+        self._created = dt.datetime.now(dt.timezone.utc).replace(microsecond=0)
+        self._modified = self._created
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], **kwargs) -> "SheetsStubServer":
+        sheets = {}
+        for name, frame in frames.items():
+            rows = frame.astype(object).where(frame.notna(), None).values.tolist()
+            sheets[name] = [list(map(str, frame.columns))] + rows
+        return cls(sheets, **kwargs)
+
+    @classmethod
+    def from_xlsx(cls, path: str, **kwargs) -> "SheetsStubServer":
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            sheets = {ws.title: [list(row) for row in ws.iter_rows(values_only=True)] for ws in workbook.worksheets}
+        finally:
+            workbook.close()
+        return cls(sheets, **kwargs)
+
+    @classmethod
+    def from_csv(cls, paths: Sequence[str], **kwargs) -> "SheetsStubServer":
+        """One sheet per CSV file, named after the file (without extension)."""
+        sheets = {}
+        for path in paths:
+            with open(path, newline="", encoding="utf-8") as f:
+                sheets[os.path.splitext(os.path.basename(path))[0]] = [row for row in csv.reader(f)]
+        return cls(sheets, **kwargs)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SheetsStubServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="sheets-stub", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread = None
+
+    def __enter__(self) -> "SheetsStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def fail_next(self, status: int, count: int = 1) -> None:
+        """The next `count` API requests fail with `status`."""
+        with self._lock:
+            self._forced.extend([status] * count)
+
+    def set_values(self, sheet_name: str, rows: List[List]) -> None:
+        with self._lock:
+            self.sheets[sheet_name] = [list(row) for row in rows]
+            self._touch()
+
+    def append_rows(self, sheet_name: str, rows: List[List]) -> None:
+        with self._lock:
+            self.sheets[sheet_name].extend(list(row) for row in rows)
+            self._touch()
+
+    @property
+    def modified_time(self) -> str:
+        return _rfc3339(self._modified)
+
+    def _touch(self) -> None:
+        # Strictly increasing, even for edits within the same millisecond
+        self._modified = max(dt.datetime.now(dt.timezone.utc), self._modified + dt.timedelta(milliseconds=1))
+
+    # ----------------------------------------------------------------- requests
+
+    def _handle(self, path: str, query: Dict[str, List[str]], body: Optional[dict] = None) -> Tuple[int, dict]:
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        kind, spreadsheet_id, rest = _route(path)
+        if kind is None:
+            return self._count("unknown", 404, _error_body(404, f"Unknown path {path}"))
+
+        with self._lock:
+            status = self._forced.popleft() if self._forced else None
+            if status is None:
+                for candidate, rate in self.error_rates.items():
+                    if self._rng.random() < rate:
+                        status = candidate
+                        break
+        if status is not None:
+            return self._count(kind, status, _error_body(status, "Injected failure"))
+
+        unformatted = query.get("valueRenderOption", [""])[0] == "UNFORMATTED_VALUE"
+        with self._lock:
+            if kind == "metadata":
+                return self._count(kind, 200, self._metadata(spreadsheet_id))
+            if kind == "drive":
+                return self._count(kind, 200, {
+                    "id": spreadsheet_id,
+                    "name": self.title,
+                    "createdTime": _rfc3339(self._created),
+                    "modifiedTime": self.modified_time,
+                })
+            try:
+                if kind == "append":
+                    rows = (body or {}).get("values", [])
+                    if query.get("valueInputOption", [""])[0] == "USER_ENTERED":
+                        rows = [[_user_entered(v) for v in row] for row in rows]
+                    return self._count(kind, 200, self._append(spreadsheet_id, unquote(rest), rows))
+                if kind == "values":
+                    return self._count(kind, 200, self._values(unquote(rest), unformatted))
+                value_ranges = [self._values(r, unformatted) for r in query.get("ranges", [])]
+                return self._count(kind, 200, {"spreadsheetId": spreadsheet_id, "valueRanges": value_ranges})
+            except KeyError as e:
+                return self._count(kind, 400, _error_body(400, f"Unable to parse range: {e.args[0]}"))
+
+    def _count(self, kind: str, status: int, body: dict) -> Tuple[int, dict]:
+        with self._lock:
+            self.request_counts[kind] += 1
+            self.status_counts[status] += 1
+        return status, body
+
+    def _metadata(self, spreadsheet_id: str) -> dict:
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "properties": {"title": self.title, "locale": "pt_BR", "timeZone": "America/Sao_Paulo"},
+            "sheets": [
+                {"properties": {
+                    "sheetId": index,
+                    "title": name,
+                    "index": index,
+                    "sheetType": "GRID",
+                    "gridProperties": {
+                        "rowCount": max(len(rows), 1000),
+                        "columnCount": max([26] + [len(row) for row in rows]),
+                    },
+                }}
+                for index, (name, rows) in enumerate(self.sheets.items())
+            ],
+        }
+
+    def _append(self, spreadsheet_id: str, range_name: str, rows: List[List]) -> dict:
+        sheet_name, _ = _parse_range(range_name)
+        if sheet_name not in self.sheets:
+            raise KeyError(range_name)
+        first_row = len(self.sheets[sheet_name]) + 1
+        self.sheets[sheet_name].extend(list(row) for row in rows)
+        self._touch()
+        width = max([len(row) for row in rows] + [1])
+        updated = f"'{sheet_name.replace(chr(39), chr(39) * 2)}'!A{first_row}:{_column_letter(width)}{first_row + len(rows) - 1}"
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "updates": {"spreadsheetId": spreadsheet_id, "updatedRange": updated, "updatedRows": len(rows)},
+        }
+
+    def _values(self, range_name: str, unformatted: bool) -> dict:
+        sheet_name, (r1, c1, r2, c2) = _parse_range(range_name)
+        if sheet_name not in self.sheets:
+            raise KeyError(range_name)
+        rows = self.sheets[sheet_name][r1 - 1:r2]
+        values = [[_cell(v, unformatted) for v in row[c1 - 1:c2]] for row in rows]
+        values = [_rstrip(row) for row in values]
+        while values and not values[-1]:
+            values.pop()
+        last_row = r1 + max(len(values) - 1, 0)
+        last_col = c1 + max([len(row) for row in values] + [1]) - 1
+        a1 = f"{_column_letter(c1)}{r1}:{_column_letter(last_col)}{last_row}"
+        body = {"range": f"'{sheet_name.replace(chr(39), chr(39) * 2)}'!{a1}", "majorDimension": "ROWS"}
+        if values:
+            body["values"] = values
+        return body
+
+
+def _handler_for(stub: SheetsStubServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            try:
+                status, body = stub._handle(url.path, parse_qs(url.query))
+            except Exception as e:
+                status, body = 500, _error_body(500, f"Stub server error: {e}")
+            self._reply(status, body)
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                status, body = stub._handle(url.path, parse_qs(url.query), request)
+            except Exception as e:
+                status, body = 500, _error_body(500, f"Stub server error: {e}")
+            self._reply(status, body)
+
+        def _reply(self, status: int, body: dict) -> None:
+            payload = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def _route(path: str) -> Tuple[Optional[str], str, str]:
+    parts = path.strip("/").split("/", 3)
+    if len(parts) >= 3 and parts[:2] == ["v4", "spreadsheets"]:
+        if len(parts) == 3:
+            return "metadata", parts[2], ""
+        if parts[3] == "values:batchGet":
+            return "batchGet", parts[2], ""
+        if parts[3].startswith("values/") and parts[3].endswith(":append"):
+            return "append", parts[2], parts[3][len("values/"):-len(":append")]
+        if parts[3].startswith("values/"):
+            return "values", parts[2], parts[3][len("values/"):]
+    if len(parts) == 4 and parts[:3] == ["drive", "v3", "files"]:
+        return "drive", parts[3], ""
+    return None, "", ""
+
+
+def _parse_range(range_name: str) -> Tuple[str, Tuple[int, int, Optional[int], Optional[int]]]:
+    """Splits "'Sheet'!A5:F" into the sheet name and 1-based inclusive bounds (None = unbounded)."""
+    if range_name.startswith("'"):
+        end = 1
+        while True:
+            end = range_name.index("'", end)
+            if range_name[end + 1:end + 2] == "'":
+                end += 2
+                continue
+            break
+        sheet_name = range_name[1:end].replace("''", "'")
+        cells = range_name[end + 2:] if range_name[end + 1:end + 2] == "!" else ""
+    else:
+        sheet_name, _, cells = range_name.partition("!")
+
+    if not cells:
+        return sheet_name, (1, 1, None, None)
+    start, _, end = cells.partition(":")
+    (c1, r1), (c2, r2) = _cell_ref(start), _cell_ref(end or start)
+    return sheet_name, (r1 or 1, c1 or 1, r2 or None, c2 or None)
+
+
+def _cell_ref(ref: str) -> Tuple[int, int]:
+    match = _CELL.match(ref)
+    if match is None:
+        raise KeyError(ref)
+    letters, digits = match.groups()
+    column = 0
+    for letter in letters.upper():
+        column = column * 26 + ord(letter) - ord("A") + 1
+    return column, int(digits) if digits else 0
+
+
+def _column_letter(column: int) -> str:
+    letters = ""
+    while column > 0:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters or "A"
+
+
+# A number as typed in a pt_BR sheet: "." groups thousands, "," marks decimals
+_PT_BR_NUMBER = re.compile(r"^-?(\d{1,3}(\.\d{3})+|\d+)(,\d+)?$")
+
+
+def _user_entered(value):
+    """What a pt_BR sheet keeps for a typed value: "12,50" becomes 12.5, "12.50" stays text."""
+    if isinstance(value, str) and _PT_BR_NUMBER.match(value):
+        return float(value.replace(".", "").replace(",", "."))
+    return value
+
+
+def _cell(value, unformatted: bool):
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    if isinstance(value, (dt.datetime, dt.date, pd.Timestamp)):
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, bool):
+        return value if unformatted else ("TRUE" if value else "FALSE")
+    if unformatted:
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _rstrip(row: List) -> List:
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+def _rfc3339(moment: dt.datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def _error_body(status: int, message: str) -> dict:
+    return {"error": {"code": status, "message": message, "status": _ERROR_STATUS.get(status, "INVALID_ARGUMENT")}}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Google Sheets API stand-in.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--xlsx", help="workbook to serve")
+    source.add_argument("--csv", nargs="+", help="CSV files to serve, one sheet each")
+    source.add_argument("--synthetic-rows", type=int, help="serve a synthetic workbook of this size")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds slept before each answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", action="append", default=[], metavar="STATUS=RATE",
+                        help="inject failures, e.g. 429=0.1 (repeatable)")
+    args = parser.parse_args(argv)
+
+    options = {
+        "host": args.host,
+        "port": args.port,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rates": {int(s): float(r) for s, r in (item.split("=", 1) for item in args.error_rate)},
+    }
+    if args.xlsx:
+        server = SheetsStubServer.from_xlsx(args.xlsx, **options)
+    elif args.csv:
+        server = SheetsStubServer.from_csv(args.csv, **options)
+    else:
+        from benchmarks.synthetic import generate_workbook
+        server = SheetsStubServer.from_frames(generate_workbook(args.synthetic_rows, typed=False), **options)
+
+    print(f"Serving {len(server.sheets)} sheets on {server.url} (Ctrl+C to stop)", flush=True)
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Times the cold import of app.py, i.e. what a fresh server (or a session after
+a code change) pays before the first element is drawn.
+
+    python -m benchmarks.startup                   # best of 5 fresh interpreters
+    python -m benchmarks.startup --budget 0.4      # exit status 1 above 0.4 s
+
+Each measurement runs in a new interpreter: `import streamlit` is timed on
+its own and the budget applies to what `import app` adds on top of it. The
+heavy modules the import pulled in are listed too; none of them should
+load before a page needs them.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_BUDGET_S = 0.4
+
+# Modules that must only be imported once a page (or the data source) needs them
+HEAVY_MODULES = ["gspread", "google.auth", "requests", "pandas", "pyarrow", "openpyxl", "src.ui.pages"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import streamlit
+middle = time.perf_counter()
+import app
+end = time.perf_counter()
+heavy = {heavy!r}
+print(json.dumps({{
+    "streamlit_s": middle - start,
+    "app_s": end - middle,
+    "loaded": sorted(m for m in sys.modules if any(m == h or m.startswith(h + ".") for h in heavy)),
+}}))
+"""
+
+
+def measure_once() -> Dict:
+    """Times `import streamlit` and then `import app` in a fresh interpreter."""
+    env = dict(os.environ, STREAMLIT_LOGGER_LEVEL="error")
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(repeat: int = 5) -> Dict:
+    """Best of `repeat` cold imports (the minimum is the least noisy estimate)."""
+    runs = [measure_once() for _ in range(repeat)]
+    return {
+        "repeat": repeat,
+        "streamlit_s": min(r["streamlit_s"] for r in runs),
+        "app_s": min(r["app_s"] for r in runs),
+        "loaded": sorted({m for r in runs for m in r["loaded"]}),
+    }
+
+
+def check(report: Dict, budget: float) -> List[str]:
+    """Problems found in a `measure` report: over budget or heavy modules imported."""
+    problems = []
+    if report["app_s"] > budget:
+        problems.append(f"import app took {report['app_s'] * 1000:.0f} ms, budget is {budget * 1000:.0f} ms")
+    if report["loaded"]:
+        problems.append(f"imported at startup: {', '.join(report['loaded'])}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Times the cold import of app.py against a budget.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_S, help="seconds allowed for `import app`")
+    args = parser.parse_args(argv)
+
+    report = measure(args.repeat)
+    print(f"import streamlit   {report['streamlit_s'] * 1000:8.1f} ms")
+    print(f"import app         {report['app_s'] * 1000:8.1f} ms  (budget {args.budget * 1000:.0f} ms)")
+    problems = check(report, args.budget)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
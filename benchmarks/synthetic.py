@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from src.infrastructure.sheet_schemas import SHEET_SCHEMAS
+from src.ports.data_source import DataSource
+
+CATEGORIAS = ["Bolos", "Doces Finos", "Tortas", "Salgados", "Bebidas", "Kits", "Encomendas", "Sazonais"]
+UNIDADES = ["kg", "g", "L", "ml", "un", "cx"]
+FORMAS_PAGAMENTO = ["Pix", "Dinheiro", "Crédito", "Débito"]
+FORNECEDORES = ["Atacadão", "Assaí", "Fornecedor Local", "Distribuidora Central"]
+
+
+def generate_workbook(rows: int, seed: int = 0, typed: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Builds a synthetic copy of the workbook where the large sheets
+    ("Custos", "Vendas Diárias", "Faturamento") have `rows` rows.
+
+    Catalogue sizes grow with `rows` the way they do in the real shop: about
+    one recipe per 20 cost lines and one ingredient per 50 (bounded), so
+    group-bys see a realistic number of groups. With `typed=True` the sheet
+    schemas are applied, so frames look like what the adapter hands out.
+    """
+    rng = np.random.default_rng(seed)
+    n_recipes = int(min(max(rows // 20, 10), 20_000))
+    n_ingredients = int(min(max(rows // 50, 10), 5_000))
+    recipes = np.array([f"Receita {i:05d}" for i in range(n_recipes)], dtype=object)
+    ingredients = np.array([f"Ingrediente {i:04d}" for i in range(n_ingredients)], dtype=object)
+    recipe_category = rng.choice(CATEGORIAS, size=n_recipes)
+    dates = pd.date_range("2023-01-01", periods=730, freq="D").strftime("%d/%m/%Y").to_numpy()
+
+    frames = {
+        "Custos": pd.DataFrame({
+            "recipe": recipes[rng.integers(0, n_recipes, rows)],
+            "ingredient": ingredients[rng.integers(0, n_ingredients, rows)],
+            "qty": rng.integers(1, 500, rows) / 100,
+            "unit_price": rng.integers(5, 20_000, rows) / 100,
+        }),
+        "Vendas Diárias": _sales(rng, rows, recipes, recipe_category, dates),
+        "Faturamento": _sales(rng, rows, recipes, recipe_category, dates)[["Data", "Produto", "Quantidade", "Valor"]],
+        "Cadastro Produtos": pd.DataFrame({
+            "Código": [f"P{i:05d}" for i in range(n_recipes)],
+            "Produto": recipes,
+            "Categoria": recipe_category,
+            "Unidade": rng.choice(["un", "kg", "cx"], size=n_recipes),
+            "Preço": rng.integers(500, 25_000, n_recipes) / 100,
+        }),
+        "Matéria Prima": pd.DataFrame({
+            "Ingrediente": ingredients,
+            "Unidade": rng.choice(UNIDADES, size=n_ingredients),
+            "Quantidade": rng.integers(1, 50, n_ingredients),
+            "Preço": rng.integers(100, 50_000, n_ingredients) / 100,
+            "Fornecedor": rng.choice(FORNECEDORES, size=n_ingredients),
+        }),
+    }
+    frames["Resumo Diário"] = _daily_summary(frames["Vendas Diárias"])
+    frames["Análise por Categoria"] = _category_summary(frames["Vendas Diárias"])
+
+    if typed:
+        frames = {name: _apply_schema(name, frame) for name, frame in frames.items()}
+    return frames
+
+
+def _sales(rng, rows: int, recipes, recipe_category, dates) -> pd.DataFrame:
+    product = rng.integers(0, len(recipes), rows)
+    quantity = rng.integers(1, 12, rows)
+    return pd.DataFrame({
+        "Data": np.sort(rng.choice(dates, size=rows)),
+        "Produto": recipes[product],
+        "Categoria": recipe_category[product],
+        "Quantidade": quantity,
+        "Valor": quantity * rng.integers(500, 9_000, rows) / 100,
+        "Forma de Pagamento": rng.choice(FORMAS_PAGAMENTO, size=rows),
+    })
+
+
+def _daily_summary(sales: pd.DataFrame) -> pd.DataFrame:
+    summary = sales.groupby("Data", sort=False).agg(**{
+        "Total Vendas": ("Valor", "sum"),
+        "Quantidade": ("Quantidade", "sum"),
+    }).reset_index()
+    summary["Ticket Médio"] = (summary["Total Vendas"] / summary["Quantidade"]).round(2)
+    summary["Total Vendas"] = summary["Total Vendas"].round(2)
+    return summary
+
+
+def _category_summary(sales: pd.DataFrame) -> pd.DataFrame:
+    summary = sales.groupby("Categoria").agg(Quantidade=("Quantidade", "sum"), Valor=("Valor", "sum")).reset_index()
+    summary["Percentual"] = (100 * summary["Valor"] / summary["Valor"].sum()).round(2)
+    summary["Valor"] = summary["Valor"].round(2)
+    return summary
+
+
+def _apply_schema(sheet_name: str, frame: pd.DataFrame) -> pd.DataFrame:
+    schema = SHEET_SCHEMAS.get(sheet_name)
+    return schema.apply(frame)[0] if schema is not None else frame
+
+
+class InMemoryDataSource(DataSource):
+    """DataSource over a dict of frames, with no I/O, counting reads."""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], version: Optional[str] = "synthetic"):
+        self.frames = frames
+        self.version = version
+        self.calls = 0
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        self.calls += 1
+        return self.frames[sheet_name]
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        self.calls += 1
+        return {name: self.frames[name] for name in sheet_names}
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        return self.version
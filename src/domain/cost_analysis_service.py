@@ -1,11 +1,36 @@
+import threading
+import numpy as np
 import pandas as pd
 from decimal import Decimal, InvalidOperation
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple, Union
+from src.domain.names import normalize_name
 from src.ports.data_source import DataSource, DataSourceError
 
+if TYPE_CHECKING:
+    from src.domain.recipe_graph import RecipeGraph
+
 class CostAnalysisService:
-    def __init__(self, data_source: DataSource):
+    def __init__(self, data_source: DataSource, loader=None, differ=None):
+        """
+        `loader` is optional; when given it must expose
+        `load(sheet_names) -> Dict[str, DataFrame | DataSourceError]`
+        (e.g. `ConcurrentLoader`) and is used by `load_sheets`.
+
+        `differ` is optional too: `differ(old, new, key_columns)` must return
+        the changed rows as `inserted`, `updated`, `updated_before` and
+        `deleted` frames plus a `schema_changed` flag (e.g.
+        `sheet_diff.diff_frames`). With it, `recipe_cost_totals` applies
+        only the changed rows when the sheet version changes.
+        """
         self.data_source = data_source
+        self.loader = loader
+        self.differ = differ
+        # sheet name -> (version, RecipeGraph) of the last graph built
+        self._graphs: Dict[str, Tuple[object, "RecipeGraph"]] = {}
+        self._graphs_lock = threading.Lock()
+        # sheet name -> (version, frame, RecipeCostTotals) of the last totals
+        self._totals: Dict[str, Tuple[object, pd.DataFrame, "RecipeCostTotals"]] = {}
+        self._totals_lock = threading.Lock()
 
     def get_production_costs(self) -> pd.DataFrame:
         """
@@ -19,6 +44,24 @@ class CostAnalysisService:
         """
         return self.data_source.get_data("Faturamento")
 
+    def load_sheets(self, sheet_names: List[str]) -> Dict[str, Union[pd.DataFrame, DataSourceError]]:
+        """
+        Loads several sheets, in parallel when a loader was injected.
+
+        Each value is either the sheet's DataFrame or the `DataSourceError`
+        raised while reading it, so one failing sheet does not hide the others.
+        """
+        if self.loader is not None:
+            return self.loader.load(sheet_names)
+
+        results: Dict[str, Union[pd.DataFrame, DataSourceError]] = {}
+        for name in sheet_names:
+            try:
+                results[name] = self.data_source.get_data(name)
+            except DataSourceError as e:
+                results[name] = e
+        return results
+
     def calculate_cost_per_recipe(self, sheet_name: str) -> Dict[str, Decimal]:
         """
         Loads rows from the given sheet and calculates total cost per recipe.
@@ -38,36 +81,296 @@ class CostAnalysisService:
             # propagate as-is for caller to handle
             raise
 
-        if df is None or df.empty:
-            return {}
+        return cost_per_recipe(df, sheet_name)
 
-        # Normalize column names to lowercase
-        df_columns = {c.lower(): c for c in df.columns}
-        required = ["recipe", "qty", "unit_price"]
-        for col in required:
-            if col not in df_columns:
-                raise ValueError(f"Sheet '{sheet_name}' is missing required column '{col}'")
+    def recipe_cost_totals(self, sheet_name: str = "Custos") -> Dict[str, Decimal]:
+        """
+        Direct cost of each recipe's raw ingredients (see `RecipeCostTotals`),
+        kept per sheet version. When the version changes and a `differ` was
+        injected, the previous and current frames are compared by recipe
+        and ingredient and only the inserted, updated and deleted rows are
+        added to / subtracted from the kept totals; a changed header, a
+        recipe added or removed, or an invalid delta recomputes them.
+        """
+        version = self.data_source.get_version(sheet_name)
+        with self._totals_lock:
+            cached = self._totals.get(sheet_name)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[2].to_dict()
 
-        # Use the original column names to access values
-        recipe_col = df_columns["recipe"]
-        qty_col = df_columns["qty"]
-        price_col = df_columns["unit_price"]
+        # The frame kept for the next diff is the one the source returned
+        # (the object its cache holds), not a copy.
+        df = self.data_source.get_data(sheet_name)
+        totals = None
+        if cached is not None and self.differ is not None:
+            key_columns = [c for c in df.columns if str(c).lower() in ("recipe", "ingredient")]
+            changes = self.differ(cached[1], df, key_columns)
+            if not changes.schema_changed:
+                candidate = cached[2].copy()
+                try:
+                    if candidate.apply(changes):
+                        totals = candidate
+                except ValueError:
+                    pass  # e.g. an invalid row was removed; the recompute reports what is left
+        if totals is None:
+            totals = RecipeCostTotals(df, sheet_name)
+        if version is not None:
+            with self._totals_lock:
+                self._totals[sheet_name] = (version, df, totals)
+        return totals.to_dict()
 
-        results: Dict[str, Decimal] = {}
+    def recipe_graph(self, sheet_name: str = "Custos") -> "RecipeGraph":
+        """
+        Recipe dependency graph of the sheet (see `RecipeGraph`), rebuilt only
+        when the sheet version changes. The graph is shared: use `copy()`
+        before calling `set_price` on it.
+        """
+        from src.domain.recipe_graph import RecipeGraph  # recipe_graph imports this module
 
-        for _, row in df.iterrows():
-            recipe = row[recipe_col]
-            if pd.isna(recipe):
-                continue
+        version = self.data_source.get_version(sheet_name)
+        with self._graphs_lock:
+            cached = self._graphs.get(sheet_name)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
 
-            try:
-                qty = Decimal(str(row[qty_col]))
-                unit_price = Decimal(str(row[price_col]))
-            except (InvalidOperation, TypeError) as e:
-                raise ValueError(f"Invalid numeric value in row for recipe '{recipe}': {e}")
+        graph = RecipeGraph(self.data_source.get_data(sheet_name), sheet_name)
+        if version is not None:
+            with self._graphs_lock:
+                self._graphs[sheet_name] = (version, graph)
+        return graph
 
-            total = qty * unit_price
-            results[recipe] = results.get(recipe, Decimal("0")) + total
+    def calculate_nested_cost_per_recipe(self, sheet_name: str = "Custos") -> Dict[str, Decimal]:
+        """
+        Like `calculate_cost_per_recipe`, but rows whose ingredient is another
+        recipe are costed with that recipe's rolled-up cost.
+        Raises `RecipeCycleError` (a ValueError) when recipes use each other.
+        """
+        return self.recipe_graph(sheet_name).costs()
 
-        return results
+    def simulate_price_changes(
+        self,
+        changes: Optional[Dict[str, float]] = None,
+        prices: Optional[Dict[str, float]] = None,
+        sheet_name: str = "Custos",
+    ) -> pd.DataFrame:
+        """
+        What-if on ingredient prices without touching the sheet.
+
+        `changes` maps ingredient -> relative change (0.12 = +12%) and
+        `prices` maps ingredient -> new unit price. Returns one row per
+        affected recipe (sub-recipes included) with columns recipe,
+        cost_before, cost_after, delta and delta_pct, largest delta first.
+        Work is proportional to the rows of the changed ingredients: the
+        ingredient -> rows index is built once per version of the sheet.
+        Raises KeyError for ingredients that no recipe uses.
+        """
+        base = self.recipe_graph(sheet_name)
+        what_if = base.copy()
+        affected = set()
+        for ingredient, change in (changes or {}).items():
+            affected.update(what_if.scale_price(ingredient, 1 + Decimal(str(change))))
+        for ingredient, price in (prices or {}).items():
+            affected.update(what_if.set_price(ingredient, price))
+
+        rows = []
+        for recipe in sorted(affected):
+            before, after = base.cost(recipe), what_if.cost(recipe)
+            rows.append((recipe, before, after, after - before, (after - before) / before if before else None))
+        result = pd.DataFrame(rows, columns=["recipe", "cost_before", "cost_after", "delta", "delta_pct"])
+        return result.sort_values("delta", ascending=False, key=lambda d: d.abs(), kind="stable").reset_index(drop=True)
+
+
+class RecipeCostTotals:
+    """
+    Direct cost of each recipe: qty * unit_price of its raw ingredient rows,
+    as in `RecipeGraph` (rows whose ingredient is another recipe are left
+    out; their unit_price is often empty). It can be brought up to date with
+    the rows that changed instead of summing the whole sheet again. Row
+    counts per recipe are kept, so a recipe whose last row is deleted
+    disappears, as it would in a full recompute.
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None, sheet_name: str = "Custos"):
+        self.sheet_name = sheet_name
+        self._totals: Dict[str, Decimal] = {}
+        # recipe name as written -> rows; normalized recipe name -> rows
+        self._rows: Dict[str, int] = {}
+        self._keys: Dict[str, int] = {}
+        self.incremental_updates = 0
+        if df is not None and not df.empty:
+            self._add(df, 1, {normalize_name(r) for r in _recipe_counts(df, sheet_name)})
+
+    def apply(self, changes) -> bool:
+        """
+        Applies a diff (`inserted`, `updated`, `updated_before`, `deleted`
+        frames). Returns False, changing nothing, when the delta adds or
+        removes a recipe: rows elsewhere may then switch between raw
+        ingredient and sub-recipe, so the totals must be rebuilt. Raises
+        ValueError like `cost_per_recipe` for invalid rows.
+        """
+        removed = [f for f in (changes.deleted, changes.updated_before) if f is not None and not f.empty]
+        added = [f for f in (changes.inserted, changes.updated) if f is not None and not f.empty]
+
+        keys = dict(self._keys)
+        for frames, sign in ((removed, -1), (added, 1)):
+            for frame in frames:
+                for recipe, count in _recipe_counts(frame, self.sheet_name).items():
+                    key = normalize_name(recipe)
+                    keys[key] = keys.get(key, 0) + sign * count
+        recipes = {key for key, rows in keys.items() if rows > 0}
+        if recipes != set(self._keys):
+            return False
+
+        # Work on copies so a ValueError leaves these totals untouched
+        saved = dict(self._totals), dict(self._rows), dict(self._keys)
+        try:
+            for frame in removed:
+                self._add(frame, -1, recipes)
+            for frame in added:
+                self._add(frame, 1, recipes)
+        except ValueError:
+            self._totals, self._rows, self._keys = saved
+            raise
+        self.incremental_updates += 1
+        return True
+
+    def copy(self) -> "RecipeCostTotals":
+        other = RecipeCostTotals(sheet_name=self.sheet_name)
+        other._totals, other._rows, other._keys = dict(self._totals), dict(self._rows), dict(self._keys)
+        other.incremental_updates = self.incremental_updates
+        return other
+
+    def to_dict(self) -> Dict[str, Decimal]:
+        return dict(self._totals)
+
+    def _add(self, df: pd.DataFrame, sign: int, recipes: Set[str]) -> None:
+        counts = _recipe_counts(df, self.sheet_name)
+        if not counts:
+            return
+        columns = {c.lower(): c for c in df.columns}
+        df = df[df[columns["recipe"]].notna()]
+        raw = df[~_is_sub_recipe(df, columns.get("ingredient"), recipes)]
+        costs = cost_per_recipe(raw, self.sheet_name) if not raw.empty else {}
+        for recipe, count in counts.items():
+            key = normalize_name(recipe)
+            self._keys[key] = self._keys.get(key, 0) + sign * count
+            if self._keys[key] <= 0:
+                del self._keys[key]
+            rows = self._rows.get(recipe, 0) + sign * count
+            if rows > 0:
+                self._rows[recipe] = rows
+                self._totals[recipe] = self._totals.get(recipe, Decimal("0")) + sign * costs.get(recipe, Decimal("0"))
+            else:
+                self._rows.pop(recipe, None)
+                self._totals.pop(recipe, None)
+
+
+def _recipe_counts(df: pd.DataFrame, sheet_name: str) -> Dict[str, int]:
+    """Rows per recipe name (empty names skipped); checks the columns `cost_per_recipe` needs."""
+    columns = {c.lower(): c for c in df.columns}
+    for col in ["recipe", "qty", "unit_price"]:
+        if col not in columns:
+            raise ValueError(f"Sheet '{sheet_name}' is missing required column '{col}'")
+    counts = df[columns["recipe"]].dropna().value_counts(sort=False)
+    # Categorical columns also list their unused categories
+    return {recipe: int(count) for recipe, count in counts.items() if count}
+
+
+def _is_sub_recipe(df: pd.DataFrame, ingredient_col, recipes: Set[str]) -> np.ndarray:
+    """Rows whose ingredient is one of `recipes` (normalized names), one lookup per distinct ingredient."""
+    if ingredient_col is None:
+        return np.zeros(len(df), dtype=bool)
+    codes, uniques = pd.factorize(df[ingredient_col])
+    # Code -1 (empty ingredient) picks the trailing False
+    is_recipe = np.array([normalize_name(name) in recipes for name in uniques] + [False], dtype=bool)
+    return is_recipe[codes]
+
+
+def cost_per_recipe(df: pd.DataFrame, sheet_name: str = "Custos") -> Dict[str, Decimal]:
+    """
+    Total cost per recipe (sum of qty * unit_price) of an already loaded
+    costs frame; see `CostAnalysisService.calculate_cost_per_recipe`.
+    """
+    if df is None or df.empty:
+        return {}
+
+    # Normalize column names to lowercase
+    df_columns = {c.lower(): c for c in df.columns}
+    required = ["recipe", "qty", "unit_price"]
+    for col in required:
+        if col not in df_columns:
+            raise ValueError(f"Sheet '{sheet_name}' is missing required column '{col}'")
+
+    # Use the original column names to access values
+    recipe_col = df_columns["recipe"]
+    qty_col = df_columns["qty"]
+    price_col = df_columns["unit_price"]
+
+    df = df[df[recipe_col].notna()]
+    if df.empty:
+        return {}
+
+    # Fast path: exact fixed-point integers and a grouped sum. Anything it
+    # cannot represent exactly (non-numeric text, NaN, huge values) goes
+    # through the row-by-row Decimal loop, which also reports bad rows.
+    qty = _to_fixed_point(df[qty_col])
+    price = _to_fixed_point(df[price_col])
+    if qty is None or price is None:
+        return _sum_cost_exact(df, recipe_col, qty_col, price_col)
+
+    qty_units, qty_scale = qty
+    price_units, price_scale = price
+    bound = int(np.abs(qty_units).max()) * int(np.abs(price_units).max()) * len(df)
+    if bound >= 2 ** 63:
+        return _sum_cost_exact(df, recipe_col, qty_col, price_col)
+
+    totals = pd.Series(qty_units * price_units).groupby(df[recipe_col].to_numpy(), sort=False).sum()
+    scale = qty_scale + price_scale
+    return {recipe: Decimal(int(total)).scaleb(-scale) for recipe, total in totals.items()}
+
+
+def _to_fixed_point(values: pd.Series) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Converts a column to integer minor units: returns `(units, scale)` such
+    that every value equals `Decimal(str(value))` == `units / 10**scale`.
+    Returns None when that cannot be done exactly with int64.
+
+    Every dtype (ints, floats, text, Decimal) is quantized the same way,
+    through `Decimal(str(value))`, so 3.335 and "3.335" give the same units.
+    Only distinct values are converted; prices and quantities repeat a lot.
+    """
+    if values.isna().any() or pd.api.types.is_bool_dtype(values):
+        return None
+
+    codes, uniques = pd.factorize(values)
+    try:
+        decimals = [Decimal(str(value)) for value in uniques]
+    except InvalidOperation:
+        return None
+    if not all(d.is_finite() for d in decimals):
+        return None
+    scale = max(0, -min((d.as_tuple().exponent for d in decimals), default=0))
+    units = [int(d.scaleb(scale)) for d in decimals]
+    if max((abs(u) for u in units), default=0) >= 2 ** 63:
+        return None
+    return np.array(units, dtype=np.int64)[codes], scale
+
+
+def _sum_cost_exact(df: pd.DataFrame, recipe_col, qty_col, price_col) -> Dict[str, Decimal]:
+    """Row-by-row Decimal sum of qty * unit_price per recipe."""
+    results: Dict[str, Decimal] = {}
+
+    for recipe, raw_qty, raw_price in zip(df[recipe_col], df[qty_col], df[price_col]):
+        try:
+            qty = Decimal(str(raw_qty))
+            unit_price = Decimal(str(raw_price))
+        except (InvalidOperation, TypeError) as e:
+            raise ValueError(f"Invalid numeric value in row for recipe '{recipe}': {e}")
+        if not (qty.is_finite() and unit_price.is_finite()):
+            # Empty or unparseable cells arrive as NaN once the sheet is typed
+            raise ValueError(f"Invalid numeric value in row for recipe '{recipe}': {raw_qty!r} x {raw_price!r}")
+
+        total = qty * unit_price
+        results[recipe] = results.get(recipe, Decimal("0")) + total
 
+    return results
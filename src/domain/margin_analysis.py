@@ -0,0 +1,169 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.domain.names import find_column, normalize_name
+from src.domain.recipe_graph import RecipeGraph
+from src.ports.data_source import DataSource
+
+# Accepted header names (compared lowercase and without accents)
+_PRODUCT_COLUMNS = ("produto", "product", "receita", "recipe")
+_UNITS_COLUMNS = ("quantidade", "units", "qtd")
+_REVENUE_COLUMNS = ("valor", "revenue", "valor total", "total")
+_DATE_COLUMNS = ("data", "date")
+
+# Period codes accepted by `calculate_margins` (pandas period aliases)
+PERIODS = {"D": "Diário", "W": "Semanal", "M": "Mensal", "Q": "Trimestral", "Y": "Anual"}
+
+MARGIN_COLUMNS = [
+    "product", "period", "units", "revenue", "avg_price", "unit_cost", "cost",
+    "contribution_per_unit", "contribution", "gross_margin_pct", "has_cost",
+]
+
+
+class MarginAnalysisService:
+    """
+    Joins the cost per recipe ("Custos") with the units sold and revenue per
+    product ("Faturamento") and computes, per product and period:
+
+    - cost = units * unit cost of the recipe with the same name, with
+      sub-recipes rolled up (see `RecipeGraph`)
+    - contribution = revenue - cost; contribution_per_unit = contribution / units
+    - gross_margin_pct = contribution / revenue
+
+    Ingredient costs are all variable, so the total contribution is also the
+    gross margin in currency. Products without a recipe in "Custos" keep
+    their revenue with NaN costs and `has_cost=False`.
+
+    Results are kept per (period, version of "Custos", version of
+    "Faturamento") in a small LRU, so repeated calls cost two version
+    lookups. When a source cannot report versions nothing is cached.
+    Returned frames are shared and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        data_source: DataSource,
+        costs_sheet: str = "Custos",
+        sales_sheet: str = "Faturamento",
+        max_entries: int = 16,
+    ):
+        self.data_source = data_source
+        self.costs_sheet = costs_sheet
+        self.sales_sheet = sales_sheet
+        self.max_entries = max_entries
+        self._results: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.computations = 0
+
+    def calculate_margins(self, period: Optional[str] = "M") -> pd.DataFrame:
+        """
+        Margins per product and period (`PERIODS` code, or None for the whole
+        range), sorted by total contribution. Columns: `MARGIN_COLUMNS`.
+        """
+        if period is not None and period not in PERIODS:
+            raise ValueError(f"Unknown period '{period}'; expected one of {sorted(PERIODS)} or None")
+
+        key = (period, self.data_source.get_version(self.costs_sheet), self.data_source.get_version(self.sales_sheet))
+        cacheable = key[1] is not None and key[2] is not None
+        if cacheable:
+            with self._lock:
+                cached = self._results.get(key)
+                if cached is not None:
+                    self._results.move_to_end(key)
+                    return cached
+
+        frames = self.data_source.get_many([self.costs_sheet, self.sales_sheet])
+        result = margins(frames[self.costs_sheet], frames[self.sales_sheet], period, self.costs_sheet)
+        self.computations += 1
+
+        if cacheable:
+            with self._lock:
+                self._results[key] = result
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        return result
+
+    def summary(self, margins_df: pd.DataFrame) -> Dict[str, float]:
+        """Totals over the products that have a cost (revenue, cost, contribution, margin %)."""
+        costed = margins_df[margins_df["has_cost"]]
+        revenue = float(costed["revenue"].sum())
+        contribution = float(costed["contribution"].sum())
+        return {
+            "revenue": revenue,
+            "cost": float(costed["cost"].sum()),
+            "contribution": contribution,
+            "gross_margin_pct": contribution / revenue if revenue else float("nan"),
+            "products_without_cost": int(margins_df.loc[~margins_df["has_cost"], "product"].nunique()),
+        }
+
+
+def margins(costs: pd.DataFrame, sales: pd.DataFrame, period: Optional[str] = "M", costs_sheet: str = "Custos") -> pd.DataFrame:
+    """Vectorized margin table of already loaded costs and sales frames."""
+    if sales is None or sales.empty:
+        return pd.DataFrame(columns=MARGIN_COLUMNS)
+
+    product_col = find_column(sales, _PRODUCT_COLUMNS)
+    units_col = find_column(sales, _UNITS_COLUMNS)
+    revenue_col = find_column(sales, _REVENUE_COLUMNS)
+    missing = [name for name, col in [("produto", product_col), ("quantidade", units_col), ("valor", revenue_col)] if col is None]
+    if missing:
+        raise ValueError(f"Sales sheet is missing required columns: {missing}")
+
+    # Products are matched by normalized name ("Brigadeiro " == "brigadeiro").
+    # Only the distinct names are normalized and rows are grouped by integer
+    # codes, which keeps this vectorized on large sheets.
+    name_codes, names = pd.factorize(sales[product_col])
+    names = np.array([str(name).strip() for name in names], dtype=object)
+    key_of_name, keys = pd.factorize(np.array([normalize_name(name) for name in names], dtype=object))
+    period_codes, period_labels = _periods(sales, period)
+
+    valid = name_codes >= 0
+    row_keys = key_of_name[name_codes[valid]]
+    frame = pd.DataFrame({
+        "key": row_keys,
+        "period": period_codes[valid],
+        "units": pd.to_numeric(sales[units_col], errors="coerce").to_numpy(dtype=np.float64)[valid],
+        "revenue": pd.to_numeric(sales[revenue_col], errors="coerce").to_numpy(dtype=np.float64)[valid],
+    })
+    frame = frame[np.asarray(keys, dtype=object)[row_keys] != ""]
+    grouped = frame.groupby(["key", "period"], sort=False).sum().reset_index()
+
+    # Display name of each product: the first spelling found in the sheet
+    first_name = pd.Series(names).groupby(key_of_name, sort=True).first().to_numpy(dtype=object)
+    grouped["product"] = first_name[grouped["key"].to_numpy()]
+    grouped["period_order"] = grouped["period"]
+    grouped["period"] = period_labels[grouped["period"].to_numpy()]
+
+    unit_costs = pd.Series(
+        {normalize_name(recipe): float(cost) for recipe, cost in RecipeGraph(costs, costs_sheet).unit_costs().items()},
+        dtype=np.float64,
+    )
+    cost_of_key = pd.Series(keys).map(unit_costs).to_numpy(dtype=np.float64)
+    grouped["unit_cost"] = cost_of_key[grouped["key"].to_numpy()]
+    grouped["has_cost"] = grouped["unit_cost"].notna()
+    grouped["cost"] = grouped["units"] * grouped["unit_cost"]
+    grouped["contribution"] = grouped["revenue"] - grouped["cost"]
+    units = grouped["units"].where(grouped["units"] != 0)
+    grouped["avg_price"] = grouped["revenue"] / units
+    grouped["contribution_per_unit"] = grouped["contribution"] / units
+    grouped["gross_margin_pct"] = grouped["contribution"] / grouped["revenue"].where(grouped["revenue"] != 0)
+
+    grouped = grouped.sort_values(["period_order", "contribution"], ascending=[True, False], na_position="last")
+    return grouped[MARGIN_COLUMNS].reset_index(drop=True)
+
+
+def _periods(sales: pd.DataFrame, period: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row period codes (chronological) and their labels; rows without a date get "Sem data"."""
+    if period is None:
+        return np.zeros(len(sales), dtype=np.intp), np.array(["Total"], dtype=object)
+    date_col = find_column(sales, _DATE_COLUMNS)
+    if date_col is None:
+        raise ValueError("Sales sheet has no date column; use period=None for totals")
+    dates = sales[date_col]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, dayfirst=True, errors="coerce")
+    codes, uniques = pd.factorize(dates.dt.to_period(period), sort=True)
+    labels = np.append(uniques.astype(str).to_numpy(dtype=object), "Sem data")
+    return np.where(codes < 0, len(labels) - 1, codes), labels
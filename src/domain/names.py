@@ -0,0 +1,17 @@
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+import pandas as pd
+
+
+def normalize_name(name) -> str:
+    """Lowercase, accent-free and single-spaced, so "Ganache " matches "ganache" and "Preço" matches "preco"."""
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(text.lower().split())
+
+
+def find_column(df: pd.DataFrame, candidates: Sequence[str]) -> Optional[str]:
+    """First column of `df` whose normalized header is one of `candidates` (in the order given)."""
+    by_name: Dict[str, List] = {}
+    for column in df.columns:
+        by_name.setdefault(normalize_name(column), []).append(column)
+    return next((by_name[c][0] for c in candidates if c in by_name), None)
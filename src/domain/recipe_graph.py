@@ -0,0 +1,310 @@
+from collections import deque
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+from src.domain.cost_analysis_service import cost_per_recipe
+from src.domain.names import normalize_name
+
+# Optional column with how many units one batch of a recipe yields
+_YIELD_COLUMNS = ("yield", "rendimento")
+
+
+class RecipeCycleError(ValueError):
+    """Raised when recipes use each other as ingredients in a loop."""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__("Recipe cycle detected: " + " -> ".join(cycle))
+
+
+class RecipeGraph:
+    """
+    Recipe costs rolled up through intermediate preparations.
+
+    A row of the costs sheet whose ingredient is itself a recipe (e.g.
+    "Ganache" used by "Bolo Trufado") is a sub-recipe edge: its cost is
+    qty * (cost of the sub-recipe / its yield), where the yield comes from an
+    optional "yield"/"rendimento" column (default 1, i.e. qty counts
+    batches). The unit_price of such rows is ignored. Every other row is a
+    raw ingredient costed as qty * unit_price, exactly (Decimal).
+
+    Costs are computed in topological order and memoized; cycles raise
+    `RecipeCycleError`. `set_price` changes a raw ingredient price and
+    invalidates only the recipes that use it, directly or through
+    sub-recipes. Names are matched case-, accent- and space-insensitively.
+    """
+
+    def __init__(self, costs: pd.DataFrame, sheet_name: str = "Custos"):
+        self.sheet_name = sheet_name
+        self._names: Dict[str, str] = {}
+        self._direct: Dict[str, Decimal] = {}
+        self._edges: Dict[str, List[Tuple[str, Decimal]]] = {}
+        self._parents: Dict[str, Set[str]] = {}
+        self._yields: Dict[str, Decimal] = {}
+        self._raw = pd.DataFrame(columns=["recipe", "ingredient", "qty", "unit_price"])
+        self._ingredient_names: Dict[str, str] = {}
+        # ingredient -> positions of its rows in _raw, built on first use
+        self._ingredient_rows: Optional[Dict[str, np.ndarray]] = None
+        # ingredient -> cost per recipe after a price change (replaces the sheet rows)
+        self._changed: Dict[str, Dict[str, Decimal]] = {}
+        self._memo: Dict[str, Decimal] = {}
+        self.recomputations = 0
+        if costs is not None and not costs.empty:
+            self._load(costs)
+        self._order = self._topological_order()
+
+    # ------------------------------------------------------------------ build
+
+    def _load(self, costs: pd.DataFrame) -> None:
+        columns = {c.lower(): c for c in costs.columns}
+        for required in ["recipe", "qty", "unit_price"]:
+            if required not in columns:
+                raise ValueError(f"Sheet '{self.sheet_name}' is missing required column '{required}'")
+        costs = costs[costs[columns["recipe"]].notna()]
+
+        recipe_keys, recipe_names = _keys(costs[columns["recipe"]])
+        if "ingredient" in columns:
+            ingredient_keys, self._ingredient_names = _keys(costs[columns["ingredient"]])
+        else:
+            # Without ingredient names every row is a raw cost line
+            ingredient_keys = pd.Categorical([None] * len(costs), categories=pd.Index([], dtype=object))
+        self._names = recipe_names
+        for key in recipe_names:
+            self._direct[key] = Decimal("0")
+            self._edges[key] = []
+            self._parents[key] = set()
+            self._yields[key] = Decimal("1")
+
+        yield_col = next((columns[c] for c in _YIELD_COLUMNS if c in columns), None)
+        if yield_col is not None:
+            self._load_yields(recipe_keys, costs[yield_col])
+
+        is_sub = np.asarray(pd.Series(ingredient_keys).isin(list(recipe_names)))
+        for recipe, sub, qty in zip(recipe_keys[is_sub], ingredient_keys[is_sub], costs[columns["qty"]].to_numpy()[is_sub]):
+            amount = _decimal(qty, f"quantity of '{sub}' in recipe '{recipe}'")
+            self._edges[recipe].append((sub, amount))
+            self._parents[sub].add(recipe)
+
+        raw = ~is_sub
+        self._raw = pd.DataFrame({
+            "recipe": recipe_keys[raw],
+            "ingredient": ingredient_keys[raw],
+            "qty": costs[columns["qty"]].to_numpy()[raw],
+            "unit_price": costs[columns["unit_price"]].to_numpy()[raw],
+        })
+        self._direct.update(cost_per_recipe(self._raw, self.sheet_name))
+        for key in recipe_names:
+            self._ingredient_names.pop(key, None)
+
+    def _load_yields(self, recipe_keys: np.ndarray, values: pd.Series) -> None:
+        yields = pd.DataFrame({"recipe": recipe_keys, "yield": pd.to_numeric(values, errors="coerce")})
+        for recipe, value in yields.dropna().groupby("recipe", sort=False, observed=True)["yield"].first().items():
+            if value <= 0:
+                raise ValueError(f"Recipe '{self._names[recipe]}' has a non-positive yield: {value}")
+            self._yields[recipe] = Decimal(str(value))
+
+    def _topological_order(self) -> List[str]:
+        """Sub-recipes before the recipes that use them (Kahn's algorithm)."""
+        pending = {recipe: len(edges) for recipe, edges in self._edges.items()}
+        ready = deque(recipe for recipe, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            recipe = ready.popleft()
+            order.append(recipe)
+            for parent in self._parents[recipe]:
+                pending[parent] -= sum(1 for sub, _ in self._edges[parent] if sub == recipe)
+                if pending[parent] == 0:
+                    ready.append(parent)
+        if len(order) < len(self._edges):
+            raise RecipeCycleError([self._names[r] for r in self._find_cycle(set(self._edges) - set(order))])
+        return order
+
+    def _find_cycle(self, candidates: Set[str]) -> List[str]:
+        # Follow sub-recipe edges inside the unresolved set until a node repeats.
+        path: List[str] = []
+        seen: Dict[str, int] = {}
+        recipe = min(candidates)
+        while recipe not in seen:
+            seen[recipe] = len(path)
+            path.append(recipe)
+            recipe = next(sub for sub, _ in self._edges[recipe] if sub in candidates)
+        return path[seen[recipe]:] + [recipe]
+
+    # ------------------------------------------------------------------ query
+
+    @property
+    def recipes(self) -> List[str]:
+        """Recipe names in topological order (sub-recipes first)."""
+        return [self._names[r] for r in self._order]
+
+    @property
+    def ingredients(self) -> List[str]:
+        """Raw ingredient names (sub-recipes excluded), sorted."""
+        return sorted(self._ingredient_names.values())
+
+    def is_intermediate(self, recipe: str) -> bool:
+        """True when the recipe is used as an ingredient of another recipe."""
+        return bool(self._parents.get(normalize_name(recipe)))
+
+    def sub_recipes(self, recipe: str) -> List[Tuple[str, Decimal]]:
+        return [(self._names[sub], qty) for sub, qty in self._edges[self._key(recipe)]]
+
+    def cost(self, recipe: str) -> Decimal:
+        """Total cost of one batch of the recipe, sub-recipes included."""
+        key = self._key(recipe)
+        if key not in self._memo:
+            self._compute(self._pending_order_of(key))
+        return self._memo[key]
+
+    def costs(self) -> Dict[str, Decimal]:
+        """Rolled-up cost of every recipe, keyed by its name as written in the sheet."""
+        self._compute(self._order)
+        return {self._names[r]: self._memo[r] for r in self._order}
+
+    def unit_costs(self) -> Dict[str, Decimal]:
+        """Rolled-up cost of one unit of every recipe (batch cost / yield)."""
+        return {name: cost / self._yields[normalize_name(name)] for name, cost in self.costs().items()}
+
+    def dependents(self, name: str) -> Set[str]:
+        """Recipes whose cost depends on a recipe (transitively), by name."""
+        return {self._names[r] for r in self._ancestors({normalize_name(name)})}
+
+    # ----------------------------------------------------------------- update
+
+    def set_price(self, ingredient: str, price) -> List[str]:
+        """
+        Sets the unit price of a raw ingredient in every recipe using it and
+        returns the names of the recipes whose cost changed (directly or via
+        sub-recipes). Only those recipes are recomputed on the next query.
+        """
+        price = _decimal(price, f"price of '{ingredient}'")
+        return self._change_ingredient(ingredient, lambda rows, old: {r: q * price for r, q in self._quantities(rows).items()})
+
+    def scale_price(self, ingredient: str, factor) -> List[str]:
+        """Multiplies every price of a raw ingredient by `factor` (1.12 = +12%); see `set_price`."""
+        factor = _decimal(factor, f"price factor of '{ingredient}'")
+        return self._change_ingredient(ingredient, lambda rows, old: {r: cost * factor for r, cost in old.items()})
+
+    def _change_ingredient(self, ingredient: str, new_costs: Callable) -> List[str]:
+        """
+        Replaces the cost an ingredient adds to each recipe. Work is
+        proportional to the ingredient's rows, found through the index.
+        """
+        key = normalize_name(ingredient)
+        if key in self._edges:
+            raise ValueError(f"'{ingredient}' is a recipe; its cost comes from its own ingredients")
+        positions = self._index().get(key)
+        if positions is None:
+            raise KeyError(f"Ingredient '{ingredient}' is not used by any recipe")
+
+        rows = self._raw.iloc[positions]
+        old = self._changed[key] if key in self._changed else cost_per_recipe(rows, self.sheet_name)
+        new = new_costs(rows, old)
+        self._changed[key] = new
+
+        changed = {r for r in new if new[r] != old[r]}
+        for recipe in changed:
+            self._direct[recipe] += new[recipe] - old[recipe]
+        affected = changed | self._ancestors(changed)
+        for recipe in affected:
+            self._memo.pop(recipe, None)
+        return sorted(self._names[r] for r in affected)
+
+    def copy(self) -> "RecipeGraph":
+        """Independent copy for what-if changes (rows and index are shared read-only)."""
+        self._index()
+        clone = RecipeGraph.__new__(RecipeGraph)
+        clone.__dict__.update(self.__dict__)
+        clone._direct = dict(self._direct)
+        clone._changed = dict(self._changed)
+        clone._memo = dict(self._memo)
+        clone.recomputations = 0
+        return clone
+
+    # -------------------------------------------------------------- internals
+
+    def _key(self, recipe: str) -> str:
+        key = normalize_name(recipe)
+        if key not in self._edges:
+            raise KeyError(f"Unknown recipe '{recipe}'")
+        return key
+
+    def _index(self) -> Dict[str, np.ndarray]:
+        """Ingredient -> row positions in the raw rows (one stable sort)."""
+        if self._ingredient_rows is None:
+            codes = self._raw["ingredient"].cat.codes.to_numpy() if len(self._raw) else np.array([], dtype=np.int8)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.flatnonzero(np.diff(codes[order])) + 1
+            index = {}
+            for positions in np.split(order, bounds) if len(order) else []:
+                code = codes[positions[0]]
+                if code >= 0:
+                    index[self._raw["ingredient"].cat.categories[code]] = positions
+            self._ingredient_rows = index
+        return self._ingredient_rows
+
+    def _quantities(self, rows: pd.DataFrame) -> Dict[str, Decimal]:
+        return cost_per_recipe(rows.assign(unit_price=1), self.sheet_name)
+
+    def _ancestors(self, recipes: Iterable[str]) -> Set[str]:
+        found: Set[str] = set()
+        queue = deque(recipes)
+        while queue:
+            for parent in self._parents.get(queue.popleft(), ()):
+                if parent not in found:
+                    found.add(parent)
+                    queue.append(parent)
+        return found
+
+    def _pending_order_of(self, key: str) -> List[str]:
+        """The recipe and the sub-recipes it needs that are not memoized, sub-recipes first."""
+        order: List[str] = []
+        seen = {key}
+        stack = [(key, iter(self._edges[key]))]
+        while stack:
+            recipe, subs = stack[-1]
+            for sub, _ in subs:
+                if sub not in seen and sub not in self._memo:
+                    seen.add(sub)
+                    stack.append((sub, iter(self._edges[sub])))
+                    break
+            else:
+                stack.pop()
+                order.append(recipe)
+        return order
+
+    def _compute(self, order: Iterable[str]) -> None:
+        for recipe in order:
+            if recipe in self._memo:
+                continue
+            total = self._direct[recipe]
+            for sub, qty in self._edges[recipe]:
+                total += qty * self._memo[sub] / self._yields[sub]
+            self._memo[recipe] = total
+            self.recomputations += 1
+
+
+def _keys(values: pd.Series) -> Tuple[pd.Categorical, Dict[str, str]]:
+    """
+    Normalized key per row (categorical; empty names are missing) and the
+    first spelling seen for each key. Only distinct names are normalized.
+    """
+    codes, uniques = pd.factorize(values)
+    names = [str(name).strip() for name in uniques]
+    key_codes, keys = pd.factorize(np.array([normalize_name(name) or None for name in names] + [None], dtype=object))
+    first: Dict[str, str] = {}
+    for code, name in zip(key_codes, names):
+        if code >= 0:
+            first.setdefault(keys[code], name)
+    return pd.Categorical.from_codes(key_codes[codes], categories=pd.Index(keys, dtype=object)), first
+
+
+def _decimal(value, what: str) -> Decimal:
+    try:
+        number = Decimal(str(value))
+    except Exception:
+        raise ValueError(f"Invalid {what}: {value!r}")
+    if not number.is_finite():
+        raise ValueError(f"Invalid {what}: {value!r}")
+    return number
@@ -0,0 +1,219 @@
+import threading
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.domain.names import find_column
+from src.ports.data_source import DataSource
+
+# Granularities kept precomputed (pandas period aliases)
+GRANULARITIES = {"D": "Diário", "W": "Semanal", "M": "Mensal"}
+
+# Accepted header names (compared lowercase and without accents)
+_DATE_COLUMNS = ("data", "date")
+_PRODUCT_COLUMNS = ("produto", "product")
+_CATEGORY_COLUMNS = ("categoria", "category")
+_UNITS_COLUMNS = ("quantidade", "qtd", "units")
+_REVENUE_COLUMNS = ("valor", "valor total", "total", "revenue")
+
+_KEYS = ["period", "product", "category"]
+_MEASURES = ["revenue", "units", "sales"]
+
+
+class SalesTimeSeries:
+    """
+    Revenue, units and number of sales per day, week and month, per product
+    and category, kept precomputed for a sales sheet.
+
+    `update` takes the current sales frame. When it only grew at the end
+    (every processed row hashes as before), only the new rows are parsed
+    and aggregated, and only the days, weeks and months they touch are
+    recomputed; any other change rebuilds everything. Weeks start on
+    Monday; ticket médio is revenue / number of sales.
+    """
+
+    def __init__(self):
+        self._tables: Dict[str, pd.DataFrame] = {g: _empty() for g in GRANULARITIES}
+        self._rows = 0
+        # One hash per processed row, to tell an append from an edit anywhere
+        self._row_hashes = np.empty(0, dtype=np.uint64)
+        self._columns: Optional[Tuple] = None
+        self.full_rebuilds = 0
+        self.incremental_updates = 0
+        self.skipped_rows = 0
+
+    @property
+    def rows(self) -> int:
+        """Number of sheet rows already aggregated."""
+        return self._rows
+
+    def update(self, sales: pd.DataFrame) -> int:
+        """Brings the aggregates up to date with `sales`; returns the number of rows processed."""
+        if sales is None or sales.empty:
+            self.__init__()
+            return 0
+        columns = tuple(sales.columns)
+        hashes = pd.util.hash_pandas_object(sales, index=False).to_numpy()
+        if columns == self._columns and len(sales) >= self._rows and np.array_equal(hashes[:self._rows], self._row_hashes):
+            new_rows = sales.iloc[self._rows:]
+            if new_rows.empty:
+                return 0
+            self.incremental_updates += 1
+        else:
+            self._tables = {g: _empty() for g in GRANULARITIES}
+            self.skipped_rows = 0
+            new_rows = sales
+            self.full_rebuilds += 1
+
+        daily = self._daily(new_rows)
+        if not daily.empty:
+            # Only the days, weeks and months from the earliest new day on change
+            since = daily["period"].min()
+            table = self._tables["D"]
+            touched = table[table["period"] >= since]
+            self._tables["D"] = _replace_from(table, since, _aggregate(pd.concat([touched, daily], ignore_index=True)))
+            for granularity in ("W", "M"):
+                start = pd.Period(since, granularity).start_time
+                days = self._tables["D"][self._tables["D"]["period"] >= start]
+                self._tables[granularity] = _replace_from(self._tables[granularity], start, _rollup(days, granularity))
+
+        self._rows = len(sales)
+        self._columns = columns
+        self._row_hashes = hashes
+        return len(new_rows)
+
+    def _daily(self, sales: pd.DataFrame) -> pd.DataFrame:
+        date_col = find_column(sales, _DATE_COLUMNS)
+        revenue_col = find_column(sales, _REVENUE_COLUMNS)
+        if date_col is None or revenue_col is None:
+            raise ValueError("Sales sheet needs a date column and a value column")
+        product_col = find_column(sales, _PRODUCT_COLUMNS)
+        category_col = find_column(sales, _CATEGORY_COLUMNS)
+        units_col = find_column(sales, _UNITS_COLUMNS)
+
+        # Dates are parsed once, when the rows are first seen
+        dates = sales[date_col]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, dayfirst=True, errors="coerce")
+        frame = pd.DataFrame({
+            "period": dates.dt.normalize().to_numpy(),
+            "product": _labels(sales, product_col, "Sem produto"),
+            "category": _labels(sales, category_col, "Sem categoria"),
+            "revenue": pd.to_numeric(sales[revenue_col], errors="coerce").fillna(0).to_numpy(dtype=np.float64),
+            "units": pd.to_numeric(sales[units_col], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+            if units_col is not None else np.zeros(len(sales)),
+            "sales": np.ones(len(sales), dtype=np.int64),
+        })
+        valid = frame["period"].notna()
+        self.skipped_rows += int((~valid).sum())
+        return _aggregate(frame[valid])
+
+    # ------------------------------------------------------------------ query
+
+    def table(self, granularity: str) -> pd.DataFrame:
+        """Precomputed aggregates: period, product, category, revenue, units, sales."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}'; expected one of {sorted(GRANULARITIES)}")
+        return self._tables[granularity]
+
+    def date_range(self) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        daily = self._tables["D"]
+        if daily.empty:
+            return None
+        return daily["period"].iloc[0], daily["period"].iloc[-1]
+
+    def series(
+        self,
+        granularity: str,
+        by: Optional[str] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """
+        Totals per period between `start` and `end` (inclusive, periods that
+        start inside the range), optionally split `by` "product" or
+        "category". Columns: period, [by], revenue, units, sales, ticket.
+        """
+        if by not in (None, "product", "category"):
+            raise ValueError("by must be None, 'product' or 'category'")
+        table = self.table(granularity)
+        if start is not None:
+            table = table[table["period"] >= pd.Period(pd.Timestamp(start), granularity).start_time]
+        if end is not None:
+            table = table[table["period"] <= pd.Timestamp(end)]
+        keys = ["period"] + ([by] if by else [])
+        result = table.groupby(keys, sort=True)[_MEASURES].sum().reset_index()
+        result["ticket"] = result["revenue"] / result["sales"].where(result["sales"] != 0)
+        return result
+
+
+def best_granularity(start, end, max_points: int = 120) -> str:
+    """Finest granularity whose number of periods between `start` and `end` fits `max_points`."""
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    if days <= max_points:
+        return "D"
+    if days / 7 <= max_points:
+        return "W"
+    return "M"
+
+
+class SalesTimeSeriesService:
+    """
+    Keeps a `SalesTimeSeries` in step with a sales sheet: the sheet is only
+    read again when its version changes, and then only new rows are
+    aggregated (see `SalesTimeSeries.update`). Thread-safe; meant to be
+    shared by every session.
+    """
+
+    def __init__(self, data_source: DataSource, sheet_name: str = "Vendas Diárias"):
+        self.data_source = data_source
+        self.sheet_name = sheet_name
+        self.timeseries = SalesTimeSeries()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self) -> SalesTimeSeries:
+        """The up-to-date aggregates; treat the returned object as read-only."""
+        version = self.data_source.get_version(self.sheet_name)
+        with self._lock:
+            if version is None or version != self._version:
+                self.timeseries.update(self.data_source.get_data(self.sheet_name))
+                self._version = version
+            return self.timeseries
+
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame({
+        "period": pd.Series(dtype="datetime64[ns]"),
+        "product": pd.Series(dtype=object),
+        "category": pd.Series(dtype=object),
+        "revenue": pd.Series(dtype=np.float64),
+        "units": pd.Series(dtype=np.float64),
+        "sales": pd.Series(dtype=np.int64),
+    })
+
+
+def _aggregate(frame: pd.DataFrame) -> pd.DataFrame:
+    if frame.empty:
+        return _empty()
+    result = frame.groupby(_KEYS, sort=True, observed=True)[_MEASURES].sum().reset_index()
+    result["period"] = result["period"].astype("datetime64[ns]")
+    return result
+
+
+def _replace_from(table: pd.DataFrame, since: pd.Timestamp, replacement: pd.DataFrame) -> pd.DataFrame:
+    """`table` (sorted by period) with every row from period `since` on replaced."""
+    cut = int(np.searchsorted(table["period"].to_numpy(), np.datetime64(since), side="left"))
+    return pd.concat([table.iloc[:cut], replacement], ignore_index=True)
+
+
+def _rollup(daily: pd.DataFrame, granularity: str) -> pd.DataFrame:
+    """Aggregates of daily rows per week (starting Monday) or month."""
+    return _aggregate(daily.assign(period=daily["period"].dt.to_period(granularity).dt.start_time))
+
+
+def _labels(sales: pd.DataFrame, column: Optional[str], missing: str) -> np.ndarray:
+    if column is None:
+        return np.full(len(sales), missing, dtype=object)
+    values = sales[column].astype(object).where(sales[column].notna(), missing)
+    return values.astype(str).str.strip().to_numpy(dtype=object)
+
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from src.infrastructure.cached_data_source import CachedDataSource
+from src.infrastructure.throttling import read_once_scope
+from src.ports.data_source import DataSourceError
+
+
+class BackgroundRefresher:
+    """
+    Keeps a shared `CachedDataSource` warm from a daemon thread.
+
+    Every `interval` seconds the configured sheets are checked against the
+    revision of the cache's inner source: unchanged sheets are only marked as
+    confirmed, changed or missing ones are re-read in one `get_many` call and
+    swapped into the cache atomically. Readers never wait on the network;
+    they keep getting the previous frame until the new one is in place.
+
+    When the inner source has a `sync` method (`SnapshotDataSource`, and the
+    federated and cached sources above it), it is called first, so the
+    revision checked is the live one rather than a snapshot's. If the batch
+    fails, the sheets are read one by one and those that succeed are still
+    swapped in. Sheets that could not be checked or read are listed in
+    `errors` (and summarized in `last_error`); `last_refreshed_at` is the
+    end of the last check in which every sheet succeeded. The revision is
+    spreadsheet-wide, so each check reads it once per spreadsheet (once per
+    store when federated) and reuses it for every sheet.
+    """
+
+    def __init__(
+        self,
+        cache: CachedDataSource,
+        sheet_names: List[str],
+        interval: float = 30.0,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.cache = cache
+        self.sheet_names = list(sheet_names)
+        self.interval = interval
+        self._wall_clock = wall_clock
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_refreshed_at: Optional[float] = None
+        self.last_attempt_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        # sheet name -> error of the last check, for the sheets that failed
+        self.errors: Dict[str, str] = {}
+        self.refreshes = 0
+        self.swaps = 0
+
+    def start(self) -> "BackgroundRefresher":
+        """Starts the daemon thread (idempotent); the first refresh runs right away."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sheet-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stale(self) -> bool:
+        """True when the last check failed for some sheet (its previous frame is still served)."""
+        return bool(self.errors)
+
+    def refresh_once(self) -> Dict[str, bool]:
+        """
+        Checks every sheet once and returns, per sheet, whether a new frame
+        was swapped into the cache.
+        """
+        inner = self.cache.inner
+        sync = getattr(inner, "sync", None)
+        errors: Dict[str, str] = {}
+        changed: Dict[str, Optional[str]] = {}
+        swapped = {name: False for name in self.sheet_names}
+        with read_once_scope():
+            for name in self.sheet_names:
+                if sync is not None:
+                    try:
+                        sync(name)
+                    except DataSourceError as e:
+                        errors[name] = str(e)
+                try:
+                    version = inner.get_version(name)
+                except DataSourceError:
+                    version = None
+                unchanged = version is not None and version == self.cache.cached_version(name)
+                # A sheet whose sync failed is not marked as confirmed
+                if unchanged and (name in errors or self.cache.touch(name)):
+                    continue
+                changed[name] = version
+
+        if changed:
+            frames = self._read(inner, list(changed), errors)
+            for name, frame in frames.items():
+                self.cache.put(name, frame, changed[name])
+                swapped[name] = True
+            self.swaps += len(frames)
+
+        self.refreshes += 1
+        now = self._wall_clock()
+        self.last_attempt_at = now
+        self.errors = errors
+        self.last_error = "; ".join(f"{name}: {message}" for name, message in errors.items()) or None
+        if not errors:
+            self.last_refreshed_at = now
+        return swapped
+
+    @staticmethod
+    def _read(inner, sheet_names: List[str], errors: Dict[str, str]) -> Dict[str, object]:
+        """One batch; if it fails (e.g. a tab missing), sheets are read one by one and failures recorded."""
+        try:
+            return inner.get_many(sheet_names)
+        except DataSourceError:
+            pass
+        frames = {}
+        for name in sheet_names:
+            try:
+                frames[name] = inner.get_data(name)
+            except DataSourceError as e:
+                errors[name] = str(e)
+        return frames
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh_once()
+            except Exception as e:
+                # Keep the thread alive; readers keep the previous frames.
+                self.last_error = str(e)
+            self._stop.wait(self.interval)
@@ -0,0 +1,254 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Optional
+import pandas as pd
+from src.ports.data_source import DataSource, DataSourceError
+
+
+class _CacheEntry:
+    __slots__ = ("frame", "version", "size", "fetched_at", "confirmed_at")
+
+    def __init__(self, frame: pd.DataFrame, version: Optional[str], size: int, fetched_at: float, confirmed_at: float):
+        self.frame = frame
+        self.version = version
+        self.size = size
+        self.fetched_at = fetched_at
+        # Wall-clock time at which the content was last known to be current
+        self.confirmed_at = confirmed_at
+
+
+class CachedDataSource(DataSource):
+    """
+    DataSource decorator that keeps recently read sheets in memory.
+
+    - Entries are kept in LRU order and evicted once the total DataFrame
+      memory goes above `max_bytes`.
+    - Each sheet is trusted for `ttl` seconds (`ttl_per_sheet` overrides the
+      default per sheet name). After that the inner source's revision is
+      checked: if it did not change, the cached frame is served again
+      without re-reading the data.
+    - The instance is thread-safe so a single cache can be shared by every
+      Streamlit session.
+
+    Returned DataFrames are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(
+        self,
+        inner: DataSource,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: float = 60.0,
+        ttl_per_sheet: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.inner = inner
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttl_per_sheet = dict(ttl_per_sheet or {})
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._sheet_hits: Counter = Counter()
+        self._sheet_misses: Counter = Counter()
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        """
+        Returns the cached DataFrame for the sheet, reading it from the inner
+        source only when it is missing or its revision changed.
+        """
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+            if entry is not None and not self._is_expired(sheet_name, entry):
+                self._entries.move_to_end(sheet_name)
+                self.hits += 1
+                self._sheet_hits[sheet_name] += 1
+                return entry.frame
+
+        version = self._safe_version(sheet_name)
+        if self._revalidate(sheet_name, entry, version):
+            return entry.frame
+
+        with self._lock:
+            self.misses += 1
+            self._sheet_misses[sheet_name] += 1
+        frame = self.inner.get_data(sheet_name)
+        self._store(sheet_name, frame, version)
+        return frame
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Serves the sheets that are still valid from memory and reads all the
+        others from the inner source with a single `get_many` call.
+        """
+        result: Dict[str, pd.DataFrame] = {}
+        stale: Dict[str, Optional[_CacheEntry]] = {}
+        with self._lock:
+            for name in sheet_names:
+                entry = self._entries.get(name)
+                if entry is not None and not self._is_expired(name, entry):
+                    self._entries.move_to_end(name)
+                    self.hits += 1
+                    self._sheet_hits[name] += 1
+                    result[name] = entry.frame
+                else:
+                    stale[name] = entry
+
+        versions = {name: self._safe_version(name) for name in stale}
+        to_fetch = []
+        for name, entry in stale.items():
+            if self._revalidate(name, entry, versions[name]):
+                result[name] = entry.frame
+            else:
+                to_fetch.append(name)
+
+        if to_fetch:
+            with self._lock:
+                self.misses += len(to_fetch)
+                self._sheet_misses.update(to_fetch)
+            fetched = self.inner.get_many(to_fetch)
+            for name in to_fetch:
+                self._store(name, fetched[name], versions[name])
+                result[name] = fetched[name]
+
+        return {name: result[name] for name in sheet_names}
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        """
+        Revision of the copy this source would serve: the cached one while it
+        is within its TTL (no request), otherwise the inner source's.
+        """
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+            if entry is not None and entry.version is not None and not self._is_expired(sheet_name, entry):
+                return entry.version
+        return self.inner.get_version(sheet_name)
+
+    def append_rows(self, sheet_name: str, rows) -> None:
+        """Writes go to the inner source; the cached copy is replaced once its revision changes."""
+        self.inner.append_rows(sheet_name, rows)
+
+    def sync(self, sheet_name: str) -> None:
+        """
+        Has the inner source check the sheet's current revision now (when it
+        has a `sync` too) and drops the cached copy if that revision differs.
+        """
+        sync = getattr(self.inner, "sync", None)
+        if sync is not None:
+            sync(sheet_name)
+        version = self._safe_version(sheet_name)
+        cached = self.cached_version(sheet_name)
+        if version is not None and cached is not None and version != cached:
+            self.invalidate(sheet_name)
+
+    def put(self, sheet_name: str, frame: pd.DataFrame, version: Optional[str]) -> None:
+        """Atomically replaces the cached frame of a sheet (used by background refreshes)."""
+        self._store(sheet_name, frame, version)
+
+    def touch(self, sheet_name: str) -> bool:
+        """Marks a cached sheet as just confirmed current; False if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+            if entry is None:
+                return False
+            entry.fetched_at = self._clock()
+            entry.confirmed_at = self._wall_clock()
+            return True
+
+    def cached_version(self, sheet_name: str) -> Optional[str]:
+        """Revision of the cached copy, or None if the sheet is not cached."""
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+            return entry.version if entry is not None else None
+
+    def data_as_of(self, sheet_name: str) -> Optional[float]:
+        """Epoch seconds at which the cached copy was last confirmed current."""
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+            return entry.confirmed_at if entry is not None else None
+
+    def invalidate(self, sheet_name: Optional[str] = None) -> None:
+        """Drops one sheet (or every sheet when no name is given) from the cache."""
+        with self._lock:
+            if sheet_name is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            entry = self._entries.pop(sheet_name, None)
+            if entry is not None:
+                self._total_bytes -= entry.size
+
+    def stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters and current memory usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def sheet_stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns hit/miss counters per sheet name."""
+        with self._lock:
+            stats = {}
+            for name in set(self._sheet_hits) | set(self._sheet_misses):
+                hits, misses = self._sheet_hits[name], self._sheet_misses[name]
+                stats[name] = {"hits": hits, "misses": misses, "hit_ratio": hits / (hits + misses)}
+            return stats
+
+    def _ttl_for(self, sheet_name: str) -> float:
+        return self.ttl_per_sheet.get(sheet_name, self.ttl)
+
+    def _is_expired(self, sheet_name: str, entry: _CacheEntry) -> bool:
+        return self._clock() - entry.fetched_at >= self._ttl_for(sheet_name)
+
+    def _safe_version(self, sheet_name: str) -> Optional[str]:
+        # A failing revision lookup must not break reads: treat it as unknown
+        # so the data is simply fetched again.
+        try:
+            return self.inner.get_version(sheet_name)
+        except DataSourceError:
+            return None
+
+    def _revalidate(self, sheet_name: str, entry: Optional[_CacheEntry], version: Optional[str]) -> bool:
+        """Renews an expired entry whose revision did not change."""
+        if entry is None or version is None or version != entry.version:
+            return False
+        with self._lock:
+            if self._entries.get(sheet_name) is entry:
+                entry.fetched_at = self._clock()
+                entry.confirmed_at = self._wall_clock()
+                self._entries.move_to_end(sheet_name)
+            self.hits += 1
+            self._sheet_hits[sheet_name] += 1
+            self.revalidations += 1
+        return True
+
+    def _store(self, sheet_name: str, frame: pd.DataFrame, version: Optional[str]) -> None:
+        size = int(frame.memory_usage(deep=True).sum()) if frame is not None else 0
+        with self._lock:
+            old = self._entries.pop(sheet_name, None)
+            if old is not None:
+                self._total_bytes -= old.size
+            if size > self.max_bytes:
+                # Never cache a frame that alone exceeds the budget.
+                return
+            self._entries[sheet_name] = _CacheEntry(frame, version, size, self._clock(), self._wall_clock())
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size
+                self.evictions += 1
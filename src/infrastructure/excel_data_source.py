@@ -0,0 +1,102 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+import openpyxl
+import pandas as pd
+from src.ports.data_source import DataSource, DataSourceError
+
+
+class ExcelDataSource(DataSource):
+    """
+    DataSource that reads worksheets from a local .xlsx file (e.g. "RECEITAS AWI.xlsx").
+
+    The workbook is opened in openpyxl's read-only streaming mode and a
+    worksheet is only parsed the first time it is requested. Parsed frames
+    are cached together with the file's modification time, so editing the
+    file on disk makes the next read parse it again.
+
+    The first non-empty row is the header (blank header cells are named
+    "Unnamed: <index>", like pandas does); empty cells become None.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._frames: Dict[str, Tuple[float, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        return self.get_many([sheet_name])[sheet_name]
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """Returns the requested sheets, opening the workbook at most once."""
+        mtime = self._mtime()
+        with self._lock:
+            result = {
+                name: cached[1]
+                for name in sheet_names
+                if (cached := self._frames.get(name)) is not None and cached[0] == mtime
+            }
+            missing = [name for name in dict.fromkeys(sheet_names) if name not in result]
+            if missing:
+                parsed = self._parse(missing)
+                for name, frame in parsed.items():
+                    self._frames[name] = (mtime, frame)
+                result.update(parsed)
+        return {name: result[name] for name in sheet_names}
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        return str(self._mtime())
+
+    def sheet_names(self) -> List[str]:
+        """Lists the worksheet titles without parsing any of them."""
+        workbook = self._open()
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+
+    def _mtime(self) -> float:
+        try:
+            return os.path.getmtime(self.path)
+        except OSError as e:
+            raise DataSourceError(f"Failed to read Excel file '{self.path}': {e}")
+
+    def _open(self):
+        try:
+            return openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        except Exception as e:
+            raise DataSourceError(f"Failed to open Excel file '{self.path}': {e}")
+
+    def _parse(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        workbook = self._open()
+        try:
+            frames = {}
+            for name in sheet_names:
+                if name not in workbook.sheetnames:
+                    raise DataSourceError(f"Worksheet '{name}' not found in '{self.path}'")
+                frames[name] = self._frame_from_rows(workbook[name].iter_rows(values_only=True))
+            return frames
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _frame_from_rows(rows) -> pd.DataFrame:
+        header = None
+        records = []
+        for row in rows:
+            if all(value is None or value == "" for value in row):
+                continue
+            if header is None:
+                header = [str(value).strip() if value is not None else "" for value in row]
+                continue
+            records.append(list(row))
+        if header is None:
+            return pd.DataFrame([])
+        width = max([len(header)] + [len(row) for row in records])
+        header += [""] * (width - len(header))
+        header = [h if h else f"Unnamed: {i}" for i, h in enumerate(header)]
+        records = [row + [None] * (width - len(row)) for row in records]
+        duplicates = sorted({h for h in header if header.count(h) > 1})
+        if duplicates:
+            raise DataSourceError(f"the header row in the worksheet contains duplicates: {duplicates}")
+        return pd.DataFrame(records, columns=header)
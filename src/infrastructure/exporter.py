@@ -0,0 +1,156 @@
+import gzip
+import io
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, Hashable, Iterator, Optional
+import openpyxl
+import pandas as pd
+from src.infrastructure.throttling import SingleFlight
+
+# format -> (label, file extension, MIME type, accepts several sheets)
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv", "text/csv", False),
+    "csv.gz": ("CSV compactado (gzip)", ".csv.gz", "application/gzip", False),
+    "parquet": ("Parquet (zstd)", ".parquet", "application/vnd.apache.parquet", False),
+    "xlsx": ("Excel (.xlsx)", ".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", True),
+}
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Rows per worksheet allowed by Excel, header included
+_XLSX_MAX_ROWS = 1_048_576
+_XLSX_INVALID_TITLE = str.maketrans({c: " " for c in "[]:*?/\\"})
+
+
+def iter_csv(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """UTF-8 CSV of `df` (header first) in chunks of `chunk_rows` rows."""
+    yield df.iloc[:0].to_csv(index=False).encode("utf-8")
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=False).encode("utf-8")
+
+
+def write_export(frames: Dict[str, pd.DataFrame], fmt: str, out: BinaryIO, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+    """
+    Writes `frames` (sheet name -> DataFrame) to `out` in `fmt`. CSV and
+    xlsx are written chunk by chunk so no full-text copy of the data is
+    built; only xlsx accepts more than one frame.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'; expected one of {sorted(EXPORT_FORMATS)}")
+    if len(frames) != 1 and not EXPORT_FORMATS[fmt][3]:
+        raise ValueError(f"Format '{fmt}' holds a single sheet, got {len(frames)}")
+
+    if fmt == "xlsx":
+        _write_xlsx(frames, out, chunk_rows)
+        return
+    df = next(iter(frames.values()))
+    if fmt == "parquet":
+        df.to_parquet(out, engine="pyarrow", compression="zstd", index=False)
+    elif fmt == "csv.gz":
+        with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6, mtime=0) as compressed:
+            for chunk in iter_csv(df, chunk_rows):
+                compressed.write(chunk)
+    else:
+        for chunk in iter_csv(df, chunk_rows):
+            out.write(chunk)
+
+
+def export_bytes(frames, fmt: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> bytes:
+    """`write_export` into memory; `frames` may also be a single DataFrame."""
+    if isinstance(frames, pd.DataFrame):
+        frames = {"Dados": frames}
+    buffer = io.BytesIO()
+    write_export(frames, fmt, buffer, chunk_rows)
+    return buffer.getvalue()
+
+
+def _write_xlsx(frames: Dict[str, pd.DataFrame], out: BinaryIO, chunk_rows: int) -> None:
+    # Write-only mode streams rows to the file instead of keeping cell objects
+    workbook = openpyxl.Workbook(write_only=True)
+    used = set()
+    for name, df in frames.items():
+        parts = range(0, max(len(df), 1), _XLSX_MAX_ROWS - 1)
+        for part, start in enumerate(parts):
+            title = _sheet_title(name if part == 0 else f"{name} ({part + 1})", used)
+            sheet = workbook.create_sheet(title)
+            sheet.append([str(c) for c in df.columns])
+            stop = min(start + _XLSX_MAX_ROWS - 1, len(df))
+            for chunk_start in range(start, stop, chunk_rows):
+                chunk = df.iloc[chunk_start:min(chunk_start + chunk_rows, stop)]
+                for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+                    sheet.append(row)
+    workbook.save(out)
+
+
+def _sheet_title(name: str, used: set) -> str:
+    """Excel sheet titles: at most 31 characters, no []:*?/\\ and unique."""
+    base = str(name).translate(_XLSX_INVALID_TITLE).strip()[:31] or "Planilha"
+    title, n = base, 2
+    while title.lower() in used:
+        suffix = f" {n}"
+        title, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(title.lower())
+    return title
+
+
+class ExportCache:
+    """
+    Generated export files kept by a key that identifies their content
+    (typically data version, filter state and format).
+
+    Entries are kept in LRU order up to `max_bytes` in total; files larger
+    than that are returned but not kept. Concurrent requests for the same
+    key build the file once. The instance is thread-safe and meant to be
+    shared by every session.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Optional[Hashable], build: Callable[[], bytes]) -> bytes:
+        """Cached bytes for `key`, calling `build` on a miss. A None key is never cached."""
+        if key is None:
+            return build()
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+        return self._flights.do(key, lambda: self._build(key, build))
+
+    def _build(self, key: Hashable, build: Callable[[], bytes]) -> bytes:
+        data = build()
+        if len(data) <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = data
+                    self._total_bytes += len(data)
+                while self._total_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._total_bytes -= len(evicted)
+                    self.evictions += 1
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,207 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+import pandas as pd
+from pandas.api.types import union_categoricals
+from src.ports.data_source import DataSource, DataSourceError
+
+T = TypeVar("T")
+
+
+class FederatedDataSource(DataSource):
+    """
+    One DataSource over several stores, each with its own spreadsheet.
+
+    Reading a sheet fetches it from every store concurrently and returns a
+    single frame with a `key_column` ("loja") naming the store of each row,
+    so a consolidated page costs one parallel round instead of one request
+    per store in sequence. `get_many` sends one batch per store, also in
+    parallel. Sheets listed in `shared` (e.g. the recipe costs every store
+    uses) are read from the first store only and returned unchanged.
+
+    `stores` maps store names to their sources; wrap each one in a
+    `CachedDataSource` so a store whose sheet did not change is served from
+    memory when another store's did. When some stores fail, the rows of the
+    others are returned and the errors are kept in `failures`; a sheet read
+    this way has no version, so caches above retry it once their TTL ends.
+    Only when every store fails is a `DataSourceError` raised (or when any
+    fails, with `allow_partial=False`).
+    """
+
+    def __init__(
+        self,
+        stores: Dict[str, DataSource],
+        key_column: str = "loja",
+        shared: Iterable[str] = (),
+        allow_partial: bool = True,
+        max_workers: Optional[int] = None,
+    ):
+        if not stores:
+            raise ValueError("FederatedDataSource needs at least one store")
+        self.stores = dict(stores)
+        self.key_column = key_column
+        self.shared = set(shared)
+        self.allow_partial = allow_partial
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers or len(self.stores))), thread_name_prefix="store-loader"
+        )
+        self._lock = threading.Lock()
+        # sheet name -> store name -> error message of the last read
+        self._failures: Dict[str, Dict[str, str]] = {}
+
+    @property
+    def primary(self) -> DataSource:
+        """Store that serves the shared sheets (the first one)."""
+        return next(iter(self.stores.values()))
+
+    @property
+    def failures(self) -> Dict[str, Dict[str, str]]:
+        """Stores that failed on the last read of each sheet (sheet -> store -> error)."""
+        with self._lock:
+            return {sheet: dict(errors) for sheet, errors in self._failures.items() if errors}
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        if sheet_name in self.shared:
+            return self.primary.get_data(sheet_name)
+        results = self._each_store(lambda store: store.get_data(sheet_name))
+        return self._combine(sheet_name, results)
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        if not sheet_names:
+            return {}
+        federated = [name for name in dict.fromkeys(sheet_names) if name not in self.shared]
+        shared = [name for name in dict.fromkeys(sheet_names) if name in self.shared]
+
+        frames: Dict[str, pd.DataFrame] = {}
+        if federated:
+            per_store = self._each_store(lambda store: _read_many(store, federated))
+            for name in federated:
+                results = {
+                    loja: result if isinstance(result, DataSourceError) else result[name]
+                    for loja, result in per_store.items()
+                }
+                frames[name] = self._combine(name, results)
+        if shared:
+            frames.update(self.primary.get_many(shared))
+        return {name: frames[name] for name in sheet_names}
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        """
+        Versions of every store joined in one token; None when any store
+        cannot tell, fails, or the last read of the sheet was partial.
+        """
+        if sheet_name in self.shared:
+            return self.primary.get_version(sheet_name)
+        with self._lock:
+            if self._failures.get(sheet_name):
+                return None
+        versions = self._each_store(lambda store: store.get_version(sheet_name))
+        if any(v is None or isinstance(v, DataSourceError) for v in versions.values()):
+            return None
+        return ";".join(f"{loja}={version}" for loja, version in versions.items())
+
+    def append_rows(self, sheet_name: str, rows: Sequence) -> None:
+        """
+        Sends each row to the store named in its `key_column` (rows must be
+        mappings; the key itself is not written). Shared sheets go to the
+        first store.
+        """
+        if sheet_name in self.shared:
+            self.primary.append_rows(sheet_name, rows)
+            return
+        by_store: Dict[str, List[Dict]] = {}
+        for row in rows:
+            loja = row.get(self.key_column) if isinstance(row, Mapping) else None
+            if loja not in self.stores:
+                raise DataSourceError(f"Each row needs a '{self.key_column}' naming one of {list(self.stores)}")
+            by_store.setdefault(loja, []).append({k: v for k, v in row.items() if k != self.key_column})
+        for loja, store_rows in by_store.items():
+            self.stores[loja].append_rows(sheet_name, store_rows)
+
+    def sync(self, sheet_name: str) -> None:
+        """
+        Runs `sync` (see `SnapshotDataSource.sync`) on the stores that have
+        it, in parallel; raises `DataSourceError` naming the stores that failed.
+        """
+        if sheet_name in self.shared:
+            _sync(sheet_name)(self.primary)
+            return
+        results = self._each_store(_sync(sheet_name))
+        errors = {loja: str(r) for loja, r in results.items() if isinstance(r, DataSourceError)}
+        if errors:
+            detail = "; ".join(f"{loja}: {message}" for loja, message in errors.items())
+            raise DataSourceError(f"Failed to sync '{sheet_name}' from stores: {detail}")
+
+    def shutdown(self) -> None:
+        """Stops the worker threads once the pending reads finish."""
+        self._executor.shutdown(wait=True)
+
+    def _each_store(self, fetch: Callable[[DataSource], T]) -> Dict[str, object]:
+        """Runs `fetch` on every store concurrently; failures come back as `DataSourceError`."""
+        # Each call runs in a copy of the caller's context (e.g. the page
+        # label used by metrics), as in ConcurrentLoader.
+        futures = {
+            loja: self._executor.submit(contextvars.copy_context().run, _guarded, loja, fetch, store)
+            for loja, store in self.stores.items()
+        }
+        return {loja: future.result() for loja, future in futures.items()}
+
+    def _combine(self, sheet_name: str, results: Dict[str, object]) -> pd.DataFrame:
+        errors = {loja: str(r) for loja, r in results.items() if isinstance(r, DataSourceError)}
+        with self._lock:
+            self._failures[sheet_name] = errors
+        if errors and (len(errors) == len(results) or not self.allow_partial):
+            detail = "; ".join(f"{loja}: {message}" for loja, message in errors.items())
+            raise DataSourceError(f"Failed to read '{sheet_name}' from stores: {detail}")
+        parts = [(loja, frame) for loja, frame in results.items() if loja not in errors]
+        return _concat(parts, self.key_column, list(self.stores))
+
+
+def _guarded(loja: str, fetch: Callable[[DataSource], T], store: DataSource):
+    try:
+        return fetch(store)
+    except DataSourceError as e:
+        return e
+    except Exception as e:
+        return DataSourceError(f"Failed to read store '{loja}': {e}")
+
+
+def _sync(sheet_name: str) -> Callable[[DataSource], None]:
+    def run(store: DataSource) -> None:
+        sync = getattr(store, "sync", None)
+        if sync is not None:
+            sync(sheet_name)
+    return run
+
+
+def _read_many(store: DataSource, sheet_names: List[str]) -> Dict[str, object]:
+    """One batch per store; if the batch fails (e.g. a tab missing), sheets are read one by one."""
+    try:
+        return store.get_many(sheet_names)
+    except DataSourceError:
+        pass
+    frames: Dict[str, object] = {}
+    for name in sheet_names:
+        try:
+            frames[name] = store.get_data(name)
+        except DataSourceError as e:
+            frames[name] = e
+    return frames
+
+
+def _concat(parts: List[Tuple[str, pd.DataFrame]], key_column: str, store_names: List[str]) -> pd.DataFrame:
+    """Stacks the store frames with a categorical store column first, keeping categorical columns categorical."""
+    keyed = []
+    for loja, frame in parts:
+        keyed.append(frame.assign(**{key_column: loja})[[key_column] + [c for c in frame.columns if c != key_column]])
+    combined = pd.concat(keyed, ignore_index=True) if len(keyed) > 1 else keyed[0].reset_index(drop=True)
+    combined[key_column] = pd.Categorical(combined[key_column], categories=store_names)
+    for column in combined.columns:
+        if column == key_column:
+            continue
+        pieces = [frame[column] for _, frame in parts if column in frame.columns]
+        if len(pieces) == len(parts) and len(parts) > 1 \
+                and all(isinstance(p.dtype, pd.CategoricalDtype) for p in pieces):
+            combined[column] = union_categoricals(pieces, ignore_order=True)
+    return combined
@@ -1,40 +1,388 @@
-import gspread
+import threading
+from urllib.parse import urlsplit
 import pandas as pd
-from typing import Optional
-from src.ports.data_source import DataSource, DataSourceError
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
+from src.infrastructure.sheet_schemas import IngestReport, SheetSchema
+from src.infrastructure.throttling import Backoff, SingleFlight, TokenBucket, read_once
+from src.infrastructure.write_buffer import Row, WriteBehindBuffer
+from src.ports.data_source import DataSource, DataSourceError, QuotaExceededError
+
+# gspread, google-auth and requests are imported on first use (see `client`),
+# so importing the adapter does not slow down the app's startup.
+if TYPE_CHECKING:
+    import gspread
+
+# HTTP statuses worth retrying: quota exceeded and transient server errors
+_RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Google API hosts that are redirected when an `endpoint` is configured
+_GOOGLE_API_PREFIXES = ("https://sheets.googleapis.com/", "https://www.googleapis.com/")
+
+
+def _endpoint_adapter(endpoint: str, **kwargs):
+    """Transport adapter that sends Google API requests to another base URL."""
+    from requests.adapters import HTTPAdapter
+
+    target = urlsplit(endpoint.rstrip("/"))
+
+    class EndpointAdapter(HTTPAdapter):
+        def send(self, request, **send_kwargs):
+            url = urlsplit(request.url)
+            request.url = url._replace(
+                scheme=target.scheme,
+                netloc=target.netloc,
+                path=target.path + url.path,
+            ).geturl()
+            return super().send(request, **send_kwargs)
+
+    return EndpointAdapter(**kwargs)
+
 
 class GoogleSheetsAdapter(DataSource):
-    def __init__(self, credential_file: Optional[str] = None, sheet_id: Optional[str] = None):
+    def __init__(
+        self,
+        credential_file: Optional[str] = None,
+        sheet_id: Optional[str] = None,
+        pool_size: int = 10,
+        schemas: Optional[Dict[str, SheetSchema]] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        backoff: Optional[Backoff] = None,
+        endpoint: Optional[str] = None,
+        write_batch_rows: int = 100,
+        write_delay: float = 5.0,
+        journal_path: Optional[str] = None,
+    ):
         self.credential_file = credential_file
         self.sheet_id = sheet_id
+        self.pool_size = pool_size
+        # Base URL replacing the Google API hosts, e.g. the local stand-in
+        # server (benchmarks/sheets_server.py); no credentials are used then.
+        self.endpoint = endpoint
+        # Column types applied to each worksheet right after it is read
+        # (see src.infrastructure.sheet_schemas.SHEET_SCHEMAS).
+        self.schemas = dict(schemas or {})
+        self.ingest_reports: Dict[str, IngestReport] = {}
+        # Every API request takes a token (default: the Sheets per-user read
+        # quota of 60/min); 429/5xx answers are retried with jittered backoff
+        # and concurrent reads of the same sheet share a single request.
+        self.rate_limiter = rate_limiter or TokenBucket(rate_per_minute=60, burst=10)
+        self.backoff = backoff or Backoff()
+        self._single_flight = SingleFlight()
+        self._rate_limited_responses = 0
+        self._stats_lock = threading.Lock()
         self._client = None
+        # Metadata kept for the life of the adapter: the opened spreadsheet and
+        # the worksheets already resolved (title -> Worksheet / title -> id).
+        self._spreadsheet = None
+        self._worksheets: Dict[str, "gspread.Worksheet"] = {}
+        self._worksheet_ids: Dict[str, int] = {}
+        self._metadata_lock = threading.Lock()
+        # Appended rows wait here and go out in batches (one request per
+        # sheet); `journal_path` keeps them on disk until they are written.
+        self.writer = WriteBehindBuffer(
+            self._append_values, max_rows=write_batch_rows, max_delay=write_delay, journal_path=journal_path
+        )
+        if self.writer.pending():
+            # Rows left in the journal by a previous run
+            self.writer.start()
 
     @property
     def client(self):
         if self._client is None:
+            import gspread
+            from google.auth.credentials import AnonymousCredentials
+
             # If a credential file path is provided, use it; otherwise rely on
             # environment (GOOGLE_APPLICATION_CREDENTIALS) or default service account.
-            if self.credential_file:
+            if self.endpoint:
+                self._client = gspread.Client(auth=AnonymousCredentials())
+            elif self.credential_file:
                 self._client = gspread.service_account(filename=self.credential_file)
             else:
                 self._client = gspread.service_account()
+            self._configure_session(self._client)
         return self._client
 
     @client.setter
     def client(self, value):
         self._client = value
+        self.refresh_metadata()
+
+    @property
+    def spreadsheet(self):
+        """The opened spreadsheet, fetched once and reused by every read."""
+        with self._metadata_lock:
+            if self._spreadsheet is not None:
+                return self._spreadsheet
+        # The open request (quota waits and backoff included) runs outside the
+        # lock; threads that need the handle meanwhile share that one request.
+        return self._single_flight.do(("spreadsheet",), self._open_spreadsheet)
+
+    def _open_spreadsheet(self):
+        with self._metadata_lock:
+            if self._spreadsheet is not None:
+                return self._spreadsheet
+        client = self.client
+        if self.sheet_id:
+            spreadsheet = self._api(client.open_by_key, self.sheet_id)
+        else:
+            spreadsheet = self._api(client.open, "")
+        with self._metadata_lock:
+            if self._spreadsheet is None:
+                self._spreadsheet = spreadsheet
+            return self._spreadsheet
+
+    @property
+    def worksheet_ids(self) -> Dict[str, int]:
+        """Ids of the worksheets resolved so far, keyed by title."""
+        with self._metadata_lock:
+            return dict(self._worksheet_ids)
+
+    def refresh_metadata(self) -> None:
+        """Forgets the spreadsheet handle and every resolved worksheet."""
+        with self._metadata_lock:
+            self._spreadsheet = None
+            self._worksheets.clear()
+            self._worksheet_ids.clear()
 
     def get_data(self, sheet_name: str) -> pd.DataFrame:
         """
         Connects to Google Sheets and retrieves data from a specific worksheet.
         Returns a pandas DataFrame built from worksheet records.
+
+        Only the first read of a worksheet resolves its metadata; later reads
+        go straight to the values request. If a read fails because the
+        worksheet was renamed or removed, its metadata is resolved again once.
+        Concurrent calls for the same worksheet share one request.
+        """
+        return self._single_flight.do(("values", sheet_name), lambda: self._read_worksheet(sheet_name))
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Retrieves several worksheets with a single `values:batchGet` request.
+        Each DataFrame is built the same way as `get_data` (first row is the
+        header, numeric-looking cells are converted to numbers).
+        """
+        if not sheet_names:
+            return {}
+        return self._single_flight.do(("batch", tuple(sheet_names)), lambda: self._read_batch(sheet_names))
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        """
+        Returns the spreadsheet's last-modified time from the Drive API.
+
+        The revision is spreadsheet-wide, so an edit to any worksheet changes
+        the token of every worksheet. It is still much cheaper than a full read.
+        Inside a `read_once_scope` it is fetched once for all worksheets.
+        """
+        return read_once(("version", id(self)), lambda: self._single_flight.do(("version",), self._read_version))
+
+    def get_rows(self, sheet_name: str, start_row: int, width: int) -> Tuple[List, List[List]]:
+        """
+        Returns the header row and the raw rows from `start_row` (1-based,
+        header is row 1) to the end of the sheet, in a single request.
+        Cells are not numericised; use `build_frame` to turn rows into a frame.
+        """
+        from gspread.utils import absolute_range_name, rowcol_to_a1
+
+        last_column = rowcol_to_a1(1, max(width, 1)).rstrip("0123456789")
+        ranges = [
+            absolute_range_name(sheet_name, "1:1"),
+            absolute_range_name(sheet_name, f"A{start_row}:{last_column}"),
+        ]
+        try:
+            response = self._api(self.spreadsheet.values_batch_get, ranges)
+        except Exception as e:
+            raise _error("Failed to fetch rows from Google Sheets", e) from e
+        header_range, rows_range = response.get("valueRanges", [{}, {}])
+        header = (header_range.get("values") or [[]])[0]
+        return header, rows_range.get("values", [])
+
+    def build_frame(self, sheet_name: str, header: List, rows: List[List]) -> pd.DataFrame:
+        """Builds a typed frame from raw rows, exactly as `get_data` would."""
+        if not rows:
+            return self._ingest(sheet_name, pd.DataFrame(columns=header))
+        return self._ingest(sheet_name, self._frame_from_values([header] + rows))
+
+    def append_rows(self, sheet_name: str, rows: Sequence[Row]) -> None:
         """
+        Queues rows to append to the worksheet; they are sent with the next
+        batch (see `writer`), not by this call. Mapping rows are matched to
+        the header row by column name.
+        """
+        self.writer.add(sheet_name, rows)
+        self.writer.start()
+
+    def flush_writes(self) -> int:
+        """Sends the queued rows now; returns how many were written."""
+        return self.writer.flush()
+
+    def close(self) -> None:
+        """Stops the write-behind thread after sending what is still queued."""
+        self.writer.close()
+
+    def throttle_stats(self) -> Dict[str, float]:
+        """Counters of the quota limiter, backoff retries and coalesced reads."""
+        return {
+            "requests": self.rate_limiter.acquired,
+            "throttled": self.rate_limiter.waits,
+            "throttled_seconds": self.rate_limiter.wait_seconds,
+            "rate_limited_responses": self._rate_limited_responses,
+            "retries": self.backoff.retries,
+            "coalesced": self._single_flight.coalesced,
+        }
+
+    def _read_worksheet(self, sheet_name: str) -> pd.DataFrame:
+        from gspread.exceptions import APIError
+
         try:
-            client = self.client
-            sh = client.open_by_key(self.sheet_id) if self.sheet_id else client.open("")
-            worksheet = sh.worksheet(sheet_name)
-            data = worksheet.get_all_records()
-            return pd.DataFrame(data)
+            try:
+                data = self._api(self._worksheet(sheet_name).get_all_records)
+            except APIError as e:
+                if _status(e) in _RETRYABLE_STATUSES:
+                    raise
+                self._forget_worksheet(sheet_name)
+                data = self._api(self._worksheet(sheet_name).get_all_records)
+            return self._ingest(sheet_name, pd.DataFrame(data))
         except Exception as e:
             # Normalize errors to DataSourceError for callers/tests
-            raise DataSourceError(f"Failed to fetch data from Google Sheets: {e}")
+            self._forget_worksheet(sheet_name)
+            raise _error("Failed to fetch data from Google Sheets", e) from e
+
+    def _read_batch(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        from gspread.utils import absolute_range_name
+
+        try:
+            ranges = [absolute_range_name(name) for name in sheet_names]
+            response = self._api(self.spreadsheet.values_batch_get, ranges)
+            value_ranges = response.get("valueRanges", [])
+            return {
+                name: self._ingest(name, self._frame_from_values(value_range.get("values", [])))
+                for name, value_range in zip(sheet_names, value_ranges)
+            }
+        except Exception as e:
+            raise _error("Failed to fetch data from Google Sheets", e) from e
+
+    def _read_version(self) -> Optional[str]:
+        try:
+            return self._api(self.spreadsheet.get_lastUpdateTime)
+        except Exception as e:
+            raise _error("Failed to fetch revision from Google Sheets", e) from e
+
+    def _append_values(self, sheet_name: str, rows: List[Row]) -> None:
+        """One `values:append` request with every row; called by the write-behind buffer."""
+        from gspread.utils import absolute_range_name
+
+        try:
+            if any(isinstance(row, Mapping) for row in rows):
+                header_range = self._api(self.spreadsheet.values_get, absolute_range_name(sheet_name, "1:1"))
+                header = (header_range.get("values") or [[]])[0]
+                rows = [_ordered(header, row) if isinstance(row, Mapping) else row for row in rows]
+            # An append is not idempotent: a 5xx may come after the rows were
+            # written, so only 429 (rejected before writing) is retried here
+            # and other failures go back to the buffer.
+            self._api(
+                self.spreadsheet.values_append,
+                absolute_range_name(sheet_name),
+                {"valueInputOption": "USER_ENTERED", "insertDataOption": "INSERT_ROWS"},
+                {"values": [list(row) for row in rows]},
+                retry_statuses={429},
+            )
+        except Exception as e:
+            raise _error(f"Failed to append rows to '{sheet_name}'", e) from e
+
+    def _api(self, fn, *args, retry_statuses=_RETRYABLE_STATUSES):
+        """Runs one API request under the quota limiter, retrying 429/5xx answers (or `retry_statuses`)."""
+        from gspread.exceptions import APIError
+
+        def attempt():
+            self.rate_limiter.acquire()
+            try:
+                return fn(*args)
+            except APIError as e:
+                if _status(e) == 429:
+                    with self._stats_lock:
+                        self._rate_limited_responses += 1
+                raise
+
+        return self.backoff.call(
+            attempt,
+            lambda e: isinstance(e, APIError) and _status(e) in retry_statuses,
+        )
+
+    def _ingest(self, sheet_name: str, df: pd.DataFrame) -> pd.DataFrame:
+        schema = self.schemas.get(sheet_name)
+        if schema is None or df.empty:
+            return df
+        df, report = schema.apply(df)
+        self.ingest_reports[sheet_name] = report
+        return df
+
+    def _worksheet(self, sheet_name: str):
+        with self._metadata_lock:
+            worksheet = self._worksheets.get(sheet_name)
+        if worksheet is None:
+            worksheet = self._api(self.spreadsheet.worksheet, sheet_name)
+            with self._metadata_lock:
+                self._worksheets[sheet_name] = worksheet
+                self._worksheet_ids[sheet_name] = worksheet.id
+        return worksheet
+
+    def _forget_worksheet(self, sheet_name: str) -> None:
+        with self._metadata_lock:
+            self._worksheets.pop(sheet_name, None)
+            self._worksheet_ids.pop(sheet_name, None)
+
+    def _configure_session(self, client) -> None:
+        """Mounts a larger keep-alive connection pool on the client's HTTP session."""
+        from requests.adapters import HTTPAdapter
+
+        session = getattr(getattr(client, "http_client", None), "session", None)
+        if session is None:
+            return
+        pooled = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("https://", pooled)
+        if self.endpoint:
+            redirected = _endpoint_adapter(self.endpoint, pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            for prefix in _GOOGLE_API_PREFIXES:
+                session.mount(prefix, redirected)
+
+    @staticmethod
+    def _frame_from_values(values: List[List]) -> pd.DataFrame:
+        """Mirrors `Worksheet.get_all_records()` for raw values from the API."""
+        from gspread.utils import fill_gaps, numericise_all
+
+        if not values or len(values) < 2:
+            return pd.DataFrame([])
+        values = fill_gaps(values)
+        header = values[0]
+        duplicates = sorted({h for h in header if header.count(h) > 1})
+        if duplicates:
+            raise DataSourceError(f"the header row in the worksheet contains duplicates: {duplicates}")
+        rows = [numericise_all(row) for row in values[1:]]
+        return pd.DataFrame(rows, columns=header)
+
+
+def _ordered(header: List, row: Mapping) -> List:
+    """Values of a mapping row in header order (blank for missing columns)."""
+    positions = {str(name).strip().lower(): i for i, name in enumerate(header)}
+    unknown = [key for key in row if str(key).strip().lower() not in positions]
+    if unknown:
+        raise DataSourceError(f"columns not in the header row: {unknown}")
+    values = [""] * len(header)
+    for key, value in row.items():
+        values[positions[str(key).strip().lower()]] = "" if value is None else value
+    return values
+
+
+def _status(error: Exception) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _error(message: str, error: Exception) -> DataSourceError:
+    if isinstance(error, DataSourceError):
+        return error
+    if _status(error) == 429:
+        return QuotaExceededError(f"{message}: quota exceeded, retries exhausted: {error}")
+    return DataSourceError(f"{message}: {error}")
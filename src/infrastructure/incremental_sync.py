@@ -0,0 +1,165 @@
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+import pandas as pd
+from pandas.api.types import union_categoricals
+from src.infrastructure.google_sheets_adapter import GoogleSheetsAdapter
+from src.ports.data_source import DataSource
+
+
+class _SyncState:
+    __slots__ = ("header", "frame", "row_count", "tail_hash", "full_synced_at", "since_full")
+
+    def __init__(self, header: List, frame: pd.DataFrame, row_count: int, tail_hash: str, full_synced_at: float):
+        self.header = header
+        self.frame = frame
+        # Data rows (below the header) already in `frame`: the watermark
+        self.row_count = row_count
+        self.tail_hash = tail_hash
+        self.full_synced_at = full_synced_at
+        # Incremental syncs since the last full read
+        self.since_full = 0
+
+
+class IncrementalSyncDataSource(DataSource):
+    """
+    DataSource decorator that syncs append-only worksheets incrementally.
+
+    For sheets listed in `append_only` (e.g. "Vendas Diárias") it remembers
+    how many rows were already read and a hash of the last `overlap` rows.
+    Each read then fetches only the header and the rows from the watermark
+    onwards (one request), checks the overlapping rows against the stored
+    hash and appends the new rows to the kept DataFrame. If the header or
+    the overlapping rows changed (an edit or deletion near the bottom), the
+    sheet is reloaded in full.
+
+    Edits further above the overlap window cannot be seen by the overlap
+    check, so the sheet is also reloaded in full after `full_sync_every`
+    incremental syncs or `full_sync_interval` seconds since the last full
+    read, whichever comes first (0 disables either bound). Other sheets are
+    passed through to the adapter unchanged.
+    """
+
+    def __init__(
+        self,
+        inner: GoogleSheetsAdapter,
+        append_only: Iterable[str],
+        overlap: int = 5,
+        full_sync_every: int = 20,
+        full_sync_interval: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.inner = inner
+        self.append_only = set(append_only)
+        self.overlap = max(1, overlap)
+        self.full_sync_every = full_sync_every
+        self.full_sync_interval = full_sync_interval
+        self._clock = clock
+        self._states: Dict[str, _SyncState] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.rows_appended = 0
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        if sheet_name not in self.append_only:
+            return self.inner.get_data(sheet_name)
+        with self._lock_for(sheet_name):
+            state = self._states.get(sheet_name)
+            if state is None or self._full_sync_due(state):
+                return self._full_sync(sheet_name)
+            return self._incremental_sync(sheet_name, state)
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        regular = [name for name in sheet_names if name not in self.append_only]
+        frames = self.inner.get_many(regular) if regular else {}
+        return {name: frames[name] if name in frames else self.get_data(name) for name in sheet_names}
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        return self.inner.get_version(sheet_name)
+
+    def append_rows(self, sheet_name: str, rows) -> None:
+        self.inner.append_rows(sheet_name, rows)
+
+    def invalidate(self, sheet_name: Optional[str] = None) -> None:
+        """Forgets the watermark so the next read reloads the sheet in full."""
+        with self._locks_guard:
+            if sheet_name is None:
+                self._states.clear()
+            else:
+                self._states.pop(sheet_name, None)
+
+    def sync_stats(self) -> Dict[str, int]:
+        return {
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "rows_appended": self.rows_appended,
+        }
+
+    def _lock_for(self, sheet_name: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(sheet_name, threading.Lock())
+
+    def _full_sync(self, sheet_name: str) -> pd.DataFrame:
+        header, rows = self.inner.get_rows(sheet_name, start_row=2, width=self._width_hint(sheet_name))
+        if len(header) > self._width_hint(sheet_name):
+            # Header grew beyond the columns we asked for: read again with its real width.
+            header, rows = self.inner.get_rows(sheet_name, start_row=2, width=len(header))
+        frame = self.inner.build_frame(sheet_name, header, rows)
+        self._states[sheet_name] = _SyncState(
+            header, frame, len(rows), self._hash(header, rows[-self.overlap:]), self._clock()
+        )
+        self.full_syncs += 1
+        return frame
+
+    def _incremental_sync(self, sheet_name: str, state: _SyncState) -> pd.DataFrame:
+        kept = min(self.overlap, state.row_count)
+        start_row = 2 + state.row_count - kept
+        header, rows = self.inner.get_rows(sheet_name, start_row=start_row, width=len(state.header))
+        if header != state.header or self._hash(header, rows[:kept]) != state.tail_hash:
+            return self._full_sync(sheet_name)
+
+        new_rows = rows[kept:]
+        self.incremental_syncs += 1
+        state.since_full += 1
+        if not new_rows:
+            return state.frame
+
+        frame = _append(state.frame, self.inner.build_frame(sheet_name, header, new_rows))
+        state.frame = frame
+        state.row_count += len(new_rows)
+        state.tail_hash = self._hash(header, rows[-self.overlap:])
+        self.rows_appended += len(new_rows)
+        return frame
+
+    def _full_sync_due(self, state: _SyncState) -> bool:
+        if self.full_sync_every and state.since_full >= self.full_sync_every:
+            return True
+        return bool(self.full_sync_interval) and self._clock() - state.full_synced_at >= self.full_sync_interval
+
+    def _width_hint(self, sheet_name: str) -> int:
+        state = self._states.get(sheet_name)
+        return len(state.header) if state is not None else 26
+
+    @staticmethod
+    def _hash(header: List, rows: List[List]) -> str:
+        width = len(header)
+        digest = hashlib.sha1()
+        for row in rows:
+            padded = list(row[:width]) + [""] * (width - len(row))
+            digest.update(repr(padded).encode("utf-8"))
+        return digest.hexdigest()
+
+
+def _append(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Concatenates frames keeping categorical columns categorical."""
+    if old.empty:
+        return new
+    frame = pd.concat([old, new], ignore_index=True)
+    for column in old.columns:
+        if isinstance(old[column].dtype, pd.CategoricalDtype) and column in new.columns \
+                and isinstance(new[column].dtype, pd.CategoricalDtype):
+            frame[column] = union_categoricals([old[column], new[column]], ignore_order=True)
+    return frame
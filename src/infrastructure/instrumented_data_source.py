@@ -0,0 +1,239 @@
+import contextvars
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import pandas as pd
+from src.infrastructure.cached_data_source import CachedDataSource
+from src.ports.data_source import DataSource
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_page: contextvars.ContextVar = contextvars.ContextVar("vava_page", default="-")
+
+
+@contextmanager
+def page_label(page: str) -> Iterator[None]:
+    """Attributes every read made inside the block to `page`."""
+    token = _current_page.set(page)
+    try:
+        yield
+    finally:
+        _current_page.reset(token)
+
+
+class _SheetMetrics:
+    __slots__ = ("calls", "errors", "rows", "bytes", "latency_sum", "bucket_counts")
+
+    def __init__(self, n_buckets: int):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        # Non-cumulative counts; the last slot is the +Inf bucket
+        self.bucket_counts = [0] * (n_buckets + 1)
+
+
+class InstrumentedDataSource(DataSource):
+    """
+    DataSource decorator that records, per sheet and per page: call count,
+    error count, latency histogram, and rows/bytes returned.
+
+    The page comes from the `page_label` context, so the same metrics can be
+    broken down by the Streamlit page that issued the reads. When the wrapped
+    source is (or contains) a `CachedDataSource`, its per-sheet hit ratio is
+    reported along. A batched `get_many` is recorded once per sheet with the
+    latency of the whole batch.
+
+    Metrics are exposed as rows (`snapshot`) and in the Prometheus text
+    format (`to_prometheus` / `write_prometheus`).
+    """
+
+    def __init__(
+        self,
+        inner: DataSource,
+        cache: Optional[CachedDataSource] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.inner = inner
+        self.cache = cache if cache is not None else (inner if isinstance(inner, CachedDataSource) else None)
+        self.buckets = tuple(sorted(buckets))
+        self._clock = clock
+        self._metrics: Dict[Tuple[str, str], _SheetMetrics] = {}
+        self._lock = threading.Lock()
+        # Byte size per frame identity: cached frames are returned many times
+        # and a deep memory_usage on a large frame is not free.
+        self._sizes: Dict[int, Tuple[weakref.ref, int]] = {}
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        start = self._clock()
+        try:
+            frame = self.inner.get_data(sheet_name)
+        except Exception:
+            self._record([sheet_name], self._clock() - start, {}, failed=True)
+            raise
+        self._record([sheet_name], self._clock() - start, {sheet_name: frame})
+        return frame
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        start = self._clock()
+        try:
+            frames = self.inner.get_many(sheet_names)
+        except Exception:
+            self._record(sheet_names, self._clock() - start, {}, failed=True)
+            raise
+        self._record(sheet_names, self._clock() - start, frames)
+        return frames
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        return self.inner.get_version(sheet_name)
+
+    def append_rows(self, sheet_name: str, rows) -> None:
+        self.inner.append_rows(sheet_name, rows)
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """One row per (sheet, page) with counters and latency percentiles."""
+        cache_stats = self.cache.sheet_stats() if self.cache is not None else {}
+        with self._lock:
+            items = [(key, _copy(m)) for key, m in self._metrics.items()]
+        rows = []
+        for (sheet, page), m in sorted(items):
+            rows.append({
+                "sheet": sheet,
+                "page": page,
+                "calls": m.calls,
+                "errors": m.errors,
+                "rows": m.rows,
+                "bytes": m.bytes,
+                "mean_s": m.latency_sum / m.calls if m.calls else 0.0,
+                "p50_s": self._quantile(m.bucket_counts, 0.50),
+                "p95_s": self._quantile(m.bucket_counts, 0.95),
+                "cache_hit_ratio": cache_stats.get(sheet, {}).get("hit_ratio"),
+            })
+        return rows
+
+    def to_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted((key, _copy(m)) for key, m in self._metrics.items())
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("vava_datasource_calls_total", "counter", "Sheet reads issued by the app.")
+        for (sheet, page), m in items:
+            lines.append(f"vava_datasource_calls_total{_labels(sheet=sheet, page=page)} {m.calls}")
+        family("vava_datasource_errors_total", "counter", "Sheet reads that raised an error.")
+        for (sheet, page), m in items:
+            lines.append(f"vava_datasource_errors_total{_labels(sheet=sheet, page=page)} {m.errors}")
+        family("vava_datasource_rows_total", "counter", "Rows returned by sheet reads.")
+        for (sheet, page), m in items:
+            lines.append(f"vava_datasource_rows_total{_labels(sheet=sheet, page=page)} {m.rows}")
+        family("vava_datasource_bytes_total", "counter", "In-memory bytes of the frames returned by sheet reads.")
+        for (sheet, page), m in items:
+            lines.append(f"vava_datasource_bytes_total{_labels(sheet=sheet, page=page)} {m.bytes}")
+
+        family("vava_datasource_latency_seconds", "histogram", "Latency of sheet reads as seen by the app.")
+        for (sheet, page), m in items:
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ["+Inf"], m.bucket_counts):
+                cumulative += count
+                le = bound if isinstance(bound, str) else repr(float(bound))
+                lines.append(f"vava_datasource_latency_seconds_bucket{_labels(sheet=sheet, page=page, le=le)} {cumulative}")
+            lines.append(f"vava_datasource_latency_seconds_sum{_labels(sheet=sheet, page=page)} {m.latency_sum!r}")
+            lines.append(f"vava_datasource_latency_seconds_count{_labels(sheet=sheet, page=page)} {m.calls}")
+
+        if self.cache is not None:
+            cache_stats = sorted(self.cache.sheet_stats().items())
+            family("vava_cache_hits_total", "counter", "Sheet reads served from the in-memory cache.")
+            for sheet, stats in cache_stats:
+                lines.append(f"vava_cache_hits_total{_labels(sheet=sheet)} {stats['hits']}")
+            family("vava_cache_misses_total", "counter", "Sheet reads that went past the in-memory cache.")
+            for sheet, stats in cache_stats:
+                lines.append(f"vava_cache_misses_total{_labels(sheet=sheet)} {stats['misses']}")
+            family("vava_cache_hit_ratio", "gauge", "Share of sheet reads served from the in-memory cache.")
+            for sheet, stats in cache_stats:
+                lines.append(f"vava_cache_hit_ratio{_labels(sheet=sheet)} {stats['hit_ratio']!r}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Writes the metrics atomically, e.g. for node_exporter's textfile collector."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+    def _record(self, sheet_names: List[str], elapsed: float, frames: Dict[str, pd.DataFrame], failed: bool = False) -> None:
+        page = _current_page.get()
+        bucket = bisect_left(self.buckets, elapsed)
+        sizes = {name: (len(frame), self._frame_bytes(frame)) for name, frame in frames.items() if frame is not None}
+        with self._lock:
+            for name in sheet_names:
+                m = self._metrics.get((name, page))
+                if m is None:
+                    m = self._metrics[(name, page)] = _SheetMetrics(len(self.buckets))
+                m.calls += 1
+                m.latency_sum += elapsed
+                m.bucket_counts[bucket] += 1
+                if failed:
+                    m.errors += 1
+                elif name in sizes:
+                    m.rows += sizes[name][0]
+                    m.bytes += sizes[name][1]
+
+    def _frame_bytes(self, frame: pd.DataFrame) -> int:
+        key = id(frame)
+        with self._lock:
+            known = self._sizes.get(key)
+            if known is not None and known[0]() is frame:
+                return known[1]
+        size = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            self._sizes[key] = (weakref.ref(frame, lambda _, key=key: self._sizes.pop(key, None)), size)
+        return size
+
+    def _quantile(self, bucket_counts: List[int], q: float) -> Optional[float]:
+        """Estimates a quantile from the histogram, interpolating inside the bucket."""
+        total = sum(bucket_counts)
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(bucket_counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets):
+                    # Above the largest bound: report that bound, like Prometheus does
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+def _copy(m: _SheetMetrics) -> _SheetMetrics:
+    copy = _SheetMetrics(len(m.bucket_counts) - 1)
+    copy.calls, copy.errors, copy.rows, copy.bytes = m.calls, m.errors, m.rows, m.bytes
+    copy.latency_sum = m.latency_sum
+    copy.bucket_counts = list(m.bucket_counts)
+    return copy
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
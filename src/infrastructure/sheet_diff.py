@@ -0,0 +1,154 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+
+class SheetDiff:
+    """
+    Rows that changed between two snapshots of a worksheet.
+
+    `inserted` and `deleted` hold rows only in the new / old snapshot;
+    `updated` holds the new values of rows whose key is in both but whose
+    content changed, with the old values (same order) in `updated_before`.
+    Every frame keeps the index labels of the snapshot it came from. When
+    the set of columns changed (including against a missing snapshot),
+    `schema_changed` is True and the whole old snapshot is deleted and the
+    whole new one inserted.
+    """
+
+    __slots__ = ("inserted", "updated", "updated_before", "deleted", "schema_changed")
+
+    def __init__(
+        self,
+        inserted: pd.DataFrame,
+        updated: pd.DataFrame,
+        updated_before: pd.DataFrame,
+        deleted: pd.DataFrame,
+        schema_changed: bool = False,
+    ):
+        self.inserted = inserted
+        self.updated = updated
+        self.updated_before = updated_before
+        self.deleted = deleted
+        self.schema_changed = schema_changed
+
+    def __len__(self) -> int:
+        """Number of changed rows (an update counts once)."""
+        return len(self.inserted) + len(self.updated) + len(self.deleted)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def counts(self) -> Dict[str, int]:
+        return {"inserted": len(self.inserted), "updated": len(self.updated), "deleted": len(self.deleted)}
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{k}={v}" for k, v in self.counts().items())
+        return f"SheetDiff({counts}{', schema_changed' if self.schema_changed else ''})"
+
+
+def row_hashes(df: pd.DataFrame, columns: Optional[Sequence] = None) -> np.ndarray:
+    """
+    One uint64 per row over `columns` (default: all), computed column-wise
+    by pandas; the index is not part of the hash. Categorical values hash
+    like the plain values, whatever their categories.
+    """
+    frame = df if columns is None else df[list(columns)]
+    if frame.shape[1] == 0:
+        return np.zeros(len(frame), dtype=np.uint64)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def diff_frames(old: Optional[pd.DataFrame], new: Optional[pd.DataFrame], key_columns: Optional[Sequence] = None) -> SheetDiff:
+    """
+    Compares two snapshots of a sheet with one vectorized hash per row.
+
+    With `key_columns`, rows are matched by those columns and a matched row
+    whose other values differ is an update. Without them, rows are matched
+    by their whole content, so an edited row shows up as deleted and
+    inserted. Rows equal at the same position from the start and from the
+    end are unchanged without any lookup, so an edit or an append costs
+    little more than hashing both snapshots. Repeated keys (or repeated
+    identical rows) in between are paired in the order they appear. Column
+    order does not matter; a column whose dtype differs between the
+    snapshots is compared as text.
+    """
+    old = _frame(old)
+    new = _frame(new)
+    schema_changed = set(old.columns) != set(new.columns) or old.columns.has_duplicates or new.columns.has_duplicates
+    if schema_changed or old.empty or new.empty:
+        return SheetDiff(new, new.iloc[:0], old.iloc[:0], old, schema_changed=schema_changed)
+    if list(new.columns) != list(old.columns):
+        new = new[list(old.columns)]
+    keys = list(key_columns) if key_columns else None
+    missing = [k for k in (keys or []) if k not in old.columns]
+    if missing:
+        raise ValueError(f"Key columns not in the sheet: {missing}")
+
+    old_hashed, new_hashed = _comparable(old, new)
+    old_rows, new_rows = row_hashes(old_hashed), row_hashes(new_hashed)
+    # Rows equal at the same position at the start and at the end are
+    # unchanged; only the window between them is matched by key.
+    head = _common_run(old_rows, new_rows)
+    if head == len(old_rows) == len(new_rows):
+        return SheetDiff(new.iloc[:0], new.iloc[:0], old.iloc[:0], old.iloc[:0])
+    tail = _common_run(old_rows[head:][::-1], new_rows[head:][::-1])
+    old_window = slice(head, len(old_rows) - tail)
+    new_window = slice(head, len(new_rows) - tail)
+    old_rows, new_rows = old_rows[old_window], new_rows[new_window]
+
+    if keys is None:
+        old_keys, new_keys = old_rows, new_rows
+    else:
+        old_keys = row_hashes(old_hashed.iloc[old_window], keys)
+        new_keys = row_hashes(new_hashed.iloc[new_window], keys)
+    position = pd.Index(_unique_keys(old_keys)).get_indexer(_unique_keys(new_keys))
+
+    matched = position >= 0
+    changed = np.zeros(len(new_rows), dtype=bool)
+    changed[matched] = old_rows[position[matched]] != new_rows[matched]
+    kept = np.zeros(len(old_rows), dtype=bool)
+    kept[position[matched]] = True
+    old, new = old.iloc[old_window], new.iloc[new_window]
+    return SheetDiff(
+        inserted=new.iloc[~matched],
+        updated=new.iloc[changed],
+        updated_before=old.iloc[position[changed]],
+        deleted=old.iloc[~kept],
+    )
+
+
+def _common_run(a: np.ndarray, b: np.ndarray) -> int:
+    """Length of the run of equal values at the start of both arrays."""
+    n = min(len(a), len(b))
+    differs = np.flatnonzero(a[:n] != b[:n])
+    return int(differs[0]) if len(differs) else n
+
+
+def _frame(df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    return pd.DataFrame() if df is None else df
+
+
+def _comparable(old: pd.DataFrame, new: pd.DataFrame) -> List[pd.DataFrame]:
+    """Both snapshots with the columns whose dtypes differ turned into text, so equal cells hash equal."""
+    differing = [c for c in old.columns if old[c].dtype != new[c].dtype and not _both_categorical(old[c], new[c])]
+    if not differing:
+        return [old, new]
+    return [df.assign(**{c: df[c].astype(str) for c in differing}) for df in (old, new)]
+
+
+def _both_categorical(a: pd.Series, b: pd.Series) -> bool:
+    return isinstance(a.dtype, pd.CategoricalDtype) and isinstance(b.dtype, pd.CategoricalDtype)
+
+
+# Odd 64-bit constant mixing the occurrence number into a repeated key
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _unique_keys(keys: np.ndarray) -> np.ndarray:
+    """Keys made unique by mixing in the n-th time each one appears (0 for the first)."""
+    if pd.Index(keys).is_unique:
+        return keys
+    occurrence = pd.Series(keys).groupby(keys, sort=False).cumcount().to_numpy(dtype=np.uint64)
+    return keys + occurrence * _GOLDEN
@@ -0,0 +1,209 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.domain.names import normalize_name
+
+# Column kinds understood by `SheetSchema.apply`
+TEXT = "text"
+CATEGORY = "category"
+NUMBER = "number"
+MONEY = "money"
+DATE = "date"
+
+
+class ColumnSpec:
+    def __init__(self, name: str, kind: str, aliases: Tuple[str, ...] = ()):
+        self.name = name
+        self.kind = kind
+        self.aliases = aliases
+
+    def matches(self, column: str) -> bool:
+        column = normalize_name(column)
+        return column == normalize_name(self.name) or column in {normalize_name(a) for a in self.aliases}
+
+
+class IngestReport:
+    """What applying a schema did to one sheet."""
+
+    def __init__(self, sheet_name: str, bytes_before: int, bytes_after: int, invalid_values: Dict[str, int]):
+        self.sheet_name = sheet_name
+        self.bytes_before = bytes_before
+        self.bytes_after = bytes_after
+        # Non-empty cells that could not be parsed and became missing values
+        self.invalid_values = invalid_values
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    def __repr__(self) -> str:
+        return (f"IngestReport({self.sheet_name!r}, {self.bytes_before} -> {self.bytes_after} bytes, "
+                f"invalid={self.invalid_values})")
+
+
+class SheetSchema:
+    """
+    Declared column types of one worksheet, applied right after ingest.
+
+    - number/money: Brazilian formatted text ("R$ 1.234,56", "12,5") is
+      parsed vectorized; integral columns become int64 whatever their
+      values, so every read (and every incremental chunk) has the same
+      dtype and products and sums cannot overflow a narrow type. Fractional
+      columns stay float64 so cost sums keep their exact decimal values.
+    - date: dd/mm/yyyy text is parsed to datetime64.
+    - category: repeated strings are stored as `category`.
+    - text: kept as is.
+
+    Columns are matched case- and accent-insensitively; columns that are not
+    declared are left untouched.
+    """
+
+    def __init__(self, sheet_name: str, columns: List[ColumnSpec], value_column: Optional[str] = None):
+        self.sheet_name = sheet_name
+        self.columns = columns
+        # Main measure of the sheet (e.g. sale value), used by pages for totals
+        self.value_column = value_column
+
+    def find_column(self, df: pd.DataFrame, name: str) -> Optional[str]:
+        """Returns the actual column of `df` that matches the declared column `name`."""
+        spec = next((c for c in self.columns if c.name == name), ColumnSpec(name, TEXT))
+        return next((c for c in df.columns if spec.matches(c)), None)
+
+    def apply(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, IngestReport]:
+        bytes_before = int(df.memory_usage(deep=True).sum())
+        invalid: Dict[str, int] = {}
+        typed = {}
+        for column in df.columns:
+            spec = next((c for c in self.columns if c.matches(column)), None)
+            if spec is None:
+                continue
+            converted = _CONVERTERS[spec.kind](df[column])
+            lost = int((converted.isna() & ~_is_blank(df[column])).sum())
+            if lost:
+                invalid[column] = lost
+            typed[column] = converted
+        if typed:
+            df = df.copy(deep=False)
+            for column, values in typed.items():
+                df[column] = values
+        report = IngestReport(self.sheet_name, bytes_before, int(df.memory_usage(deep=True).sum()), invalid)
+        return df, report
+
+
+def _is_blank(values: pd.Series) -> pd.Series:
+    return values.isna() | (values.astype(str).str.strip() == "")
+
+
+def parse_brazilian_number(values: pd.Series) -> pd.Series:
+    """
+    Parses numbers written the Brazilian way ("1.234,56", "R$ 10,00", "15%").
+    Values that are already numeric are kept; unparseable cells become NaN.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(np.float64)
+    numeric = pd.to_numeric(values.where(values.map(lambda v: not isinstance(v, str))), errors="coerce")
+    text = values.astype(str).str.replace(r"R\$|%|\s", "", regex=True)
+    has_comma = text.str.contains(",", regex=False)
+    # With a decimal comma, dots are thousand separators; without it, several
+    # dots can only be thousand separators too ("1.234.567").
+    text = text.where(~has_comma, text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    several_dots = text.str.count(r"\.") > 1
+    text = text.where(~several_dots, text.str.replace(".", "", regex=False))
+    parsed = pd.to_numeric(text, errors="coerce")
+    is_text = values.map(lambda v: isinstance(v, str))
+    return numeric.where(~is_text, parsed).astype(np.float64)
+
+
+def _to_number(values: pd.Series) -> pd.Series:
+    numbers = parse_brazilian_number(values)
+    finite = numbers.dropna()
+    if numbers.notna().all() and len(finite) and np.array_equal(np.floor(finite), finite):
+        return numbers.astype(np.int64)
+    return numbers
+
+
+def _to_date(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    text = values.where(~_is_blank(values)).astype("string")
+    parsed = pd.to_datetime(text, format="%d/%m/%Y", errors="coerce")
+    missing = parsed.isna() & text.notna()
+    if missing.any():
+        parsed = parsed.where(~missing, pd.to_datetime(text.where(missing), dayfirst=True, errors="coerce", format="mixed"))
+    return parsed
+
+
+def _to_category(values: pd.Series) -> pd.Series:
+    values = values.where(~_is_blank(values)).astype(object)
+    non_null = values.dropna()
+    if len(non_null) and non_null.nunique() <= len(non_null) // 2:
+        return values.astype("category")
+    return values
+
+
+_CONVERTERS = {
+    TEXT: lambda values: values,
+    CATEGORY: _to_category,
+    NUMBER: _to_number,
+    MONEY: _to_number,
+    DATE: _to_date,
+}
+
+
+# =====================================================================
+# REGISTRY
+# =====================================================================
+
+SHEET_SCHEMAS: Dict[str, SheetSchema] = {
+    schema.sheet_name: schema
+    for schema in [
+        SheetSchema("Cadastro Produtos", [
+            ColumnSpec("Código", TEXT, ("codigo", "cod")),
+            ColumnSpec("Produto", TEXT, ("nome",)),
+            ColumnSpec("Categoria", CATEGORY),
+            ColumnSpec("Unidade", CATEGORY, ("und",)),
+            ColumnSpec("Preço", MONEY, ("preco de venda", "valor")),
+            ColumnSpec("Custo", MONEY, ("custo unitario",)),
+        ], value_column="Preço"),
+        SheetSchema("Matéria Prima", [
+            ColumnSpec("Ingrediente", TEXT, ("item", "materia prima")),
+            ColumnSpec("Unidade", CATEGORY, ("unidade de medida", "und")),
+            ColumnSpec("Quantidade", NUMBER, ("qtd",)),
+            ColumnSpec("Preço", MONEY, ("preco de compra", "valor")),
+            ColumnSpec("Fornecedor", CATEGORY),
+        ], value_column="Preço"),
+        SheetSchema("Vendas Diárias", [
+            ColumnSpec("Data", DATE),
+            ColumnSpec("Produto", CATEGORY),
+            ColumnSpec("Categoria", CATEGORY),
+            ColumnSpec("Quantidade", NUMBER, ("qtd",)),
+            ColumnSpec("Valor", MONEY, ("valor total", "total")),
+            ColumnSpec("Forma de Pagamento", CATEGORY, ("pagamento",)),
+        ], value_column="Valor"),
+        SheetSchema("Resumo Diário", [
+            ColumnSpec("Data", DATE),
+            ColumnSpec("Total Vendas", MONEY, ("valor total", "total")),
+            ColumnSpec("Quantidade", NUMBER, ("qtd",)),
+            ColumnSpec("Ticket Médio", MONEY),
+        ], value_column="Total Vendas"),
+        SheetSchema("Análise por Categoria", [
+            ColumnSpec("Categoria", CATEGORY),
+            ColumnSpec("Quantidade", NUMBER, ("qtd",)),
+            ColumnSpec("Valor", MONEY, ("valor total", "total")),
+            ColumnSpec("Percentual", NUMBER, ("%",)),
+        ], value_column="Valor"),
+        SheetSchema("Custos", [
+            ColumnSpec("recipe", CATEGORY, ("receita",)),
+            ColumnSpec("ingredient", CATEGORY, ("ingrediente",)),
+            ColumnSpec("qty", NUMBER, ("quantidade",)),
+            ColumnSpec("unit_price", MONEY, ("preco unitario",)),
+            ColumnSpec("yield", NUMBER, ("rendimento",)),
+        ]),
+        SheetSchema("Faturamento", [
+            ColumnSpec("Data", DATE, ("date",)),
+            ColumnSpec("Produto", CATEGORY, ("product",)),
+            ColumnSpec("Quantidade", NUMBER, ("units", "qtd")),
+            ColumnSpec("Valor", MONEY, ("revenue", "valor total")),
+        ], value_column="Valor"),
+    ]
+}
@@ -0,0 +1,287 @@
+import datetime as dt
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from src.ports.data_source import DataSource, DataSourceError
+
+_META_SHEET = b"vava.sheet"
+_META_VERSION = b"vava.version"
+_META_SAVED_AT = b"vava.saved_at"
+# JSON list of the mixed-type object columns stored as tagged text
+_META_MIXED = b"vava.mixed"
+
+
+class SnapshotDataSource(DataSource):
+    """
+    DataSource decorator that persists every fetched worksheet to disk as an
+    Arrow IPC file, together with its revision.
+
+    - At startup sheets are served memory-mapped from the snapshot files, so
+      a server restart does not wait on the inner source.
+    - Snapshots older than `max_age` seconds are refreshed on a background
+      thread while the current copy keeps being served.
+    - When the inner source fails (API down, no network) the last snapshot
+      is served instead; only sheets never seen before raise.
+
+    `get_version` reports the revision of the copy this source is serving,
+    so a `CachedDataSource` on top picks up a refreshed snapshot as soon as
+    the background refresh lands.
+    """
+
+    def __init__(
+        self,
+        inner: DataSource,
+        directory: str,
+        max_age: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.inner = inner
+        self.directory = directory
+        self.max_age = max_age
+        self._clock = clock
+        self._meta: Dict[str, Dict[str, Optional[str]]] = {}
+        # sheet name -> frame of the current snapshot, read (or written) once
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._refreshing: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self.last_errors: Dict[str, str] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        """Serves the snapshot when there is one; otherwise reads and stores the sheet."""
+        meta = self._snapshot_meta(sheet_name)
+        if meta is not None:
+            self._maybe_refresh(sheet_name, meta)
+            return self._read_snapshot(sheet_name)
+        return self._fetch_and_store(sheet_name)
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        missing = [name for name in sheet_names if self._snapshot_meta(name) is None]
+        fetched: Dict[str, pd.DataFrame] = {}
+        if missing:
+            versions = {name: self._inner_version(name) for name in missing}
+            fetched = self.inner.get_many(missing)
+            for name, frame in fetched.items():
+                self._write_snapshot(name, frame, versions[name])
+        return {name: fetched[name] if name in fetched else self.get_data(name) for name in sheet_names}
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        meta = self._snapshot_meta(sheet_name)
+        if meta is None:
+            return self.inner.get_version(sheet_name)
+        self._maybe_refresh(sheet_name, meta)
+        if meta["version"] is None:
+            # Without a revision from the inner source the save time tells copies apart.
+            return f"snapshot@{meta['saved_at']}"
+        return meta["version"]
+
+    def append_rows(self, sheet_name: str, rows) -> None:
+        self.inner.append_rows(sheet_name, rows)
+
+    def snapshot_info(self, sheet_name: str) -> Optional[Dict[str, Optional[str]]]:
+        """Returns the revision and save time (epoch seconds) of the stored snapshot."""
+        meta = self._snapshot_meta(sheet_name)
+        return dict(meta) if meta is not None else None
+
+    def refresh(self, sheet_name: str) -> None:
+        """Re-reads the sheet from the inner source if its revision changed."""
+        try:
+            self.sync(sheet_name)
+        except DataSourceError as e:
+            # Keep serving the previous snapshot (offline mode).
+            self.last_errors[sheet_name] = str(e)
+
+    def sync(self, sheet_name: str) -> None:
+        """
+        Like `refresh`, but whatever the age of the snapshot, and raising
+        `DataSourceError` when the sheet cannot be read (used by
+        `BackgroundRefresher`, so a change is seen on its next check).
+        """
+        meta = self._snapshot_meta(sheet_name)
+        version = self._inner_version(sheet_name)
+        if meta is not None and version is not None and version == meta["version"]:
+            self._touch(sheet_name, meta)
+            return
+        self._fetch_and_store(sheet_name, version=version)
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        """Blocks until background refreshes started so far are finished."""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def _maybe_refresh(self, sheet_name: str, meta: Dict[str, Optional[str]]) -> None:
+        if self._clock() - float(meta["saved_at"]) < self.max_age:
+            return
+        with self._lock:
+            running = self._refreshing.get(sheet_name)
+            if running is not None and running.is_alive():
+                return
+            thread = threading.Thread(
+                target=self.refresh, args=(sheet_name,), name=f"snapshot-refresh-{sheet_name}", daemon=True
+            )
+            self._refreshing[sheet_name] = thread
+        thread.start()
+
+    def _fetch_and_store(self, sheet_name: str, version: Optional[str] = None) -> pd.DataFrame:
+        if version is None:
+            version = self._inner_version(sheet_name)
+        frame = self.inner.get_data(sheet_name)
+        self._write_snapshot(sheet_name, frame, version)
+        self.last_errors.pop(sheet_name, None)
+        return frame
+
+    def _inner_version(self, sheet_name: str) -> Optional[str]:
+        try:
+            return self.inner.get_version(sheet_name)
+        except DataSourceError:
+            return None
+
+    def _path(self, sheet_name: str) -> str:
+        slug = re.sub(r"[^\w-]+", "_", sheet_name).strip("_") or "sheet"
+        digest = hashlib.sha1(sheet_name.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.directory, f"{slug}-{digest}.arrow")
+
+    def _snapshot_meta(self, sheet_name: str) -> Optional[Dict[str, Optional[str]]]:
+        with self._lock:
+            meta = self._meta.get(sheet_name)
+        if meta is not None:
+            return meta
+        path = self._path(sheet_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with pa.memory_map(path, "r") as source:
+                schema_meta = pa.ipc.open_file(source).schema.metadata or {}
+        except (OSError, pa.ArrowInvalid):
+            return None
+        version = schema_meta.get(_META_VERSION, b"").decode("utf-8") or None
+        saved_at = schema_meta.get(_META_SAVED_AT, b"0").decode("utf-8")
+        # The file mtime moves forward when an unchanged revision is confirmed.
+        meta = {"version": version, "saved_at": str(max(float(saved_at), os.path.getmtime(path)))}
+        with self._lock:
+            self._meta[sheet_name] = meta
+        return meta
+
+    def _read_snapshot(self, sheet_name: str) -> pd.DataFrame:
+        with self._lock:
+            frame = self._frames.get(sheet_name)
+        if frame is not None:
+            return frame
+        with pa.memory_map(self._path(sheet_name), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+            frame = _from_table(table)
+        with self._lock:
+            self._frames[sheet_name] = frame
+        return frame
+
+    def _write_snapshot(self, sheet_name: str, frame: pd.DataFrame, version: Optional[str]) -> None:
+        saved_at = str(self._clock())
+        table = _to_table(frame)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _META_SHEET: sheet_name.encode("utf-8"),
+            _META_VERSION: (version or "").encode("utf-8"),
+            _META_SAVED_AT: saved_at.encode("utf-8"),
+        })
+        path = self._path(sheet_name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._meta[sheet_name] = {"version": version, "saved_at": saved_at}
+            self._frames[sheet_name] = frame
+
+    def _touch(self, sheet_name: str, meta: Dict[str, Optional[str]]) -> None:
+        now = self._clock()
+        os.utime(self._path(sheet_name), (now, now))
+        with self._lock:
+            self._meta[sheet_name] = {"version": meta["version"], "saved_at": str(now)}
+
+
+def _to_table(frame: pd.DataFrame) -> pa.Table:
+    """
+    Converts a frame to Arrow. Object columns Arrow cannot type (e.g. 1 and
+    "A2" in one column) are stored as tagged text and listed in the schema
+    metadata, so `_from_table` gives back the same values and types.
+    """
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    frame = frame.copy()
+    mixed = []
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            try:
+                pa.array(frame[column], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                frame[column] = frame[column].map(_encode)
+                mixed.append(column)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    return table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_MIXED: json.dumps([str(c) for c in mixed]).encode("utf-8"),
+    })
+
+
+def _from_table(table: pa.Table) -> pd.DataFrame:
+    frame = table.to_pandas()
+    mixed = set(json.loads((table.schema.metadata or {}).get(_META_MIXED, b"[]")))
+    for column in frame.columns:
+        if str(column) in mixed:
+            frame[column] = frame[column].map(_decode).astype(object)
+    return frame
+
+
+# Tag of each type kept by the tagged-text encoding of mixed columns
+_DECODERS: Dict[str, Callable[[str], object]] = {
+    "s": str,
+    "i": int,
+    "f": float,
+    "b": lambda text: text == "1",
+    "D": Decimal,
+    "d": dt.date.fromisoformat,
+    "t": pd.Timestamp,
+}
+
+
+def _encode(value) -> Optional[str]:
+    """Tagged text of one cell of a mixed column: "i:5", "s:A2", "D:10.50", ..."""
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return "b:1" if value else "b:0"
+    if isinstance(value, str):
+        return f"s:{value}"
+    if isinstance(value, int):
+        return f"i:{value}"
+    if isinstance(value, float):
+        return f"f:{value!r}"
+    if isinstance(value, Decimal):
+        return f"D:{value}"
+    if isinstance(value, dt.datetime):
+        return f"t:{value.isoformat()}"
+    if isinstance(value, dt.date):
+        return f"d:{value.isoformat()}"
+    return f"s:{value}"
+
+
+def _decode(text: Optional[str]):
+    if text is None:
+        return None
+    tag, _, value = text.partition(":")
+    return _DECODERS[tag](value)
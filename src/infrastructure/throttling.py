@@ -0,0 +1,176 @@
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter sized to an API quota.
+
+    `acquire` takes one token, sleeping when the bucket is empty. Waiting
+    callers reserve their token up front, so concurrent callers are spread
+    out at the configured rate instead of waking up together.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float = 60.0,
+        burst: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self) -> float:
+        """Takes a token and returns how many seconds the caller had to wait."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            self.acquired += 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait:
+                self.waits += 1
+                self.wait_seconds += wait
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+class Backoff:
+    """
+    Retries a call with jittered exponential backoff ("full jitter"): the
+    n-th retry sleeps a random time in [0, min(cap, base * 2**n)].
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base: float = 1.0,
+        cap: float = 32.0,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_retries = max_retries
+        self.base = base
+        self.cap = cap
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def call(self, fn: Callable[[], Any], is_retryable: Callable[[Exception], bool]) -> Any:
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self._rng.uniform(0, min(self.cap, self.base * 2 ** attempt))
+                with self._lock:
+                    self.retries += 1
+                attempt += 1
+                self._sleep(delay)
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    function and every caller that arrives while it is running waits for and
+    shares that result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+_read_once_scope: contextvars.ContextVar = contextvars.ContextVar("vava_read_once", default=None)
+
+
+@contextmanager
+def read_once_scope() -> Iterator[None]:
+    """
+    Inside the block, `read_once(key, fn)` runs `fn` once per key and every
+    later call (from this thread or from threads started with a copy of its
+    context) reuses that result or exception. Used for revision checks, so
+    one refresh cycle asks each spreadsheet for its revision once.
+    """
+    token = _read_once_scope.set(({}, threading.Lock()))
+    try:
+        yield
+    finally:
+        _read_once_scope.reset(token)
+
+
+def read_once(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """`fn()`, reused within the enclosing `read_once_scope` (plain call outside one)."""
+    scope = _read_once_scope.get()
+    if scope is None:
+        return fn()
+    results, lock = scope
+    with lock:
+        if key in results:
+            result, error = results[key]
+            if error is not None:
+                raise error
+            return result
+    try:
+        result = fn()
+    except Exception as e:
+        with lock:
+            results.setdefault(key, (None, e))
+        raise
+    with lock:
+        results.setdefault(key, (result, None))
+    return result
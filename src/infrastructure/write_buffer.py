@@ -0,0 +1,259 @@
+import atexit
+import datetime as dt
+import json
+import os
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Union
+from src.ports.data_source import DataSourceError
+
+Row = Union[Sequence, Mapping[str, object]]
+
+
+class _Pending:
+    __slots__ = ("id", "sheet", "row", "added_at")
+
+    def __init__(self, id: str, sheet: str, row: Row, added_at: float):
+        self.id = id
+        self.sheet = sheet
+        self.row = row
+        self.added_at = added_at
+
+
+class WriteBehindBuffer:
+    """
+    Collects rows to append to worksheets and writes them in batches.
+
+    `write(sheet_name, rows)` is called with every pending row of a sheet,
+    in the order they were added, once `max_rows` rows are waiting or the
+    oldest has waited `max_delay` seconds (checked by a daemon thread, see
+    `start`). `close` (also registered with `atexit`) writes what is left.
+
+    With a `journal_path`, every row is appended to a JSONL file (and
+    fsync'ed) before `add` returns, and the file is rewritten with only the
+    unwritten rows after each successful batch. Rows still in the journal
+    are loaded again on start, so a sale recorded while the API is down, or
+    right before the process dies, is written later. Delivery is
+    at-least-once: a crash between a batch and the journal rewrite sends
+    that batch again.
+
+    A failed write keeps its rows pending; the thread tries again after
+    `retry_delay` seconds. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str, List[Row]], None],
+        max_rows: int = 100,
+        max_delay: float = 5.0,
+        journal_path: Optional[str] = None,
+        retry_delay: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        self._write = write
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.journal_path = journal_path
+        self.retry_delay = retry_delay
+        self._clock = clock
+        self._pending: List[_Pending] = []
+        self._lock = threading.Lock()
+        # Held for a whole flush, so batches leave in order and only once
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._retry_at: Optional[float] = None
+        self.flushes = 0
+        self.rows_written = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._recover()
+
+    # ------------------------------------------------------------------ writes
+
+    def add(self, sheet_name: str, rows: Sequence[Row]) -> None:
+        """Queues rows (value lists or column -> value mappings); they are journaled before returning."""
+        now = self._clock()
+        entries = [_Pending(uuid.uuid4().hex, sheet_name, _jsonable(row), now) for row in rows]
+        if not entries:
+            return
+        with self._lock:
+            self._journal_append(entries)
+            self._pending.extend(entries)
+        self._wake.set()
+
+    def flush(self) -> int:
+        """Writes every pending row now, one batch per sheet; returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+            by_sheet: Dict[str, List[_Pending]] = {}
+            for entry in batch:
+                by_sheet.setdefault(entry.sheet, []).append(entry)
+
+            written = 0
+            for sheet_name, entries in by_sheet.items():
+                try:
+                    self._write(sheet_name, [entry.row for entry in entries])
+                except Exception as e:
+                    with self._lock:
+                        self.failures += 1
+                        self.last_error = f"{sheet_name}: {e}"
+                        self._retry_at = self._clock() + self.retry_delay
+                    raise e if isinstance(e, DataSourceError) else DataSourceError(
+                        f"Failed to append rows to '{sheet_name}': {e}"
+                    ) from e
+                done = {entry.id for entry in entries}
+                with self._lock:
+                    self._pending = [entry for entry in self._pending if entry.id not in done]
+                    self._journal_rewrite()
+                    self.rows_written += len(entries)
+                    self.flushes += 1
+                    self._retry_at = None
+                    self.last_error = None
+                written += len(entries)
+            return written
+
+    def flush_due(self) -> bool:
+        """True when the size or age threshold is reached (and no retry is being waited for)."""
+        with self._lock:
+            if not self._pending:
+                return False
+            now = self._clock()
+            if self._retry_at is not None and now < self._retry_at:
+                return False
+            return len(self._pending) >= self.max_rows or now - self._pending[0].added_at >= self.max_delay
+
+    # --------------------------------------------------------------- lifecycle
+
+    def start(self) -> "WriteBehindBuffer":
+        """Starts the daemon thread that flushes on the thresholds (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        return self
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stops the thread and writes what is still pending (kept in the journal if that fails)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        atexit.unregister(self.close)
+        try:
+            self.flush()
+        except DataSourceError:
+            pass
+
+    def pending(self, sheet_name: Optional[str] = None) -> int:
+        """Rows not written yet (for one sheet, or all)."""
+        with self._lock:
+            return sum(1 for entry in self._pending if sheet_name is None or entry.sheet == sheet_name)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "rows_written": self.rows_written,
+                "flushes": self.flushes,
+                "failures": self.failures,
+                "last_error": self.last_error,
+            }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.flush_due():
+                try:
+                    self.flush()
+                except DataSourceError:
+                    pass  # rows stay pending; retried after retry_delay
+                continue
+            self._wake.wait(self._seconds_to_next_check())
+            self._wake.clear()
+
+    def _seconds_to_next_check(self) -> Optional[float]:
+        with self._lock:
+            if not self._pending:
+                return None
+            now = self._clock()
+            due = self._pending[0].added_at + self.max_delay
+            if self._retry_at is not None:
+                due = max(due, self._retry_at)
+            return max(due - now, 0.01)
+
+    # ----------------------------------------------------------------- journal
+
+    def _recover(self) -> None:
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return
+        now = self._clock()
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash mid-write
+                self._pending.append(_Pending(record["id"], record["sheet"], record["row"], now))
+
+    def _journal_append(self, entries: List[_Pending]) -> None:
+        if not self.journal_path:
+            return
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(_record(entry))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _journal_rewrite(self) -> None:
+        if not self.journal_path:
+            return
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self._pending:
+                f.write(_record(entry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+
+def _record(entry: _Pending) -> str:
+    return json.dumps({"id": entry.id, "sheet": entry.sheet, "row": entry.row}, ensure_ascii=False) + "\n"
+
+
+def _jsonable(row: Row) -> Row:
+    """Row with dates as text and Decimals and numpy numbers as floats/ints, so it fits the journal and the API."""
+    if isinstance(row, Mapping):
+        return {str(k): _value(v) for k, v in row.items()}
+    return [_value(v) for v in row]
+
+
+def _value(value):
+    if isinstance(value, float) or isinstance(value, dt.datetime):
+        if value != value:
+            return None  # NaN / NaT: an empty cell
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, Decimal):
+        # As a number: under USER_ENTERED a pt_BR sheet would read "12.50" as
+        # text. A double holds any amount of up to 15 significant digits, and
+        # JSON writes its shortest repr, i.e. the Decimal's own digits (12.5).
+        return float(value) if value.is_finite() else None
+    if isinstance(value, dt.datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        # numpy scalars (and pandas Timestamps, handled as datetimes above)
+        return _value(value.item())
+    return str(value)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, Mapping, Optional, Sequence, Union
 import pandas as pd
 
 class DataSource(ABC):
@@ -7,6 +8,33 @@ class DataSource(ABC):
         """Retrieves data from a specific sheet and returns it as a DataFrame."""
         pass
 
+    def get_many(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """Retrieves several sheets at once, keyed by sheet name.
+
+        The default implementation reads them one by one; adapters that can
+        fetch several worksheets in a single request should override it.
+        """
+        return {name: self.get_data(name) for name in sheet_names}
+
+    def get_version(self, sheet_name: str) -> Optional[str]:
+        """Returns an opaque revision token for the sheet, or None if unknown.
+
+        Two equal tokens mean the sheet content did not change between the
+        two calls. Sources that cannot tell cheaply keep the default (None),
+        which makes caching layers fall back to time-based expiry only.
+        """
+        return None
+
+    def append_rows(self, sheet_name: str, rows: Sequence[Union[Sequence, Mapping[str, object]]]) -> None:
+        """Appends rows at the end of the sheet.
+
+        Each row is a list of values in column order or a mapping of header
+        name to value. Writes may be buffered: the rows can take a while to
+        show up in reads. Read-only sources keep the default, which raises
+        `DataSourceError`.
+        """
+        raise DataSourceError(f"{type(self).__name__} is read-only")
+
 
 class DataSourceError(RuntimeError):
     """Raised when a data source operation fails (e.g. network, auth, API errors).
@@ -15,3 +43,8 @@ class DataSourceError(RuntimeError):
     data-source-related failures and for tests to assert error cases.
     """
     pass
+
+
+class QuotaExceededError(DataSourceError):
+    """Raised when the backing API keeps rejecting requests for exceeding its quota."""
+    pass
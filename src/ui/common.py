@@ -0,0 +1,127 @@
+import os
+from decimal import Decimal
+import streamlit as st
+
+# Imported by app.py at startup, before any page is chosen: pandas and the
+# data-source stack are imported inside the functions that use them.
+
+# Linhas por página das tabelas (o resto fica no servidor)
+TABLE_PAGE_SIZE = int(os.getenv("VAVA_TABLE_PAGE_SIZE", "50"))
+
+# Planilhas mantidas aquecidas pela atualização em segundo plano
+PLANILHAS_ATUALIZADAS = [
+    "Cadastro Produtos",
+    "Matéria Prima",
+    "Vendas Diárias",
+    "Resumo Diário",
+    "Análise por Categoria",
+    "Custos",
+]
+
+
+@st.cache_resource
+def get_loader(_adapter):
+    """Cria o carregador paralelo de planilhas (um pool de threads por servidor)."""
+    from src.infrastructure.concurrent_loader import ConcurrentLoader
+
+    return ConcurrentLoader(_adapter, max_workers=int(os.getenv("VAVA_LOADER_WORKERS", "4")))
+
+
+@st.cache_resource
+def get_export_cache():
+    """Arquivos de exportação já gerados, pela versão dos dados e filtros (compartilhado entre sessões)."""
+    from src.infrastructure.exporter import ExportCache
+
+    return ExportCache(max_bytes=int(float(os.getenv("VAVA_EXPORT_CACHE_MB", "128")) * 1024 * 1024))
+
+
+@st.cache_resource
+def get_view_cache():
+    """Dados derivados das páginas, por versão das planilhas e estado dos widgets."""
+    from src.ui.view_models import ViewModelCache
+
+    return ViewModelCache(max_entries=int(os.getenv("VAVA_VIEW_CACHE_ENTRIES", "128")))
+
+
+def format_currency(value):
+    """Formata um valor em moeda brasileira."""
+    if isinstance(value, Decimal):
+        return f"R$ {float(value):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"R$ {float(value):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def sheet_version(adapter, sheet_name):
+    """Revisão da planilha servida pela fonte, ou None se não der para saber."""
+    from src.ports.data_source import DataSourceError
+
+    try:
+        return adapter.get_version(sheet_name)
+    except DataSourceError:
+        return None
+
+
+def sheet_versions(adapter, sheet_names):
+    """Revisões das planilhas; ler antes dos dados, para que a chave nunca seja mais nova que eles."""
+    return tuple(sheet_version(adapter, nome) for nome in sheet_names)
+
+
+def view_model(page, versoes, state, build):
+    """Resultado de `build` guardado pelas versões lidas antes dos dados e pelo estado dos widgets."""
+    return get_view_cache().get(page, versoes, state, build)
+
+
+def download_table(versao, view, file_name, filtros=()):
+    """Download das linhas filtradas/ordenadas da tabela, gerado só no clique."""
+    from src.ui.export_button import export_download
+
+    st.markdown("---")
+    st.subheader("📥 Download")
+    export_download(
+        view.rows,
+        file_name,
+        key=file_name,
+        version=versao,
+        filters=(filtros, view.query.signature[:3]),
+        cache=get_export_cache(),
+    )
+
+
+def load_data_from_sheet(adapter, sheet_name):
+    """Carrega dados de uma planilha específica."""
+    from src.ports.data_source import DataSourceError
+
+    try:
+        return adapter.get_data(sheet_name)
+    except DataSourceError as e:
+        st.error(f"❌ Erro ao carregar dados de '{sheet_name}': {e}")
+        return None
+    except Exception as e:
+        st.error(f"❌ Erro inesperado: {e}")
+        return None
+
+
+def load_many_from_sheets(adapter, sheet_names):
+    """
+    Carrega várias planilhas em uma única requisição (None nas que falharem).
+
+    Se a requisição em lote falhar (ex.: uma aba renomeada), as planilhas são
+    lidas em paralelo, uma a uma, para que só a aba com problema fique vazia.
+    """
+    from src.ports.data_source import DataSourceError
+
+    try:
+        return adapter.get_many(sheet_names)
+    except DataSourceError:
+        pass
+    except Exception as e:
+        st.error(f"❌ Erro inesperado: {e}")
+        return {name: None for name in sheet_names}
+
+    dados = {}
+    for name, result in get_loader(adapter).load(sheet_names).items():
+        if isinstance(result, DataSourceError):
+            st.error(f"❌ Erro ao carregar dados de '{name}': {result}")
+            dados[name] = None
+        else:
+            dados[name] = result
+    return dados
@@ -0,0 +1,48 @@
+from typing import Callable, Dict, Hashable, Optional, Sequence, Union
+import pandas as pd
+import streamlit as st
+from src.infrastructure.exporter import EXPORT_FORMATS, ExportCache, export_bytes
+
+Frames = Union[pd.DataFrame, Dict[str, pd.DataFrame]]
+
+
+def export_download(
+    frames: Callable[[], Frames],
+    file_name: str,
+    key: str,
+    version: Optional[Hashable] = None,
+    filters: Hashable = (),
+    formats: Sequence[str] = ("csv", "csv.gz", "parquet", "xlsx"),
+    cache: Optional[ExportCache] = None,
+    multi_sheet: bool = False,
+) -> None:
+    """
+    Format picker plus a download button whose file is only generated when
+    it is clicked. `frames` returns the data to export (it runs outside the
+    script, so it must not call Streamlit). The bytes are kept in `cache`
+    under (file name, format, version, filters); with a None version they
+    are rebuilt on every click. Set `multi_sheet` when `frames` returns
+    several sheets, which limits the choice to formats that hold them.
+    """
+    available = [f for f in formats if EXPORT_FORMATS[f][3] or not multi_sheet]
+    col_format, col_button = st.columns([2, 1])
+    with col_format:
+        fmt = st.selectbox(
+            "Formato", available, format_func=lambda f: EXPORT_FORMATS[f][0], key=f"{key}_formato"
+        )
+    _, extension, mime, _ = EXPORT_FORMATS[fmt]
+    cache_key = None if version is None else (file_name, fmt, version, filters)
+
+    def generate() -> bytes:
+        build = lambda: export_bytes(frames(), fmt)  # noqa: E731
+        return cache.get(cache_key, build) if cache is not None else build()
+
+    with col_button:
+        st.download_button(
+            label=f"📥 Baixar {EXPORT_FORMATS[fmt][0].split(' ')[0]}",
+            data=generate,
+            file_name=f"{file_name}{extension}",
+            mime=mime,
+            key=f"{key}_download",
+            on_click="ignore",
+        )
@@ -0,0 +1,26 @@
+import streamlit as st
+from src.ui.common import TABLE_PAGE_SIZE, download_table, load_data_from_sheet, sheet_version
+from src.ui.paginated_table import paginated_table
+
+
+def show_analise_categoria(adapter):
+    st.header("📊 Análise por Categoria")
+    st.markdown("---")
+
+    try:
+        versao = sheet_version(adapter, "Análise por Categoria")
+        df = load_data_from_sheet(adapter, "Análise por Categoria")
+
+        if df is None or df.empty:
+            st.warning("⚠️ Nenhum dado de análise disponível")
+            return
+
+        # Exibir tabela
+        st.subheader("📊 Análise por Categoria")
+        view = paginated_table(df, "analise_categoria", page_size=TABLE_PAGE_SIZE)
+
+        # Download (gerado só no clique)
+        download_table(versao, view, "analise_categoria")
+
+    except Exception as e:
+        st.error(f"❌ Erro ao exibir análise por categoria: {e}")
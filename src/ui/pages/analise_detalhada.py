@@ -0,0 +1,224 @@
+import pandas as pd
+import streamlit as st
+from src.domain.margin_analysis import PERIODS
+from src.domain.names import normalize_name
+from src.ports.data_source import DataSourceError
+from src.ui.common import PLANILHAS_ATUALIZADAS, TABLE_PAGE_SIZE, format_currency, get_export_cache, sheet_versions
+from src.ui.export_button import export_download
+from src.ui.paginated_table import paginated_table
+
+
+def show_analise_detalhada(service, margin_service=None):
+    st.header("🔍 Análise Detalhada")
+    st.markdown("---")
+
+    try:
+        # Tabs para diferentes análises
+        tab1, tab2, tab3, tab4 = st.tabs(["Custos por Receita", "Margens", "Simulação de Preços", "Relatórios"])
+
+        with tab1:
+            st.subheader("Custo Total por Receita")
+
+            # Sub-receitas (ingrediente que é outra receita) entram com o custo consolidado
+            custo_por_receita = service.calculate_nested_cost_per_recipe("Custos")
+            # Custo só dos ingredientes comprados; quando Custos muda, só as linhas alteradas são somadas
+            custo_ingredientes = {}
+            for receita, custo in service.recipe_cost_totals("Custos").items():
+                chave = normalize_name(receita)
+                custo_ingredientes[chave] = custo_ingredientes.get(chave, 0) + custo
+
+            if custo_por_receita:
+                # Criar DataFrame
+                analise_df = pd.DataFrame(
+                    [
+                        (k, float(custo_ingredientes.get(normalize_name(k), 0)), float(v))
+                        for k, v in sorted(custo_por_receita.items(), key=lambda x: x[1], reverse=True)
+                    ],
+                    columns=["Receita", "Custo Ingredientes (R$)", "Custo Total (R$)"]
+                )
+
+                # Métricas
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    st.metric("Total de Receitas", len(analise_df))
+
+                with col2:
+                    total = analise_df["Custo Total (R$)"].sum()
+                    st.metric("Custo Total", format_currency(total))
+
+                with col3:
+                    media = analise_df["Custo Total (R$)"].mean()
+                    st.metric("Custo Médio", format_currency(media))
+
+                # Gráfico
+                st.bar_chart(analise_df.set_index("Receita")["Custo Total (R$)"])
+
+                # Tabela
+                display_df = analise_df.copy()
+                for coluna in ["Custo Ingredientes (R$)", "Custo Total (R$)"]:
+                    display_df[coluna] = display_df[coluna].apply(
+                        lambda x: f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+                    )
+                st.dataframe(display_df, use_container_width=True, hide_index=True)
+            else:
+                st.info("ℹ️ Nenhum dado disponível para análise")
+
+        with tab2:
+            st.subheader("Análise de Margens")
+            if margin_service is None:
+                st.info("ℹ️ Análise de margens indisponível")
+            else:
+                show_margens(margin_service)
+
+        with tab3:
+            st.subheader("Simulação de Preços de Ingredientes")
+            show_simulacao_precos(service)
+
+        with tab4:
+            st.subheader("Relatórios")
+            show_relatorios(service.data_source, margin_service)
+
+    except Exception as e:
+        st.error(f"❌ Erro ao processar análise: {e}")
+
+
+def show_margens(margin_service):
+    """Margem e contribuição por produto e período (Faturamento x Custos)."""
+    opcoes = {"Total do período": None, **{nome: codigo for codigo, nome in PERIODS.items()}}
+    escolha = st.selectbox("Agrupar por:", options=list(opcoes), index=list(opcoes).index("Mensal"))
+
+    try:
+        margens_df = margin_service.calculate_margins(opcoes[escolha])
+    except DataSourceError as e:
+        st.info(f"ℹ️ Não foi possível carregar Faturamento/Custos: {e}")
+        return
+    except ValueError as e:
+        st.warning(f"⚠️ Dados de faturamento ou custos inválidos: {e}")
+        return
+
+    if margens_df.empty:
+        st.info("ℹ️ Nenhum faturamento registrado")
+        return
+
+    resumo = margin_service.summary(margens_df)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Receita", format_currency(resumo["revenue"]))
+    with col2:
+        st.metric("Custo", format_currency(resumo["cost"]))
+    with col3:
+        st.metric("Contribuição Total", format_currency(resumo["contribution"]))
+    with col4:
+        margem = resumo["gross_margin_pct"]
+        st.metric("Margem Bruta", f"{margem:.1%}".replace(".", ",") if margem == margem else "—")
+
+    if resumo["products_without_cost"]:
+        st.warning(f"⚠️ {resumo['products_without_cost']} produto(s) vendidos sem receita cadastrada em Custos")
+
+    por_produto = (
+        margens_df[margens_df["has_cost"]].groupby("product", sort=False)["contribution"].sum()
+        .sort_values(ascending=False).head(20)
+    )
+    if not por_produto.empty:
+        st.bar_chart(por_produto.rename("Contribuição (R$)"))
+
+    display_df = margens_df.rename(columns={
+        "product": "Produto",
+        "period": "Período",
+        "units": "Unidades",
+        "revenue": "Receita (R$)",
+        "avg_price": "Preço Médio (R$)",
+        "unit_cost": "Custo Unitário (R$)",
+        "cost": "Custo Total (R$)",
+        "contribution_per_unit": "Contribuição/Unidade (R$)",
+        "contribution": "Contribuição Total (R$)",
+        "gross_margin_pct": "Margem Bruta",
+    }).drop(columns=["has_cost"])
+    display_df["Margem Bruta"] = display_df["Margem Bruta"] * 100
+    paginated_table(
+        display_df,
+        "margens",
+        page_size=TABLE_PAGE_SIZE,
+        hide_index=True,
+        column_config={"Margem Bruta": st.column_config.NumberColumn(format="%.1f%%")},
+    )
+
+
+def show_relatorios(fonte, margin_service=None):
+    """Pasta de trabalho .xlsx com várias planilhas, gerada só no clique do download."""
+    opcoes = PLANILHAS_ATUALIZADAS + ["Faturamento"] + (["Margens (mensal)"] if margin_service is not None else [])
+    escolhidas = st.multiselect("Planilhas do relatório:", options=opcoes, default=["Custos", "Faturamento"])
+    if not escolhidas:
+        st.info("ℹ️ Escolha as planilhas que entram no relatório")
+        return
+
+    planilhas = [nome for nome in escolhidas if nome != "Margens (mensal)"]
+    if "Margens (mensal)" in escolhidas:
+        planilhas = sorted(set(planilhas) | {"Custos", "Faturamento"}, key=opcoes.index)
+    versoes = sheet_versions(fonte, planilhas)
+
+    def gerar():
+        dados = fonte.get_many(planilhas)
+        frames = {nome: dados[nome] for nome in escolhidas if nome in dados}
+        if "Margens (mensal)" in escolhidas:
+            frames["Margens (mensal)"] = margin_service.calculate_margins("M")
+        return frames
+
+    export_download(
+        gerar,
+        "relatorio_vava_doces",
+        key="relatorio",
+        version=None if None in versoes else versoes,
+        filters=tuple(escolhidas),
+        formats=("xlsx",),
+        cache=get_export_cache(),
+        multi_sheet=True,
+    )
+
+
+def show_simulacao_precos(service):
+    """E se o preço de um ingrediente mudar? Recalcula só as receitas afetadas, sem alterar a planilha."""
+    try:
+        grafo = service.recipe_graph("Custos")
+    except DataSourceError as e:
+        st.info(f"ℹ️ Não foi possível carregar Custos: {e}")
+        return
+
+    ingredientes = st.multiselect("Ingredientes:", options=grafo.ingredients)
+    if not ingredientes:
+        st.info("ℹ️ Escolha um ou mais ingredientes para simular a variação de preço")
+        return
+
+    variacoes = {}
+    colunas = st.columns(min(len(ingredientes), 4))
+    for i, ingrediente in enumerate(ingredientes):
+        with colunas[i % len(colunas)]:
+            variacoes[ingrediente] = st.number_input(
+                f"{ingrediente} (%)", min_value=-100.0, value=10.0, step=1.0, key=f"simulacao_{ingrediente}"
+            ) / 100
+
+    simulacao = service.simulate_price_changes(changes=variacoes)
+    if simulacao.empty:
+        st.info("ℹ️ Nenhuma receita afetada")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Receitas Afetadas", len(simulacao))
+    with col2:
+        st.metric("Impacto Total por Lote", format_currency(float(simulacao["delta"].sum())))
+
+    display_df = pd.DataFrame({
+        "Receita": simulacao["recipe"],
+        "Custo Atual (R$)": simulacao["cost_before"].astype(float),
+        "Custo Simulado (R$)": simulacao["cost_after"].astype(float),
+        "Variação (R$)": simulacao["delta"].astype(float),
+        "Variação (%)": simulacao["delta_pct"].astype(float) * 100,
+    })
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Variação (%)": st.column_config.NumberColumn(format="%.1f%%")},
+    )
@@ -0,0 +1,70 @@
+import streamlit as st
+from src.ui.common import format_currency, load_many_from_sheets, sheet_versions, view_model
+from src.ui.view_models import dashboard_view
+
+
+def show_dashboard(service, adapter):
+    st.header("📊 Dashboard")
+    st.markdown("---")
+
+    try:
+        # Carregar dados (uma única requisição para as três planilhas)
+        versoes = sheet_versions(adapter, ["Cadastro Produtos", "Vendas Diárias"])
+        dados = load_many_from_sheets(adapter, ["Cadastro Produtos", "Vendas Diárias", "Resumo Diário"])
+        produtos_df = dados["Cadastro Produtos"]
+        vendas_df = dados["Vendas Diárias"]
+        resumo_df = dados["Resumo Diário"]
+
+        if produtos_df is None or produtos_df.empty:
+            st.warning("⚠️ Nenhum dado disponível")
+            return
+
+        # Métricas principais
+        col1, col2, col3, col4 = st.columns(4)
+
+        # Renderizar cards métricos
+        def render_metric(col, title, value):
+            with col:
+                st.markdown(f"<div class='metric-card'><div class='card-title'>{title}</div><div class='card-value'>{value}</div></div>", unsafe_allow_html=True)
+
+        # Métricas e séries derivadas, guardadas pela versão das planilhas
+        vm = view_model(
+            "dashboard", versoes, (),
+            lambda: dashboard_view(produtos_df, vendas_df),
+        )
+
+        render_metric(col1, '📦 Total de Produtos', f"{vm['total_produtos']}")
+        render_metric(col2, '💳 Total de Vendas', f"{vm['total_vendas']}")
+        render_metric(col3, '💰 Valor Total Vendas', format_currency(vm["valor_vendas"]))
+        render_metric(col4, '📊 Categorias', f"{vm['categorias']}")
+
+        st.markdown("---")
+
+        # Gráficos
+        st.subheader("📈 Produtos por Categoria")
+
+        if vm["produtos_por_categoria"] is not None:
+            st.bar_chart(vm["produtos_por_categoria"])
+
+        st.markdown("---")
+
+        # Tabelas com resumo
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("📋 Últimos Produtos Cadastrados")
+            if produtos_df is not None and not produtos_df.empty:
+                st.dataframe(vm["ultimos_produtos"], use_container_width=True)
+            else:
+                st.info("Nenhum dado disponível")
+
+        with col2:
+            st.subheader("💳 Últimas Vendas")
+            if vm["ultimas_vendas"] is not None:
+                st.dataframe(vm["ultimas_vendas"], use_container_width=True)
+            else:
+                st.info("Nenhum dado disponível")
+
+
+    except Exception as e:
+        st.error(f"❌ Erro ao processar dashboard: {e}")
@@ -0,0 +1,45 @@
+import streamlit as st
+from src.ui.common import TABLE_PAGE_SIZE, download_table, format_currency, load_data_from_sheet, sheet_versions, view_model
+from src.ui.paginated_table import paginated_table
+from src.ui.view_models import materia_prima_view
+
+
+def show_materia_prima(adapter):
+    st.header("🥘 Matéria Prima")
+    st.markdown("---")
+
+    try:
+        versoes = sheet_versions(adapter, ["Matéria Prima"])
+        df = load_data_from_sheet(adapter, "Matéria Prima")
+
+        if df is None or df.empty:
+            st.warning("⚠️ Nenhum dado de matéria prima disponível")
+            return
+
+        vm = view_model("materia_prima", versoes, (), lambda: materia_prima_view(df))
+
+        # Estatísticas
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("🥘 Total de Itens", vm["total"])
+
+        with col2:
+            if vm["unidades"] is not None:
+                st.metric("📏 Unidades", vm["unidades"])
+
+        with col3:
+            if vm["preco_medio"] is not None:
+                st.metric("💰 Preço Médio", format_currency(vm["preco_medio"]))
+
+        st.markdown("---")
+
+        # Exibir tabela
+        st.subheader("📋 Tabela de Matéria Prima")
+        view = paginated_table(df, "materia_prima", page_size=TABLE_PAGE_SIZE)
+
+        # Download (gerado só no clique)
+        download_table(versoes[0], view, "materia_prima")
+
+    except Exception as e:
+        st.error(f"❌ Erro ao exibir matéria prima: {e}")
@@ -0,0 +1,63 @@
+import streamlit as st
+from src.ui.common import TABLE_PAGE_SIZE, download_table, format_currency, load_data_from_sheet, sheet_versions, view_model
+from src.ui.paginated_table import paginated_table
+from src.ui.view_models import produtos_filtered, produtos_options
+
+
+def show_produtos(adapter):
+    st.header("📦 Cadastro de Produtos")
+    st.markdown("---")
+
+    try:
+        versoes = sheet_versions(adapter, ["Cadastro Produtos"])
+        df = load_data_from_sheet(adapter, "Cadastro Produtos")
+
+        if df is None or df.empty:
+            st.warning("⚠️ Nenhum produto cadastrado")
+            return
+
+        vm = view_model("produtos", versoes, (), lambda: produtos_options(df))
+
+        # Estatísticas
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("📦 Total de Produtos", vm["total"])
+
+        with col2:
+            if vm["categorias"] is not None:
+                st.metric("📊 Categorias", vm["categorias"])
+
+        with col3:
+            if vm["preco_medio"] is not None:
+                st.metric("💰 Preço Médio", format_currency(vm["preco_medio"]))
+
+        st.markdown("---")
+
+        # Filtros
+        col1, col2 = st.columns(2)
+
+        selected_category = None
+        if vm["opcoes_categoria"]:
+            with col1:
+                selected_category = st.multiselect(
+                    "Filtrar por categoria:",
+                    options=vm["opcoes_categoria"],
+                    default=vm["categorias_padrao"]
+                )
+
+        # Aplicar filtro (guardado pela versão da planilha e categorias escolhidas)
+        filtro = tuple(selected_category or ())
+        df_filtered = view_model(
+            "produtos_filtrados", versoes, filtro, lambda: produtos_filtered(df, filtro)
+        )
+
+        # Exibir tabela
+        st.subheader("📋 Lista de Produtos")
+        view = paginated_table(df_filtered, "produtos", page_size=TABLE_PAGE_SIZE)
+
+        # Download (gerado só no clique)
+        download_table(versoes[0], view, "produtos", filtros=tuple(map(str, selected_category or ())))
+
+    except Exception as e:
+        st.error(f"❌ Erro ao exibir produtos: {e}")
@@ -0,0 +1,26 @@
+import streamlit as st
+from src.ui.common import TABLE_PAGE_SIZE, download_table, load_data_from_sheet, sheet_version
+from src.ui.paginated_table import paginated_table
+
+
+def show_resumo_diario(adapter):
+    st.header("📈 Resumo Diário")
+    st.markdown("---")
+
+    try:
+        versao = sheet_version(adapter, "Resumo Diário")
+        df = load_data_from_sheet(adapter, "Resumo Diário")
+
+        if df is None or df.empty:
+            st.warning("⚠️ Nenhum dado de resumo disponível")
+            return
+
+        # Exibir tabela
+        st.subheader("📊 Resumo Diário")
+        view = paginated_table(df, "resumo_diario", page_size=TABLE_PAGE_SIZE)
+
+        # Download (gerado só no clique)
+        download_table(versao, view, "resumo_diario")
+
+    except Exception as e:
+        st.error(f"❌ Erro ao exibir resumo diário: {e}")
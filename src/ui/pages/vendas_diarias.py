@@ -0,0 +1,95 @@
+import streamlit as st
+from src.domain.sales_timeseries import GRANULARITIES, SalesTimeSeriesService, best_granularity
+from src.ui.common import TABLE_PAGE_SIZE, download_table, format_currency, load_data_from_sheet, sheet_versions, view_model
+from src.ui.paginated_table import paginated_table
+from src.ui.view_models import vendas_view
+
+
+def show_vendas_diarias(adapter, sales_series=None):
+    st.header("💳 Vendas Diárias")
+    st.markdown("---")
+
+    try:
+        versoes = sheet_versions(adapter, ["Vendas Diárias"])
+        df = load_data_from_sheet(adapter, "Vendas Diárias")
+
+        if df is None or df.empty:
+            st.warning("⚠️ Nenhum dado de vendas disponível")
+            return
+
+        vm = view_model("vendas_diarias", versoes, (), lambda: vendas_view(df))
+        value_col = vm["value_col"]
+
+        # Estatísticas
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric("💳 Total de Vendas", vm["total"])
+
+        with col2:
+            if value_col is not None:
+                st.metric("💰 Valor Total", format_currency(vm["valor_total"]))
+
+        with col3:
+            if value_col is not None:
+                st.metric("📊 Valor Médio", format_currency(vm["valor_medio"]))
+
+        st.markdown("---")
+
+        # Gráfico de vendas (agregado por dia/semana/mês conforme o período)
+        if value_col is not None:
+            st.subheader("📈 Gráfico de Vendas")
+            show_grafico_vendas(sales_series or SalesTimeSeriesService(adapter))
+
+        st.markdown("---")
+
+        # Exibir tabela
+        st.subheader("📋 Tabela de Vendas Diárias")
+        view = paginated_table(df, "vendas_diarias", page_size=TABLE_PAGE_SIZE)
+
+        # Download (gerado só no clique)
+        download_table(versoes[0], view, "vendas_diarias")
+
+    except Exception as e:
+        st.error(f"❌ Erro ao exibir vendas diárias: {e}")
+
+
+def show_grafico_vendas(sales_series):
+    """Série temporal das vendas na granularidade que cabe no período escolhido."""
+    try:
+        serie = sales_series.get()
+    except ValueError as e:
+        st.info(f"ℹ️ Gráfico indisponível: {e}")
+        return
+    intervalo = serie.date_range()
+    if intervalo is None:
+        st.info("ℹ️ Nenhuma venda com data válida")
+        return
+
+    inicio, fim = intervalo[0].date(), intervalo[1].date()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        periodo = st.date_input("Período", value=(inicio, fim), min_value=inicio, max_value=fim, key="vendas_periodo")
+    # Enquanto o usuário escolhe o intervalo, só a data inicial existe
+    if isinstance(periodo, (tuple, list)):
+        inicio, fim = (periodo[0], periodo[-1]) if periodo else (inicio, fim)
+    with col2:
+        opcoes = {"Automático": None, **{nome: codigo for codigo, nome in GRANULARITIES.items()}}
+        escolha = st.selectbox("Granularidade", list(opcoes), key="vendas_granularidade")
+    with col3:
+        metricas = {"Receita (R$)": "revenue", "Unidades": "units", "Ticket Médio (R$)": "ticket"}
+        metrica = st.selectbox("Métrica", list(metricas), key="vendas_metrica")
+    with col4:
+        por_categoria = st.checkbox("Por categoria", key="vendas_por_categoria")
+
+    granularidade = opcoes[escolha] or best_granularity(inicio, fim)
+    dados = serie.series(granularidade, by="category" if por_categoria else None, start=inicio, end=fim)
+    if dados.empty:
+        st.info("ℹ️ Nenhuma venda no período")
+        return
+    if por_categoria:
+        grafico = dados.pivot(index="period", columns="category", values=metricas[metrica])
+    else:
+        grafico = dados.set_index("period")[[metricas[metrica]]].rename(columns={metricas[metrica]: metrica})
+    st.line_chart(grafico)
+    st.caption(f"{GRANULARITIES[granularidade]} · {len(dados['period'].unique())} pontos")
@@ -0,0 +1,152 @@
+import math
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DEFAULT_PAGE_SIZES = (25, 50, 100, 250)
+
+# Filtered/sorted row positions kept per (frame, search, sort), so paging
+# through a table does not search and sort it again on every rerun.
+_MAX_CACHED_QUERIES = 16
+_positions_cache: "OrderedDict[Tuple, Tuple[weakref.ref, np.ndarray]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class TableQuery:
+    """What the user asked of a table: text search, sort and page (1-based)."""
+
+    def __init__(self, search: str = "", sort_by=None, ascending: bool = True, page: int = 1, page_size: int = 50):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.search = search
+        self.sort_by = sort_by
+        self.ascending = ascending
+        self.page = page
+        self.page_size = page_size
+
+    @property
+    def signature(self) -> Tuple:
+        """Everything but the page: when it changes, paging restarts at page 1."""
+        return (self.search.strip().lower(), self.sort_by, self.ascending, self.page_size)
+
+
+class TableView:
+    """One page of a frame after search and sort, plus the counts shown to the user."""
+
+    def __init__(self, frame: pd.DataFrame, positions: np.ndarray, query: TableQuery):
+        self.frame = frame
+        self.positions = positions
+        self.query = query
+        self.total_rows = len(frame)
+        self.filtered_rows = len(positions)
+        self.page_count = max(1, math.ceil(self.filtered_rows / query.page_size))
+        self.page_number = min(max(1, query.page), self.page_count)
+        start = (self.page_number - 1) * query.page_size
+        self.first_row = start + 1 if self.filtered_rows else 0
+        self.last_row = min(start + query.page_size, self.filtered_rows)
+        self.page = frame.iloc[positions[start:self.last_row]]
+
+    def rows(self) -> pd.DataFrame:
+        """Every row that matches the search, in the chosen order (e.g. for downloads)."""
+        if self.filtered_rows == self.total_rows and self.query.sort_by is None:
+            return self.frame
+        return self.frame.iloc[self.positions]
+
+
+def query_table(df: pd.DataFrame, query: TableQuery) -> TableView:
+    """Applies search and sort to `df` and cuts the requested page; no Streamlit calls."""
+    return TableView(df, _positions(df, query.search, query.sort_by, query.ascending), query)
+
+
+def _positions(df: pd.DataFrame, search: str, sort_by, ascending: bool) -> np.ndarray:
+    term = search.strip().lower()
+    key = (id(df), len(df), term, sort_by, ascending)
+    with _cache_lock:
+        cached = _positions_cache.get(key)
+        if cached is not None and cached[0]() is df:
+            _positions_cache.move_to_end(key)
+            return cached[1]
+
+    positions = np.flatnonzero(_search_mask(df, term)) if term else np.arange(len(df))
+    if sort_by is not None:
+        values = df[sort_by].take(positions).reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+        positions = positions[order]
+
+    with _cache_lock:
+        _positions_cache[key] = (weakref.ref(df), positions)
+        while len(_positions_cache) > _MAX_CACHED_QUERIES:
+            _positions_cache.popitem(last=False)
+    return positions
+
+
+def _search_mask(df: pd.DataFrame, term: str) -> np.ndarray:
+    """Rows where any text column contains `term` (case-insensitive)."""
+    mask = np.zeros(len(df), dtype=bool)
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Only the distinct values are searched
+            hits = values.cat.categories.astype(str).str.lower().str.contains(term, regex=False)
+            mask |= np.isin(values.cat.codes.to_numpy(), np.flatnonzero(hits))
+        elif pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            mask |= values.astype(str).str.lower().str.contains(term, regex=False).to_numpy(dtype=bool)
+    return mask
+
+
+def _format_count(value: int) -> str:
+    return f"{value:,}".replace(",", ".")
+
+
+def paginated_table(
+    df: pd.DataFrame,
+    key: str,
+    page_size: int = 50,
+    page_sizes: Sequence[int] = DEFAULT_PAGE_SIZES,
+    show_row_count: bool = True,
+    searchable: bool = True,
+    column_config: Optional[dict] = None,
+    hide_index: Optional[bool] = None,
+) -> TableView:
+    """
+    Table that keeps `df` on the server: search, sort and paging run here
+    and only the visible page is sent to the browser. `key` must be unique
+    per table on the page. Returns the `TableView` being shown.
+    """
+    sizes = sorted(set(page_sizes) | {page_size})
+    col_search, col_sort, col_order, col_size = st.columns([3, 2, 1, 1])
+    with col_search:
+        search = st.text_input("🔎 Buscar", key=f"{key}_busca") if searchable else ""
+    with col_sort:
+        sort_label = st.selectbox("Ordenar por", ["—"] + [str(c) for c in df.columns], key=f"{key}_ordem")
+    with col_order:
+        descending = st.selectbox("Ordem", ["Crescente", "Decrescente"], key=f"{key}_sentido") == "Decrescente"
+    with col_size:
+        size = st.selectbox("Linhas por página", sizes, index=sizes.index(page_size), key=f"{key}_tamanho")
+
+    sort_by = None if sort_label == "—" else next(c for c in df.columns if str(c) == sort_label)
+    page_key = f"{key}_pagina"
+    query = TableQuery(search or "", sort_by, not descending, st.session_state.get(page_key, 1), size)
+    if st.session_state.get(f"{key}_consulta") != query.signature:
+        st.session_state[f"{key}_consulta"] = query.signature
+        query.page = 1
+    view = query_table(df, query)
+    # Clamp before the widget exists: the data may have shrunk since the last run
+    st.session_state[page_key] = view.page_number
+
+    st.dataframe(view.page, use_container_width=True, column_config=column_config, hide_index=hide_index)
+
+    col_count, col_page = st.columns([3, 1])
+    with col_page:
+        st.number_input(f"Página (de {view.page_count})", min_value=1, max_value=view.page_count, step=1, key=page_key)
+    if show_row_count:
+        with col_count:
+            texto = f"Linhas {_format_count(view.first_row)}–{_format_count(view.last_row)} de {_format_count(view.filtered_rows)}"
+            if view.filtered_rows != view.total_rows:
+                texto += f" (filtradas de {_format_count(view.total_rows)})"
+            st.caption(texto)
+    return view
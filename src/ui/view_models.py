@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+import pandas as pd
+from src.infrastructure.sheet_schemas import SHEET_SCHEMAS
+
+# Number of categories selected by default in the products filter
+_DEFAULT_CATEGORIES = 5
+
+
+class ViewModelCache:
+    """
+    Derived page data (metrics, chart series, filtered frames) kept by
+    (page, sheet versions, widget state), so a rerun with unchanged inputs
+    does no pandas work.
+
+    Entries are evicted in LRU order beyond `max_entries` or once the frames
+    they hold exceed `max_bytes`. When any version is unknown (None) the
+    view model is computed and not kept. Thread-safe; results are shared
+    between sessions and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, page: str, versions: Sequence[Optional[Hashable]], state: Hashable, build: Callable[[], Any]) -> Any:
+        versions = tuple(versions)
+        if any(v is None for v in versions):
+            with self._lock:
+                self.misses += 1
+            return build()
+
+        key = (page, versions, state)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = build()
+        size = _size_of(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._total_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _size_of(value: Any) -> int:
+    """Shallow memory of the frames/series a view model holds."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, dict):
+        return sum(_size_of(v) for v in value.values())
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Pure view-model builders: DataFrames in, plain values and frames out.
+# ---------------------------------------------------------------------------
+
+def get_value_column(df: pd.DataFrame, sheet_name: str) -> Optional[str]:
+    """Main value column of the sheet (declared in its schema) or the first numeric one."""
+    schema = SHEET_SCHEMAS.get(sheet_name)
+    if schema is not None and schema.value_column:
+        column = schema.find_column(df, schema.value_column)
+        if column is not None and pd.api.types.is_numeric_dtype(df[column]):
+            return column
+    numeric_cols = df.select_dtypes(include=["number"]).columns
+    return numeric_cols[0] if len(numeric_cols) > 0 else None
+
+
+def price_column(df: pd.DataFrame) -> Optional[str]:
+    return next((c for c in df.columns if str(c).lower() in ("preco", "preço")), None)
+
+
+def dashboard_view(produtos_df: pd.DataFrame, vendas_df: Optional[pd.DataFrame]) -> Dict[str, Any]:
+    has_sales = vendas_df is not None and not vendas_df.empty
+    value_col = get_value_column(vendas_df, "Vendas Diárias") if has_sales else None
+    has_category = "Categoria" in produtos_df.columns
+    return {
+        "total_produtos": len(produtos_df),
+        "total_vendas": len(vendas_df) if vendas_df is not None else 0,
+        "valor_vendas": float(vendas_df[value_col].sum()) if value_col is not None else 0.0,
+        "categorias": int(produtos_df["Categoria"].nunique()) if has_category else 0,
+        "produtos_por_categoria": produtos_df["Categoria"].value_counts() if has_category else None,
+        "ultimos_produtos": produtos_df.tail(5),
+        "ultimas_vendas": vendas_df.tail(5) if has_sales else None,
+    }
+
+
+def produtos_options(df: pd.DataFrame) -> Dict[str, Any]:
+    """Metrics and filter options of the products page (no widget state)."""
+    price_col = price_column(df)
+    categories: List = list(df["Categoria"].unique()) if "Categoria" in df.columns else []
+    return {
+        "total": len(df),
+        "categorias": int(df["Categoria"].nunique()) if "Categoria" in df.columns else None,
+        "preco_medio": float(df[price_col].mean()) if price_col else None,
+        "opcoes_categoria": categories,
+        "categorias_padrao": categories if len(categories) <= _DEFAULT_CATEGORIES else categories[:_DEFAULT_CATEGORIES],
+    }
+
+
+def produtos_filtered(df: pd.DataFrame, selected_categories: Tuple) -> pd.DataFrame:
+    """Products in the selected categories (all products when none is selected)."""
+    if not selected_categories or "Categoria" not in df.columns:
+        return df
+    return df[df["Categoria"].isin(list(selected_categories))]
+
+
+def materia_prima_view(df: pd.DataFrame) -> Dict[str, Any]:
+    price_col = price_column(df)
+    return {
+        "total": len(df),
+        "unidades": int(df["Unidade"].nunique()) if "Unidade" in df.columns else None,
+        "preco_medio": float(df[price_col].mean()) if price_col else None,
+    }
+
+
+def vendas_view(df: pd.DataFrame) -> Dict[str, Any]:
+    value_col = get_value_column(df, "Vendas Diárias")
+    return {
+        "total": len(df),
+        "value_col": value_col,
+        "valor_total": float(df[value_col].sum()) if value_col is not None else None,
+        "valor_medio": float(df[value_col].mean()) if value_col is not None else None,
+    }
@@ -0,0 +1,111 @@
+import time
+
+import pandas as pd
+
+from src.infrastructure.background_refresher import BackgroundRefresher
+from src.infrastructure.cached_data_source import CachedDataSource
+from src.infrastructure.snapshot_data_source import SnapshotDataSource
+from src.ports.data_source import DataSource, DataSourceError
+
+
+class VersionedDataSource(DataSource):
+    def __init__(self):
+        self.frames = {"Custos": pd.DataFrame({"qty": [1]}), "Vendas Diárias": pd.DataFrame({"valor": [10]})}
+        self.version = "v1"
+        self.batch_calls = 0
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        return self.frames[sheet_name]
+
+    def get_many(self, sheet_names):
+        self.batch_calls += 1
+        return {name: self.frames[name] for name in sheet_names}
+
+    def get_version(self, sheet_name: str):
+        return self.version
+
+
+def test_refresh_once_warms_cache_then_only_swaps_changed_revisions():
+    inner = VersionedDataSource()
+    cache = CachedDataSource(inner)
+    refresher = BackgroundRefresher(cache, ["Custos", "Vendas Diárias"])
+
+    assert refresher.refresh_once() == {"Custos": True, "Vendas Diárias": True}
+    assert refresher.refresh_once() == {"Custos": False, "Vendas Diárias": False}
+    assert inner.batch_calls == 1
+
+    inner.version = "v2"
+    inner.frames["Custos"] = pd.DataFrame({"qty": [2]})
+    refresher.refresh_once()
+
+    assert cache.get_data("Custos").iloc[0]["qty"] == 2
+    assert cache.stats()["misses"] == 0
+    assert cache.data_as_of("Custos") is not None
+
+
+def test_started_refresher_fills_cache_in_background():
+    cache = CachedDataSource(VersionedDataSource())
+    refresher = BackgroundRefresher(cache, ["Custos"], interval=60).start()
+    try:
+        deadline = time.time() + 5
+        while refresher.last_refreshed_at is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert cache.cached_version("Custos") == "v1"
+        assert refresher.running
+    finally:
+        refresher.stop(timeout=5)
+    assert not refresher.running
+
+
+class FlakyDataSource(VersionedDataSource):
+    def __init__(self):
+        super().__init__()
+        self.failing = set()
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        if sheet_name in self.failing:
+            raise DataSourceError(f"aba '{sheet_name}' não encontrada")
+        return super().get_data(sheet_name)
+
+    def get_many(self, sheet_names):
+        self.batch_calls += 1
+        if self.failing & set(sheet_names):
+            raise DataSourceError("batch failed")
+        return super().get_many(sheet_names)
+
+
+def test_failing_sheet_does_not_block_the_others():
+    inner = FlakyDataSource()
+    cache = CachedDataSource(inner)
+    refresher = BackgroundRefresher(cache, ["Custos", "Vendas Diárias"])
+    refresher.refresh_once()
+    refreshed_at = refresher.last_refreshed_at
+
+    inner.version = "v2"
+    inner.frames["Custos"] = pd.DataFrame({"qty": [2]})
+    inner.failing = {"Vendas Diárias"}
+
+    assert refresher.refresh_once() == {"Custos": True, "Vendas Diárias": False}
+    assert cache.get_data("Custos").iloc[0]["qty"] == 2
+    assert refresher.stale and "Vendas Diárias" in refresher.last_error
+    assert cache.cached_version("Vendas Diárias") == "v1"
+    assert refresher.last_refreshed_at == refreshed_at
+
+    inner.failing = set()
+    assert refresher.refresh_once()["Vendas Diárias"] is True
+    assert not refresher.stale and refresher.last_error is None
+
+
+def test_sync_sees_a_new_revision_behind_a_fresh_snapshot(tmp_path):
+    inner = VersionedDataSource()
+    snapshot = SnapshotDataSource(inner, str(tmp_path), max_age=3600)
+    cache = CachedDataSource(snapshot)
+    refresher = BackgroundRefresher(cache, ["Custos"])
+    refresher.refresh_once()
+
+    inner.version = "v2"
+    inner.frames["Custos"] = pd.DataFrame({"qty": [5]})
+
+    assert refresher.refresh_once() == {"Custos": True}
+    assert cache.cached_version("Custos") == "v2"
+    assert cache.get_data("Custos").iloc[0]["qty"] == 5
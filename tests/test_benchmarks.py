@@ -0,0 +1,40 @@
+import pandas as pd
+
+from benchmarks.run import compare, time_call
+from benchmarks.synthetic import InMemoryDataSource, generate_workbook
+from src.domain.cost_analysis_service import CostAnalysisService
+
+
+def test_generate_workbook_is_deterministic_and_sized():
+    first = generate_workbook(500, seed=1)
+    second = generate_workbook(500, seed=1)
+
+    for name in ["Custos", "Vendas Diárias", "Faturamento"]:
+        assert len(first[name]) == 500
+        pd.testing.assert_frame_equal(first[name], second[name])
+    assert {"Cadastro Produtos", "Matéria Prima", "Resumo Diário", "Análise por Categoria"} <= set(first)
+
+
+def test_generated_sheets_are_typed_like_the_adapter_output():
+    frames = generate_workbook(200)
+
+    assert pd.api.types.is_datetime64_any_dtype(frames["Vendas Diárias"]["Data"])
+    assert isinstance(frames["Custos"]["recipe"].dtype, pd.CategoricalDtype)
+    assert frames["Custos"]["unit_price"].dtype == "float64"
+
+
+def test_cost_per_recipe_runs_on_synthetic_workbook():
+    source = InMemoryDataSource(generate_workbook(1_000))
+
+    costs = CostAnalysisService(source).calculate_cost_per_recipe("Custos")
+
+    assert len(costs) == source.frames["Custos"]["recipe"].nunique()
+    assert source.calls == 1
+
+
+def test_compare_pairs_timings_by_case_and_size():
+    before = {"results": [{"case": "a", "rows": 10, "best_s": 2.0}]}
+    after = {"results": [{"case": "a", "rows": 10, "best_s": 1.0}, {"case": "b", "rows": 10, "best_s": 1.0}]}
+
+    assert compare(after, before) == [{"case": "a", "rows": 10, "before_s": 2.0, "after_s": 1.0, "ratio": 0.5}]
+    assert time_call(lambda: None, repeat=2)["best_s"] >= 0
@@ -0,0 +1,123 @@
+import pandas as pd
+import pytest
+
+from src.infrastructure.cached_data_source import CachedDataSource
+from src.ports.data_source import DataSource, DataSourceError
+
+
+class CountingDataSource(DataSource):
+    def __init__(self, frames, version="v1"):
+        self.frames = frames
+        self.version = version
+        self.data_calls = 0
+        self.version_calls = 0
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        self.data_calls += 1
+        if sheet_name not in self.frames:
+            raise DataSourceError(f"unknown sheet {sheet_name}")
+        return self.frames[sheet_name]
+
+    def get_version(self, sheet_name: str):
+        self.version_calls += 1
+        return self.version
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_second_read_within_ttl_is_served_from_memory():
+    inner = CountingDataSource({"Custos": pd.DataFrame({"a": [1, 2]})})
+    cache = CachedDataSource(inner, ttl=60, clock=FakeClock())
+
+    first = cache.get_data("Custos")
+    second = cache.get_data("Custos")
+
+    assert second is first
+    assert inner.data_calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entry_with_unchanged_revision_is_revalidated_without_reading():
+    clock = FakeClock()
+    inner = CountingDataSource({"Custos": pd.DataFrame({"a": [1]})})
+    cache = CachedDataSource(inner, ttl=10, clock=clock)
+
+    cache.get_data("Custos")
+    clock.now = 11
+    cache.get_data("Custos")
+
+    assert inner.data_calls == 1
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_expired_entry_with_new_revision_is_read_again():
+    clock = FakeClock()
+    inner = CountingDataSource({"Custos": pd.DataFrame({"a": [1]})})
+    cache = CachedDataSource(inner, ttl=10, ttl_per_sheet={"Custos": 5}, clock=clock)
+
+    cache.get_data("Custos")
+    clock.now = 6
+    inner.version = "v2"
+    cache.get_data("Custos")
+
+    assert inner.data_calls == 2
+
+
+def test_lru_eviction_keeps_memory_under_budget():
+    frames = {name: pd.DataFrame({"a": range(1000)}) for name in ("A", "B", "C")}
+    size = int(frames["A"].memory_usage(deep=True).sum())
+    cache = CachedDataSource(CountingDataSource(frames), max_bytes=size * 2, clock=FakeClock())
+
+    cache.get_data("A")
+    cache.get_data("B")
+    cache.get_data("A")  # A becomes most recently used
+    cache.get_data("C")  # evicts B
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= size * 2
+
+
+def test_errors_from_inner_source_are_not_cached():
+    inner = CountingDataSource({})
+    cache = CachedDataSource(inner, clock=FakeClock())
+
+    with pytest.raises(DataSourceError):
+        cache.get_data("Missing")
+    assert cache.stats()["entries"] == 0
+
+
+def test_get_many_only_fetches_missing_sheets():
+    frames = {"A": pd.DataFrame({"a": [1]}), "B": pd.DataFrame({"b": [2]})}
+    inner = CountingDataSource(frames)
+    cache = CachedDataSource(inner, clock=FakeClock())
+
+    cache.get_data("A")
+    result = cache.get_many(["A", "B"])
+
+    assert list(result) == ["A", "B"]
+    assert inner.data_calls == 2  # "A" once via get_data, "B" once via get_many
+    assert cache.stats()["hits"] == 1
+
+
+def test_get_version_answers_from_fresh_entries_without_a_request():
+    clock = FakeClock()
+    inner = CountingDataSource({"Custos": pd.DataFrame({"a": [1]})})
+    cache = CachedDataSource(inner, ttl=10, clock=clock)
+    cache.get_data("Custos")
+    calls = inner.version_calls
+
+    assert cache.get_version("Custos") == "v1"
+    assert inner.version_calls == calls
+
+    inner.version = "v2"
+    clock.now = 11
+    assert cache.get_version("Custos") == "v2"
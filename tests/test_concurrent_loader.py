@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pandas as pd
+
+from src.infrastructure.concurrent_loader import ConcurrentLoader
+from src.ports.data_source import DataSource, DataSourceError
+
+
+class SlowDataSource(DataSource):
+    def __init__(self, delay: float, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.threads = set()
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        if sheet_name in self.failing:
+            raise DataSourceError(f"boom {sheet_name}")
+        if sheet_name == "Quebrada":
+            raise KeyError(sheet_name)
+        return pd.DataFrame({"sheet": [sheet_name]})
+
+
+def test_load_fetches_sheets_in_parallel():
+    source = SlowDataSource(delay=0.2)
+    loader = ConcurrentLoader(source, max_workers=4)
+
+    start = time.perf_counter()
+    result = loader.load(["A", "B", "C", "D"])
+    elapsed = time.perf_counter() - start
+    loader.shutdown()
+
+    assert list(result) == ["A", "B", "C", "D"]
+    assert all(df.iloc[0]["sheet"] == name for name, df in result.items())
+    assert elapsed < 0.6
+    assert len(source.threads) > 1
+
+
+def test_errors_are_returned_per_sheet_as_data_source_error():
+    loader = ConcurrentLoader(SlowDataSource(delay=0, failing={"B"}), max_workers=2)
+
+    result = loader.load(["A", "B", "Quebrada"])
+    loader.shutdown()
+
+    assert isinstance(result["A"], pd.DataFrame)
+    assert isinstance(result["B"], DataSourceError)
+    assert isinstance(result["Quebrada"], DataSourceError)
@@ -1,8 +1,10 @@
 import pandas as pd
+import pytest
 from decimal import Decimal
 
-from src.domain.cost_analysis_service import CostAnalysisService
-from src.ports.data_source import DataSource
+from src.domain.cost_analysis_service import CostAnalysisService, RecipeCostTotals, cost_per_recipe
+from src.infrastructure.sheet_diff import diff_frames
+from src.ports.data_source import DataSource, DataSourceError
 
 
 class FakeDataSource(DataSource):
@@ -49,3 +51,186 @@ def test_calculate_cost_per_recipe_missing_columns_raises_value_error():
         assert False, "Expected ValueError due to missing columns"
     except ValueError as e:
         assert "missing required column" in str(e)
+
+
+def test_load_sheets_without_loader_returns_errors_per_sheet():
+    class PartialDataSource(DataSource):
+        def get_data(self, sheet_name: str) -> pd.DataFrame:
+            if sheet_name == "Faturamento":
+                raise DataSourceError("API indisponível")
+            return pd.DataFrame([{"recipe": "Brigadeiro"}])
+
+    service = CostAnalysisService(PartialDataSource())
+
+    result = service.load_sheets(["Custos", "Faturamento"])
+
+    assert not result["Custos"].empty
+    assert isinstance(result["Faturamento"], DataSourceError)
+
+
+def test_calculate_cost_per_recipe_is_exact_for_decimal_fractions():
+    df = pd.DataFrame({
+        "recipe": ["Bolo"] * 10 + [None],
+        "qty": [0.1] * 10 + [5],
+        "unit_price": [0.2] * 10 + [1],
+    })
+    service = CostAnalysisService(FakeDataSource(df))
+
+    result = service.calculate_cost_per_recipe("Custos")
+
+    assert result == {"Bolo": Decimal("0.2")}
+
+
+def test_float_and_text_cells_give_the_same_cost():
+    as_text = pd.DataFrame({"recipe": ["Bolo", "Bolo"], "qty": ["3.335", "2"], "unit_price": ["1.5", "0.1"]})
+    as_numbers = pd.DataFrame({"recipe": ["Bolo", "Bolo"], "qty": [3.335, 2], "unit_price": [1.5, 0.1]})
+
+    expected = Decimal("3.335") * Decimal("1.5") + Decimal("2") * Decimal("0.1")
+    assert cost_per_recipe(as_text) == cost_per_recipe(as_numbers) == {"Bolo": expected}
+
+
+def test_calculate_cost_per_recipe_accepts_numeric_text():
+    df = pd.DataFrame([
+        {"recipe": "Brigadeiro", "qty": "2", "unit_price": "3.50"},
+        {"recipe": "Brigadeiro", "qty": 1, "unit_price": "-0.25"},
+    ])
+    service = CostAnalysisService(FakeDataSource(df))
+
+    result = service.calculate_cost_per_recipe("Custos")
+
+    assert result["Brigadeiro"] == Decimal("6.75")
+
+
+def test_calculate_cost_per_recipe_invalid_number_raises_value_error():
+    df = pd.DataFrame([
+        {"recipe": "Brigadeiro", "qty": 2, "unit_price": 3.5},
+        {"recipe": "Beijinho", "qty": "1,5", "unit_price": 2.0},
+    ])
+    service = CostAnalysisService(FakeDataSource(df))
+
+    with pytest.raises(ValueError, match="Beijinho"):
+        service.calculate_cost_per_recipe("Custos")
+
+
+def test_simulate_price_changes_reports_only_affected_recipes():
+    df = pd.DataFrame([
+        {"recipe": "Brigadeiro", "ingredient": "Leite Condensado", "qty": 2, "unit_price": 5.0},
+        {"recipe": "Brigadeiro", "ingredient": "Chocolate", "qty": 1, "unit_price": 3.0},
+        {"recipe": "Beijinho", "ingredient": "Coco", "qty": 1, "unit_price": 2.0},
+    ])
+    service = CostAnalysisService(FakeDataSource(df))
+
+    result = service.simulate_price_changes(changes={"leite condensado": 0.12}, prices={"Chocolate": 4})
+
+    assert result["recipe"].tolist() == ["Brigadeiro"]
+    row = result.iloc[0]
+    assert row["cost_before"] == Decimal("13")
+    assert row["cost_after"] == Decimal("15.2")  # 2 * 5.60 + 1 * 4
+    assert row["delta"] == Decimal("2.2")
+    # The sheet-based costs are left untouched
+    assert service.calculate_nested_cost_per_recipe()["Brigadeiro"] == Decimal("13")
+
+
+def test_simulate_price_changes_unknown_ingredient_raises_key_error():
+    df = pd.DataFrame([{"recipe": "Beijinho", "ingredient": "Coco", "qty": 1, "unit_price": 2.0}])
+
+    with pytest.raises(KeyError):
+        CostAnalysisService(FakeDataSource(df)).simulate_price_changes(changes={"Leite": 0.1})
+
+
+class VersionedDataSource(DataSource):
+    def __init__(self, df: pd.DataFrame, version="v1"):
+        self.df = df
+        self.version = version
+        self.reads = 0
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        self.reads += 1
+        return self.df
+
+    def get_version(self, sheet_name: str):
+        return self.version
+
+
+def recipes_frame():
+    return pd.DataFrame([
+        {"recipe": "Brigadeiro", "ingredient": "Chocolate", "qty": 2, "unit_price": 3.5},
+        {"recipe": "Brigadeiro", "ingredient": "Leite Condensado", "qty": 1, "unit_price": 4.0},
+        {"recipe": "Beijinho", "ingredient": "Coco", "qty": 1.5, "unit_price": 2.0},
+        {"recipe": "Bolo", "ingredient": "Farinha", "qty": 3, "unit_price": 1.2},
+    ])
+
+
+def test_recipe_cost_totals_apply_only_the_changed_rows():
+    source = VersionedDataSource(recipes_frame())
+    diffs = []
+
+    def differ(old, new, key_columns):
+        diffs.append(diff_frames(old, new, key_columns))
+        return diffs[-1]
+
+    service = CostAnalysisService(source, differ=differ)
+    assert service.recipe_cost_totals() == cost_per_recipe(recipes_frame())
+    service.recipe_cost_totals()
+    assert source.reads == 1  # same version: the totals are kept
+
+    edited = recipes_frame().drop(index=3)
+    edited.loc[0, "unit_price"] = 4.0
+    edited.loc[4] = {"recipe": "Beijinho", "ingredient": "Leite", "qty": 0.5, "unit_price": 6.0}
+    source.df, source.version = edited, "v2"
+
+    result = service.recipe_cost_totals()
+
+    assert [d.counts() for d in diffs] == [{"inserted": 1, "updated": 1, "deleted": 1}]
+    assert result == cost_per_recipe(edited)
+    assert "Bolo" not in result
+    assert result["Brigadeiro"] == Decimal("12")
+    assert result["Beijinho"] == Decimal("6")
+
+
+def test_recipe_cost_totals_recompute_without_differ_or_on_new_columns():
+    source = VersionedDataSource(recipes_frame())
+    service = CostAnalysisService(source, differ=diff_frames)
+    service.recipe_cost_totals()
+
+    source.df, source.version = recipes_frame().assign(rendimento=1), "v2"
+    assert service.recipe_cost_totals() == cost_per_recipe(recipes_frame())
+
+    plain = CostAnalysisService(VersionedDataSource(recipes_frame()))
+    assert plain.recipe_cost_totals() == cost_per_recipe(recipes_frame())
+
+
+def test_recipe_cost_totals_leave_out_sub_recipe_rows_and_rebuild_when_recipes_change():
+    df = pd.DataFrame({
+        "recipe": ["Ganache", "Ganache", "Bolo Trufado", "Bolo Trufado"],
+        "ingredient": ["Chocolate", "Creme de Leite", "Farinha", "ganache "],
+        "qty": [2, 1, 3, 0.5],
+        "unit_price": [10.0, 4.0, 2.0, None],
+    })
+    source = VersionedDataSource(df)
+    service = CostAnalysisService(source, differ=diff_frames)
+
+    assert service.recipe_cost_totals() == {"Ganache": Decimal("24"), "Bolo Trufado": Decimal("6")}
+
+    edited = df.copy()
+    edited.loc[0, "unit_price"] = 12.0
+    source.df, source.version = edited, "v2"
+    assert service.recipe_cost_totals()["Ganache"] == Decimal("28")
+    assert service._totals["Custos"][2].incremental_updates == 1
+
+    # Removing the Ganache recipe turns the "ganache" row into a raw ingredient
+    source.df, source.version = edited.iloc[2:].fillna({"unit_price": 3.0}), "v3"
+    assert service.recipe_cost_totals() == {"Bolo Trufado": Decimal("7.5")}
+    assert service._totals["Custos"][2].incremental_updates == 0
+
+
+def test_recipe_cost_totals_invalid_delta_leaves_totals_untouched():
+    totals = RecipeCostTotals(recipes_frame())
+    bad = recipes_frame().astype({"qty": object})
+    bad.loc[0, "qty"] = "dois"
+
+    with pytest.raises(ValueError, match="Brigadeiro"):
+        totals.apply(diff_frames(recipes_frame(), bad, ["recipe", "ingredient"]))
+
+    assert totals.to_dict() == cost_per_recipe(recipes_frame())
+    assert totals.incremental_updates == 0
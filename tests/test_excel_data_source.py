@@ -0,0 +1,66 @@
+import os
+
+import openpyxl
+import pytest
+
+from src.infrastructure.excel_data_source import ExcelDataSource
+from src.ports.data_source import DataSourceError
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _write_workbook(path, sheets):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        worksheet = workbook.create_sheet(title)
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(path)
+
+
+def test_reads_requested_sheet_with_header_row(tmp_path):
+    path = tmp_path / "custos.xlsx"
+    _write_workbook(path, {
+        "Custos": [["recipe", "qty", "unit_price"], ["Brigadeiro", 2, 3.5], ["Beijinho", 1.5, None]],
+        "Outra": [["a"], [1]],
+    })
+
+    df = ExcelDataSource(str(path)).get_data("Custos")
+
+    assert list(df.columns) == ["recipe", "qty", "unit_price"]
+    assert df.iloc[0]["qty"] == 2
+    assert df["unit_price"].isna().iloc[1]
+
+
+def test_parsed_frames_are_cached_until_file_changes(tmp_path):
+    path = tmp_path / "custos.xlsx"
+    _write_workbook(path, {"Custos": [["recipe"], ["Brigadeiro"]]})
+    source = ExcelDataSource(str(path))
+
+    first = source.get_data("Custos")
+    assert source.get_data("Custos") is first
+
+    _write_workbook(path, {"Custos": [["recipe"], ["Beijinho"]]})
+    os.utime(path, (os.path.getmtime(path) + 10, os.path.getmtime(path) + 10))
+
+    assert source.get_data("Custos").iloc[0]["recipe"] == "Beijinho"
+
+
+def test_missing_sheet_or_file_raises_data_source_error(tmp_path):
+    path = tmp_path / "custos.xlsx"
+    _write_workbook(path, {"Custos": [["recipe"]]})
+
+    with pytest.raises(DataSourceError):
+        ExcelDataSource(str(path)).get_data("Inexistente")
+    with pytest.raises(DataSourceError):
+        ExcelDataSource(str(tmp_path / "nao_existe.xlsx")).get_data("Custos")
+
+
+def test_reads_shipped_recipes_workbook():
+    source = ExcelDataSource(os.path.join(PROJECT_ROOT, "RECEITAS AWI.xlsx"))
+
+    df = source.get_data(source.sheet_names()[0])
+
+    assert "INGREDIENTES" in df.columns
+    assert len(df) > 0
@@ -0,0 +1,88 @@
+import gzip
+import io
+import threading
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from src.infrastructure.exporter import ExportCache, export_bytes, iter_csv
+
+DF = pd.DataFrame({
+    "Produto": pd.Categorical(["Brigadeiro", "Beijinho", "Brigadeiro"]),
+    "Data": pd.to_datetime(["2024-03-01", "2024-03-02", None]),
+    "Valor": [10.5, None, 3.0],
+})
+
+
+def test_chunked_csv_matches_to_csv():
+    chunks = list(iter_csv(DF, chunk_rows=2))
+
+    assert len(chunks) == 3  # header + 2 chunks
+    assert b"".join(chunks).decode("utf-8") == DF.to_csv(index=False)
+
+
+def test_gzip_csv_and_parquet_round_trip():
+    assert gzip.decompress(export_bytes(DF, "csv.gz", chunk_rows=1)).decode("utf-8") == DF.to_csv(index=False)
+
+    restored = pd.read_parquet(io.BytesIO(export_bytes(DF, "parquet")))
+    pd.testing.assert_frame_equal(restored, DF)
+
+
+def test_xlsx_holds_several_sheets_with_valid_titles():
+    data = export_bytes({"Vendas": DF, "Custos/Receita": DF.head(1), "vendas": DF.iloc[:0]}, "xlsx", chunk_rows=2)
+
+    workbook = openpyxl.load_workbook(io.BytesIO(data))
+    assert workbook.sheetnames == ["Vendas", "Custos Receita", "vendas 2"]
+    rows = list(workbook["Vendas"].values)
+    assert rows[0] == ("Produto", "Data", "Valor")
+    assert rows[2][2] is None and rows[3][1] is None  # missing values become empty cells
+    assert len(list(workbook["vendas 2"].values)) == 1
+
+
+def test_single_sheet_formats_reject_several_frames():
+    with pytest.raises(ValueError):
+        export_bytes({"a": DF, "b": DF}, "csv")
+    with pytest.raises(ValueError):
+        export_bytes(DF, "pdf")
+
+
+def test_cache_builds_once_per_key_and_evicts_by_size():
+    cache = ExportCache(max_bytes=10)
+    builds = []
+
+    def build(data):
+        builds.append(data)
+        return data
+
+    assert cache.get(("csv", "v1"), lambda: build(b"12345")) == b"12345"
+    assert cache.get(("csv", "v1"), lambda: build(b"other")) == b"12345"
+    cache.get(("csv", "v2"), lambda: build(b"678901"))
+    cache.get(None, lambda: build(b"x"))
+
+    assert builds == [b"12345", b"678901", b"x"]
+    assert cache.stats()["entries"] == 1 and cache.evictions == 1
+
+
+def test_concurrent_requests_share_one_build():
+    cache = ExportCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_build():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return b"data"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("k", slow_build))) for _ in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [b"data"] * 3 and len(calls) == 1
@@ -0,0 +1,187 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.cached_data_source import CachedDataSource
+from src.infrastructure.federated_data_source import FederatedDataSource
+from src.ports.data_source import DataSource, DataSourceError
+
+
+class StoreDataSource(DataSource):
+    def __init__(self, frames, delay=0.0, failing=(), version="v1"):
+        self.frames = frames
+        self.delay = delay
+        self.failing = set(failing)
+        self.version = version
+        self.reads = []
+        self.batches = []
+        self.threads = set()
+        self.appended = []
+
+    def get_data(self, sheet_name):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        self.reads.append(sheet_name)
+        if sheet_name in self.failing or "*" in self.failing:
+            raise DataSourceError(f"boom {sheet_name}")
+        return self.frames[sheet_name]
+
+    def get_many(self, sheet_names):
+        self.batches.append(list(sheet_names))
+        if self.failing:
+            raise DataSourceError("batch failed")
+        time.sleep(self.delay)
+        return {name: self.frames[name] for name in sheet_names}
+
+    def get_version(self, sheet_name):
+        return self.version
+
+    def append_rows(self, sheet_name, rows):
+        self.appended.append((sheet_name, list(rows)))
+
+
+class ReadOnlyDataSource(DataSource):
+    def get_data(self, sheet_name):
+        return pd.DataFrame()
+
+
+def vendas(produtos, valores):
+    return pd.DataFrame({"Produto": pd.Categorical(produtos), "Valor": valores})
+
+
+def test_get_data_stacks_stores_with_store_column():
+    federated = FederatedDataSource({
+        "Centro": StoreDataSource({"Vendas": vendas(["Brigadeiro", "Bolo"], [10.0, 20.0])}),
+        "Shopping": StoreDataSource({"Vendas": vendas(["Brownie"], [5.0])}),
+    })
+
+    df = federated.get_data("Vendas")
+
+    assert list(df.columns) == ["loja", "Produto", "Valor"]
+    assert list(df["loja"]) == ["Centro", "Centro", "Shopping"]
+    assert list(df["loja"].cat.categories) == ["Centro", "Shopping"]
+    assert isinstance(df["Produto"].dtype, pd.CategoricalDtype)
+    assert set(df["Produto"].cat.categories) == {"Brigadeiro", "Bolo", "Brownie"}
+    assert df["Valor"].sum() == 35.0
+
+
+def test_stores_are_read_in_parallel():
+    stores = {f"Loja {i}": StoreDataSource({"Vendas": vendas(["A"], [1.0])}, delay=0.2) for i in range(4)}
+    federated = FederatedDataSource(stores)
+
+    start = time.perf_counter()
+    federated.get_many(["Vendas"])
+    elapsed = time.perf_counter() - start
+    federated.shutdown()
+
+    assert elapsed < 0.6
+    assert all(store.batches == [["Vendas"]] for store in stores.values())
+
+
+def test_partial_failure_returns_other_stores_and_has_no_version():
+    centro = StoreDataSource({"Vendas": vendas(["A"], [1.0])})
+    shopping = StoreDataSource({}, failing={"*"})
+    federated = FederatedDataSource({"Centro": centro, "Shopping": shopping})
+
+    df = federated.get_data("Vendas")
+
+    assert list(df["loja"]) == ["Centro"]
+    assert "Shopping" in federated.failures["Vendas"]
+    assert federated.get_version("Vendas") is None
+
+    shopping.failing.clear()
+    shopping.frames = {"Vendas": vendas(["B"], [2.0])}
+    assert list(federated.get_data("Vendas")["loja"]) == ["Centro", "Shopping"]
+    assert federated.failures == {}
+    assert federated.get_version("Vendas") == "Centro=v1;Shopping=v1"
+
+
+def test_errors_when_every_store_fails_or_partial_is_not_allowed():
+    stores = {"Centro": StoreDataSource({"Vendas": vendas(["A"], [1.0])}), "Shopping": StoreDataSource({}, failing={"*"})}
+
+    with pytest.raises(DataSourceError, match="Shopping"):
+        FederatedDataSource(stores, allow_partial=False).get_data("Vendas")
+    with pytest.raises(DataSourceError):
+        FederatedDataSource({"Shopping": stores["Shopping"]}).get_data("Vendas")
+
+
+def test_failed_batch_falls_back_to_sheet_by_sheet_reads():
+    shopping = StoreDataSource({"Vendas": vendas(["B"], [2.0])}, failing={"Resumo"})
+    federated = FederatedDataSource({
+        "Centro": StoreDataSource({"Vendas": vendas(["A"], [1.0]), "Resumo": pd.DataFrame({"x": [1]})}),
+        "Shopping": shopping,
+    })
+
+    frames = federated.get_many(["Vendas", "Resumo"])
+
+    assert list(frames["Vendas"]["loja"]) == ["Centro", "Shopping"]
+    assert list(frames["Resumo"]["loja"]) == ["Centro"]
+    assert shopping.reads == ["Vendas", "Resumo"]
+    assert list(federated.failures) == ["Resumo"]
+
+
+def test_shared_sheets_come_from_the_first_store_only():
+    custos = pd.DataFrame({"Receita": ["Bolo"], "Custo": [12.0]})
+    centro = StoreDataSource({"Custos": custos})
+    shopping = StoreDataSource({"Custos": custos})
+    federated = FederatedDataSource({"Centro": centro, "Shopping": shopping}, shared=["Custos"])
+
+    assert federated.get_data("Custos") is custos
+    assert federated.get_many(["Custos"])["Custos"] is custos
+    assert shopping.reads == [] and shopping.batches == []
+
+
+def test_per_store_cache_only_rereads_the_store_that_changed():
+    centro = StoreDataSource({"Vendas": vendas(["A"], [1.0])})
+    shopping = StoreDataSource({"Vendas": vendas(["B"], [2.0])})
+    federated = FederatedDataSource({
+        "Centro": CachedDataSource(centro, ttl=0),
+        "Shopping": CachedDataSource(shopping, ttl=0),
+    })
+    federated.get_data("Vendas")
+
+    shopping.version = "v2"
+    shopping.frames = {"Vendas": vendas(["B", "C"], [2.0, 3.0])}
+    df = federated.get_data("Vendas")
+
+    assert len(df) == 3
+    assert centro.reads == ["Vendas"]
+    assert shopping.reads == ["Vendas", "Vendas"]
+
+
+def test_append_rows_routes_each_row_to_its_store():
+    centro, shopping = StoreDataSource({}), StoreDataSource({})
+    federated = FederatedDataSource({"Centro": centro, "Shopping": shopping}, shared=["Custos"])
+
+    federated.append_rows("Vendas", [{"loja": "Shopping", "Valor": 5}, {"loja": "Centro", "Valor": 7}])
+    federated.append_rows("Custos", [["Bolo", "Leite", 1, 5.5]])
+
+    assert centro.appended == [("Vendas", [{"Valor": 7}]), ("Custos", [["Bolo", "Leite", 1, 5.5]])]
+    assert shopping.appended == [("Vendas", [{"Valor": 5}])]
+    with pytest.raises(DataSourceError, match="loja"):
+        federated.append_rows("Vendas", [{"loja": "Praia", "Valor": 1}])
+
+
+def test_sources_without_writes_are_read_only():
+    with pytest.raises(DataSourceError, match="read-only"):
+        CachedDataSource(FederatedDataSource({"Centro": ReadOnlyDataSource()})).append_rows("Vendas", [{"loja": "Centro"}])
+
+
+def test_sync_runs_on_every_store_and_names_the_failures():
+    class SyncingStore(StoreDataSource):
+        def sync(self, sheet_name):
+            self.reads.append(f"sync {sheet_name}")
+            if self.failing:
+                raise DataSourceError("offline")
+
+    centro, shopping = SyncingStore({}), SyncingStore({}, failing={"*"})
+    federated = FederatedDataSource({"Centro": centro, "Shopping": shopping}, shared=["Custos"])
+
+    with pytest.raises(DataSourceError, match="Shopping"):
+        federated.sync("Vendas")
+    federated.sync("Custos")
+
+    assert centro.reads == ["sync Vendas", "sync Custos"]
+    assert shopping.reads == ["sync Vendas"]
@@ -29,3 +29,184 @@ def test_get_data_returns_dataframe():
     assert df.iloc[0]["col1"] == "val1"
     mock_gspread_client.open_by_key.assert_called_with("dummy_id")
     mock_sheet.worksheet.assert_called_with("Sheet1")
+
+
+def test_get_version_returns_spreadsheet_last_update_time():
+    mock_gspread_client = MagicMock()
+    mock_sheet = MagicMock()
+    mock_sheet.get_lastUpdateTime.return_value = "2024-05-01T10:00:00.000Z"
+    mock_gspread_client.open_by_key.return_value = mock_sheet
+
+    adapter = GoogleSheetsAdapter(credential_file="dummy.json", sheet_id="dummy_id")
+    adapter.client = mock_gspread_client
+
+    assert adapter.get_version("Sheet1") == "2024-05-01T10:00:00.000Z"
+
+
+def test_get_many_uses_single_batch_request():
+    mock_gspread_client = MagicMock()
+    mock_sheet = MagicMock()
+    mock_sheet.values_batch_get.return_value = {
+        "valueRanges": [
+            {"range": "'Custos'!A1:B3", "values": [["recipe", "qty"], ["Brigadeiro", "2"], ["Beijinho"]]},
+            {"range": "'Vazia'!A1:Z1000"},
+        ]
+    }
+    mock_gspread_client.open_by_key.return_value = mock_sheet
+
+    adapter = GoogleSheetsAdapter(credential_file="dummy.json", sheet_id="dummy_id")
+    adapter.client = mock_gspread_client
+
+    frames = adapter.get_many(["Custos", "Vazia"])
+
+    mock_sheet.values_batch_get.assert_called_once_with(["'Custos'", "'Vazia'"])
+    assert list(frames["Custos"].columns) == ["recipe", "qty"]
+    assert frames["Custos"].iloc[0]["qty"] == 2
+    assert frames["Custos"].iloc[1]["qty"] == ""
+    assert frames["Vazia"].empty
+
+
+def test_spreadsheet_and_worksheet_metadata_are_reused_between_reads():
+    mock_gspread_client = MagicMock()
+    mock_sheet = MagicMock()
+    mock_worksheet = MagicMock()
+    mock_worksheet.id = 42
+    mock_worksheet.get_all_records.return_value = [{"col1": "val1"}]
+    mock_sheet.worksheet.return_value = mock_worksheet
+    mock_gspread_client.open_by_key.return_value = mock_sheet
+
+    adapter = GoogleSheetsAdapter(credential_file="dummy.json", sheet_id="dummy_id")
+    adapter.client = mock_gspread_client
+
+    adapter.get_data("Sheet1")
+    adapter.get_data("Sheet1")
+
+    assert mock_gspread_client.open_by_key.call_count == 1
+    assert mock_sheet.worksheet.call_count == 1
+    assert mock_worksheet.get_all_records.call_count == 2
+    assert adapter.worksheet_ids == {"Sheet1": 42}
+
+
+def test_missing_worksheet_is_resolved_again_on_next_read():
+    import gspread
+    from src.ports.data_source import DataSourceError
+
+    mock_gspread_client = MagicMock()
+    mock_sheet = MagicMock()
+    mock_worksheet = MagicMock()
+    mock_worksheet.get_all_records.return_value = [{"col1": "val1"}]
+    mock_sheet.worksheet.side_effect = [gspread.exceptions.WorksheetNotFound("Sheet1"), mock_worksheet]
+    mock_gspread_client.open_by_key.return_value = mock_sheet
+
+    adapter = GoogleSheetsAdapter(credential_file="dummy.json", sheet_id="dummy_id")
+    adapter.client = mock_gspread_client
+
+    with pytest.raises(DataSourceError):
+        adapter.get_data("Sheet1")
+    df = adapter.get_data("Sheet1")
+
+    assert df.iloc[0]["col1"] == "val1"
+    assert mock_sheet.worksheet.call_count == 2
+
+
+def test_schema_is_applied_at_ingest():
+    from src.infrastructure.sheet_schemas import SHEET_SCHEMAS
+
+    mock_gspread_client = MagicMock()
+    mock_sheet = MagicMock()
+    mock_worksheet = MagicMock()
+    mock_worksheet.get_all_records.return_value = [
+        {"Data": "01/03/2024", "Valor": "R$ 12,50"},
+        {"Data": "02/03/2024", "Valor": 8},
+    ]
+    mock_sheet.worksheet.return_value = mock_worksheet
+    mock_gspread_client.open_by_key.return_value = mock_sheet
+
+    adapter = GoogleSheetsAdapter(credential_file="dummy.json", sheet_id="dummy_id", schemas=SHEET_SCHEMAS)
+    adapter.client = mock_gspread_client
+
+    df = adapter.get_data("Vendas Diárias")
+
+    assert df["Valor"].sum() == 20.5
+    assert pd.api.types.is_datetime64_any_dtype(df["Data"])
+    assert "Vendas Diárias" in adapter.ingest_reports
+
+
+def _api_error(status):
+    import gspread
+
+    response = MagicMock()
+    response.status_code = status
+    response.json.return_value = {"error": {"code": status, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}
+    return gspread.exceptions.APIError(response)
+
+
+def test_quota_errors_are_retried_with_backoff():
+    from src.infrastructure.throttling import Backoff
+
+    mock_gspread_client = MagicMock()
+    mock_sheet = MagicMock()
+    mock_worksheet = MagicMock()
+    mock_worksheet.get_all_records.side_effect = [_api_error(429), _api_error(503), [{"col1": "val1"}]]
+    mock_sheet.worksheet.return_value = mock_worksheet
+    mock_gspread_client.open_by_key.return_value = mock_sheet
+
+    adapter = GoogleSheetsAdapter(sheet_id="dummy_id", backoff=Backoff(sleep=lambda _: None))
+    adapter.client = mock_gspread_client
+
+    df = adapter.get_data("Sheet1")
+
+    assert df.iloc[0]["col1"] == "val1"
+    stats = adapter.throttle_stats()
+    assert stats["retries"] == 2
+    assert stats["rate_limited_responses"] == 1
+
+
+def test_exhausted_quota_retries_raise_quota_exceeded_error():
+    from src.infrastructure.throttling import Backoff
+    from src.ports.data_source import QuotaExceededError
+
+    mock_gspread_client = MagicMock()
+    mock_sheet = MagicMock()
+    mock_worksheet = MagicMock()
+    mock_worksheet.get_all_records.side_effect = _api_error(429)
+    mock_sheet.worksheet.return_value = mock_worksheet
+    mock_gspread_client.open_by_key.return_value = mock_sheet
+
+    adapter = GoogleSheetsAdapter(sheet_id="dummy_id", backoff=Backoff(max_retries=2, sleep=lambda _: None))
+    adapter.client = mock_gspread_client
+
+    with pytest.raises(QuotaExceededError):
+        adapter.get_data("Sheet1")
+    assert mock_worksheet.get_all_records.call_count == 3
+
+
+def test_slow_spreadsheet_open_does_not_hold_the_metadata_lock():
+    import threading
+
+    opening, release = threading.Event(), threading.Event()
+    mock_gspread_client = MagicMock()
+
+    def slow_open(sheet_id):
+        opening.set()
+        release.wait(5)  # e.g. waiting on the quota or a backoff sleep
+        return MagicMock()
+
+    mock_gspread_client.open_by_key.side_effect = slow_open
+    adapter = GoogleSheetsAdapter(credential_file="dummy.json", sheet_id="dummy_id")
+    adapter.client = mock_gspread_client
+
+    handles = []
+    threads = [threading.Thread(target=lambda: handles.append(adapter.spreadsheet)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert opening.wait(5)
+
+    # Other metadata stays available while the open is in flight
+    assert adapter.worksheet_ids == {}
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert mock_gspread_client.open_by_key.call_count == 1
+    assert len(handles) == 3 and all(handle is handles[0] for handle in handles)
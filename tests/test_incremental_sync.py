@@ -0,0 +1,104 @@
+import pandas as pd
+
+from src.infrastructure.google_sheets_adapter import GoogleSheetsAdapter
+from src.infrastructure.incremental_sync import IncrementalSyncDataSource
+from src.infrastructure.sheet_schemas import SHEET_SCHEMAS
+
+
+class FakeSheetsAdapter(GoogleSheetsAdapter):
+    """Serves raw rows from memory; `build_frame` is the real adapter's."""
+
+    def __init__(self, values):
+        super().__init__(credential_file="dummy.json", sheet_id="dummy_id", schemas=SHEET_SCHEMAS)
+        self.values = values
+        self.requested_from = []
+
+    def get_rows(self, sheet_name, start_row, width):
+        self.requested_from.append(start_row)
+        return list(self.values[0]), [list(row) for row in self.values[start_row - 1:]]
+
+    def get_data(self, sheet_name):
+        return pd.DataFrame({"passthrough": [sheet_name]})
+
+
+def _sales(n):
+    return [["Data", "Produto", "Valor"]] + [[f"0{i % 9 + 1}/01/2024", "Brigadeiro", f"{i}.50"] for i in range(n)]
+
+
+def test_appended_rows_are_fetched_from_the_watermark():
+    inner = FakeSheetsAdapter(_sales(10))
+    source = IncrementalSyncDataSource(inner, ["Vendas Diárias"], overlap=3)
+
+    assert len(source.get_data("Vendas Diárias")) == 10
+    inner.values += [["10/01/2024", "Beijinho", "99.00"], ["11/01/2024", "Brigadeiro", "1.25"]]
+    df = source.get_data("Vendas Diárias")
+
+    assert inner.requested_from == [2, 2 + 10 - 3]
+    assert len(df) == 12
+    assert df["Valor"].iloc[-2:].tolist() == [99.0, 1.25]
+    assert pd.api.types.is_datetime64_any_dtype(df["Data"])
+    assert source.sync_stats() == {"full_syncs": 1, "incremental_syncs": 1, "rows_appended": 2}
+
+
+def test_incremental_result_matches_a_full_read():
+    inner = FakeSheetsAdapter(_sales(6))
+    source = IncrementalSyncDataSource(inner, ["Vendas Diárias"], overlap=2)
+    source.get_data("Vendas Diárias")
+    inner.values += _sales(8)[1:]
+
+    incremental = source.get_data("Vendas Diárias")
+    full = inner.build_frame("Vendas Diárias", inner.values[0], inner.values[1:])
+
+    pd.testing.assert_frame_equal(incremental, full, check_categorical=False)
+    assert isinstance(incremental["Produto"].dtype, pd.CategoricalDtype)
+
+
+def test_edit_inside_overlap_triggers_full_reload():
+    inner = FakeSheetsAdapter(_sales(5))
+    source = IncrementalSyncDataSource(inner, ["Vendas Diárias"], overlap=2)
+    source.get_data("Vendas Diárias")
+
+    inner.values[-1][2] = "1000.00"
+    df = source.get_data("Vendas Diárias")
+
+    assert df["Valor"].iloc[-1] == 1000.0
+    assert source.sync_stats()["full_syncs"] == 2
+
+
+def test_edit_above_the_overlap_is_fixed_by_the_periodic_full_sync():
+    now = [0.0]
+    inner = FakeSheetsAdapter(_sales(10))
+    source = IncrementalSyncDataSource(
+        inner, ["Vendas Diárias"], overlap=2, full_sync_every=3, full_sync_interval=60, clock=lambda: now[0]
+    )
+    source.get_data("Vendas Diárias")
+
+    inner.values[1][2] = "500.00"  # first sale, far above the overlap window
+    for _ in range(3):
+        assert source.get_data("Vendas Diárias")["Valor"].iloc[0] == 0.5
+    assert source.get_data("Vendas Diárias")["Valor"].iloc[0] == 500.0
+    assert source.sync_stats()["full_syncs"] == 2
+
+    inner.values[1][2] = "7.00"
+    now[0] = 60.0
+    assert source.get_data("Vendas Diárias")["Valor"].iloc[0] == 7.0
+    assert source.sync_stats()["full_syncs"] == 3
+
+
+def test_deleted_rows_trigger_full_reload():
+    inner = FakeSheetsAdapter(_sales(5))
+    source = IncrementalSyncDataSource(inner, ["Vendas Diárias"], overlap=2)
+    source.get_data("Vendas Diárias")
+
+    del inner.values[-2:]
+
+    assert len(source.get_data("Vendas Diárias")) == 3
+    assert source.sync_stats()["full_syncs"] == 2
+
+
+def test_other_sheets_are_passed_through():
+    inner = FakeSheetsAdapter(_sales(1))
+    source = IncrementalSyncDataSource(inner, ["Vendas Diárias"])
+
+    assert source.get_data("Custos")["passthrough"].iloc[0] == "Custos"
+    assert inner.requested_from == []
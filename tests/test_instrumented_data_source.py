@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from src.infrastructure.cached_data_source import CachedDataSource
+from src.infrastructure.concurrent_loader import ConcurrentLoader
+from src.infrastructure.instrumented_data_source import InstrumentedDataSource, page_label
+from src.ports.data_source import DataSource, DataSourceError
+
+
+class FakeDataSource(DataSource):
+    def __init__(self):
+        self.frames = {"Custos": pd.DataFrame({"qty": [1, 2, 3]}), "Vendas Diárias": pd.DataFrame({"valor": [10]})}
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        if sheet_name not in self.frames:
+            raise DataSourceError(f"missing {sheet_name}")
+        return self.frames[sheet_name]
+
+
+class StepClock:
+    """Each call advances 10 ms, so every read takes exactly 10 ms."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.01
+        return self.now
+
+
+def test_records_calls_rows_bytes_and_latency_per_sheet_and_page():
+    source = InstrumentedDataSource(FakeDataSource(), clock=StepClock())
+
+    with page_label("Dashboard"):
+        source.get_data("Custos")
+        source.get_data("Custos")
+    source.get_data("Vendas Diárias")
+
+    rows = {(r["sheet"], r["page"]): r for r in source.snapshot()}
+    custos = rows[("Custos", "Dashboard")]
+    assert custos["calls"] == 2
+    assert custos["rows"] == 6
+    assert custos["bytes"] > 0
+    assert custos["mean_s"] == pytest.approx(0.01)
+    assert 0.005 < custos["p50_s"] <= 0.01
+    assert rows[("Vendas Diárias", "-")]["calls"] == 1
+
+
+def test_errors_are_counted_and_reraised():
+    source = InstrumentedDataSource(FakeDataSource())
+
+    with pytest.raises(DataSourceError):
+        source.get_data("Nope")
+
+    assert source.snapshot()[0]["errors"] == 1
+
+
+def test_cache_hit_ratio_and_prometheus_output(tmp_path):
+    cache = CachedDataSource(FakeDataSource())
+    source = InstrumentedDataSource(cache)
+
+    with page_label('Página "A"'):
+        source.get_many(["Custos", "Vendas Diárias"])
+        source.get_data("Custos")
+
+    assert source.snapshot()[0]["cache_hit_ratio"] == 0.5
+    text = source.to_prometheus()
+    assert 'vava_datasource_calls_total{sheet="Custos",page="Página \\"A\\""} 2' in text
+    assert 'vava_datasource_latency_seconds_bucket{sheet="Custos",page="Página \\"A\\"",le="+Inf"} 2' in text
+    assert 'vava_cache_hit_ratio{sheet="Custos"} 0.5' in text
+
+    path = tmp_path / "metrics" / "vava.prom"
+    source.write_prometheus(str(path))
+    assert path.read_text(encoding="utf-8") == text
+
+
+def test_page_label_follows_reads_into_the_concurrent_loader():
+    source = InstrumentedDataSource(FakeDataSource())
+    loader = ConcurrentLoader(source, max_workers=2)
+
+    with page_label("Análise"):
+        loader.load(["Custos", "Vendas Diárias"])
+    loader.shutdown()
+
+    assert {r["page"] for r in source.snapshot()} == {"Análise"}
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from src.domain.margin_analysis import MarginAnalysisService, margins
+from src.ports.data_source import DataSource
+
+COSTS = pd.DataFrame({
+    "recipe": ["Brigadeiro", "Brigadeiro", "Beijinho"],
+    "qty": [2, 1, 1.5],
+    "unit_price": [0.5, 1.0, 1.0],
+})
+SALES = pd.DataFrame({
+    "Data": pd.to_datetime(["2024-01-05", "2024-01-20", "2024-02-01", "2024-02-03"]),
+    "Produto": ["Brigadeiro", "brigadeiro ", "Brigadeiro", "Bolo de Pote"],
+    "Quantidade": [10, 5, 4, 2],
+    "Valor": [30.0, 15.0, 12.0, 24.0],
+})
+
+
+class VersionedDataSource(DataSource):
+    def __init__(self, version="v1"):
+        self.frames = {"Custos": COSTS, "Faturamento": SALES}
+        self.version = version
+        self.reads = 0
+
+    def get_data(self, sheet_name):
+        self.reads += 1
+        return self.frames[sheet_name]
+
+    def get_version(self, sheet_name):
+        return self.version
+
+
+def test_monthly_margins_join_unit_cost_with_units_and_revenue():
+    result = margins(COSTS, SALES, period="M")
+    jan = result[(result["product"] == "Brigadeiro") & (result["period"] == "2024-01")].iloc[0]
+
+    # Brigadeiro costs 2 * 0.5 + 1 * 1.0 = 2.0 per unit; names match ignoring case/spaces
+    assert jan["units"] == 15
+    assert jan["unit_cost"] == 2.0
+    assert jan["cost"] == 30.0
+    assert jan["contribution"] == 15.0
+    assert jan["contribution_per_unit"] == 1.0
+    assert jan["gross_margin_pct"] == pytest.approx(1 / 3)
+
+
+def test_products_without_recipe_are_kept_without_cost():
+    result = margins(COSTS, SALES, period=None)
+
+    bolo = result[result["product"] == "Bolo de Pote"].iloc[0]
+    assert not bolo["has_cost"]
+    assert pd.isna(bolo["contribution"])
+    assert set(result["period"]) == {"Total"}
+
+
+def test_results_are_cached_by_both_sheet_versions():
+    source = VersionedDataSource()
+    service = MarginAnalysisService(source)
+
+    first = service.calculate_margins("M")
+    assert service.calculate_margins("M") is first
+    assert service.computations == 1
+
+    source.version = "v2"
+    service.calculate_margins("M")
+    assert service.computations == 2
+
+
+def test_summary_and_unknown_period():
+    service = MarginAnalysisService(VersionedDataSource(version=None))
+    summary = service.summary(service.calculate_margins(None))
+
+    assert summary["revenue"] == 57.0
+    assert summary["contribution"] == 57.0 - 19 * 2.0
+    assert summary["products_without_cost"] == 1
+    with pytest.raises(ValueError):
+        service.calculate_margins("X")
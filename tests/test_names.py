@@ -0,0 +1,16 @@
+import pandas as pd
+
+from src.domain.names import find_column, normalize_name
+
+
+def test_normalize_name_ignores_case_accents_and_spaces():
+    assert normalize_name("  Preço   Unitário ") == "preco unitario"
+    assert normalize_name("Ganache ") == normalize_name("ganache")
+
+
+def test_find_column_follows_candidate_order():
+    df = pd.DataFrame(columns=["Valor Total", "Data", "Valor"])
+
+    assert find_column(df, ("valor", "valor total")) == "Valor"
+    assert find_column(df, ("date", "data")) == "Data"
+    assert find_column(df, ("produto",)) is None
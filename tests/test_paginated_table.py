@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ui.paginated_table import TableQuery, query_table
+
+DF = pd.DataFrame({
+    "Produto": pd.Categorical(["Brigadeiro", "Beijinho", "Bolo de Pote", "Brownie", "Cajuzinho"]),
+    "Obs": ["tradicional", "coco", None, "meio amargo", "amendoim"],
+    "Valor": [3.0, 2.5, 12.0, np.nan, 2.0],
+})
+
+
+def test_only_the_requested_page_is_materialized():
+    view = query_table(DF, TableQuery(page=2, page_size=2))
+
+    assert view.page["Produto"].tolist() == ["Bolo de Pote", "Brownie"]
+    assert (view.first_row, view.last_row, view.page_count) == (3, 4, 3)
+
+
+def test_search_covers_category_and_text_columns_case_insensitively():
+    view = query_table(DF, TableQuery(search=" BRI ", page_size=10))
+    assert view.page["Produto"].tolist() == ["Brigadeiro"]
+
+    view = query_table(DF, TableQuery(search="amargo", page_size=10))
+    assert view.page["Produto"].tolist() == ["Brownie"]
+    assert (view.filtered_rows, view.total_rows) == (1, 5)
+
+
+def test_sort_keeps_missing_values_last_in_both_directions():
+    ascending = query_table(DF, TableQuery(sort_by="Valor", page_size=10))
+    descending = query_table(DF, TableQuery(sort_by="Valor", ascending=False, page_size=10))
+
+    assert ascending.page["Valor"].tolist()[:4] == [2.0, 2.5, 3.0, 12.0]
+    assert descending.page["Produto"].tolist() == ["Bolo de Pote", "Brigadeiro", "Beijinho", "Cajuzinho", "Brownie"]
+    assert descending.rows().index.tolist() == [2, 0, 1, 4, 3]
+
+
+def test_page_is_clamped_and_empty_results_have_one_page():
+    assert query_table(DF, TableQuery(page=9, page_size=2)).page_number == 3
+
+    empty = query_table(DF, TableQuery(search="pudim"))
+    assert empty.page.empty and empty.page_count == 1 and empty.first_row == 0
+
+
+def test_unfiltered_unsorted_rows_are_the_frame_itself():
+    assert query_table(DF, TableQuery()).rows() is DF
+    with pytest.raises(ValueError):
+        TableQuery(page_size=0)
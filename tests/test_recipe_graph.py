@@ -0,0 +1,144 @@
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from src.domain.cost_analysis_service import CostAnalysisService
+from src.domain.margin_analysis import margins
+from src.domain.recipe_graph import RecipeCycleError, RecipeGraph
+from src.ports.data_source import DataSource
+
+# Ganache is used by Bolo Trufado, which is used (as a slice) by Kit Festa
+COSTS = pd.DataFrame({
+    "recipe": ["Ganache", "Ganache", "Bolo Trufado", "Bolo Trufado", "Kit Festa", "Kit Festa", "Brigadeiro"],
+    "ingredient": ["Chocolate", "Creme de Leite", "Farinha", "ganache ", "Bolo Trufado", "Caixa", "Chocolate"],
+    "qty": [2, 1, 3, 0.5, 2, 1, 0.1],
+    "unit_price": [10.0, 4.0, 2.0, None, None, 1.5, 10.0],
+    "rendimento": [None, None, 10, None, None, None, None],
+})
+
+
+def test_costs_roll_up_through_sub_recipes():
+    costs = RecipeGraph(COSTS).costs()
+
+    assert costs["Ganache"] == Decimal("24")  # 2 * 10 + 1 * 4
+    assert costs["Bolo Trufado"] == Decimal("18")  # 3 * 2 + 0.5 * 24
+    assert costs["Kit Festa"] == Decimal("5.1")  # 2 slices of 18 / 10 + 1.5
+    assert costs["Brigadeiro"] == Decimal("1")
+
+
+def test_sub_recipes_come_first_in_topological_order():
+    graph = RecipeGraph(COSTS)
+    order = graph.recipes
+
+    assert order.index("Ganache") < order.index("Bolo Trufado") < order.index("Kit Festa")
+    assert graph.is_intermediate("Ganache") and not graph.is_intermediate("Kit Festa")
+    assert graph.unit_costs()["Bolo Trufado"] == Decimal("1.8")
+
+
+def test_intermediate_costs_are_memoized():
+    graph = RecipeGraph(COSTS)
+    graph.cost("Kit Festa")
+    computed = graph.recomputations
+
+    graph.cost("Bolo Trufado")
+    graph.costs()
+
+    assert computed == 3  # Ganache, Bolo Trufado, Kit Festa
+    assert graph.recomputations == 4  # only Brigadeiro was left
+
+
+def test_price_change_recomputes_only_affected_recipes():
+    graph = RecipeGraph(COSTS)
+    graph.costs()
+    before = graph.recomputations
+
+    affected = graph.set_price("Creme de Leite", 6)
+    costs = graph.costs()
+
+    assert affected == ["Bolo Trufado", "Ganache", "Kit Festa"]
+    assert graph.recomputations - before == 3  # Brigadeiro kept its memoized cost
+    assert costs["Ganache"] == Decimal("26")
+    assert costs["Kit Festa"] == Decimal("5.3")
+    assert graph.set_price("Caixa", 1.5) == []
+
+
+def test_scale_price_compounds_and_lists_raw_ingredients_only():
+    graph = RecipeGraph(COSTS)
+
+    assert graph.ingredients == ["Caixa", "Chocolate", "Creme de Leite", "Farinha"]
+    graph.scale_price("Chocolate", "1.1")
+    graph.scale_price("Chocolate", "1.1")
+
+    assert graph.cost("Brigadeiro") == Decimal("1.21")
+    assert graph.cost("Ganache") == Decimal("28.2")  # 2 * 12.1 + 4
+
+
+def test_copy_keeps_the_original_graph_unchanged():
+    graph = RecipeGraph(COSTS)
+    what_if = graph.copy()
+
+    what_if.set_price("chocolate", 12)
+
+    assert what_if.cost("Brigadeiro") == Decimal("1.2")
+    assert graph.cost("Brigadeiro") == Decimal("1")
+
+
+def test_cycle_is_reported_with_its_path():
+    costs = pd.DataFrame({
+        "recipe": ["A", "B", "C", "C"],
+        "ingredient": ["B", "C", "A", "Açúcar"],
+        "qty": [1, 1, 1, 1],
+        "unit_price": [None, None, None, 2],
+    })
+
+    with pytest.raises(RecipeCycleError) as error:
+        RecipeGraph(costs)
+
+    assert error.value.cycle == ["A", "B", "C", "A"]
+    assert isinstance(error.value, ValueError)
+
+
+def test_unknown_names_and_recipe_prices_are_rejected():
+    graph = RecipeGraph(COSTS)
+
+    with pytest.raises(KeyError):
+        graph.cost("Pudim")
+    with pytest.raises(KeyError):
+        graph.set_price("Açafrão", 1)
+    with pytest.raises(ValueError):
+        graph.set_price("Ganache", 1)
+
+
+class VersionedDataSource(DataSource):
+    def __init__(self):
+        self.version = "v1"
+        self.reads = 0
+
+    def get_data(self, sheet_name):
+        self.reads += 1
+        return COSTS
+
+    def get_version(self, sheet_name):
+        return self.version
+
+
+def test_service_rebuilds_the_graph_only_when_the_version_changes():
+    source = VersionedDataSource()
+    service = CostAnalysisService(source)
+
+    assert service.calculate_nested_cost_per_recipe()["Kit Festa"] == Decimal("5.1")
+    assert service.recipe_graph() is service.recipe_graph()
+    source.version = "v2"
+    service.recipe_graph()
+
+    assert source.reads == 2
+
+
+def test_margins_use_rolled_up_unit_costs():
+    sales = pd.DataFrame({"Produto": ["Bolo Trufado"], "Quantidade": [10], "Valor": [50.0]})
+
+    row = margins(COSTS, sales, period=None).iloc[0]
+
+    assert row["unit_cost"] == pytest.approx(1.8)
+    assert row["contribution"] == pytest.approx(32.0)
@@ -0,0 +1,110 @@
+import pandas as pd
+import pytest
+
+from src.domain.sales_timeseries import SalesTimeSeries, SalesTimeSeriesService, best_granularity
+from src.ports.data_source import DataSource
+
+SALES = pd.DataFrame({
+    "Data": ["29/01/2024", "30/01/2024", "30/01/2024", "05/02/2024", "não informado"],
+    "Produto": ["Brigadeiro", "Brigadeiro", "Bolo", "Bolo", "Bolo"],
+    "Categoria": ["Doces", "Doces", "Bolos", "Bolos", "Bolos"],
+    "Quantidade": [10, 5, 1, 2, 1],
+    "Valor": [30.0, 15.0, 40.0, 80.0, 40.0],
+})
+
+
+def test_daily_weekly_and_monthly_totals():
+    ts = SalesTimeSeries()
+    ts.update(SALES)
+
+    daily = ts.series("D")
+    assert daily["revenue"].tolist() == [30.0, 55.0, 80.0]
+    assert daily["sales"].tolist() == [1, 2, 1]
+    assert daily["ticket"].tolist() == [30.0, 27.5, 80.0]
+    # 29 and 30/01 are the same week (starting Monday 29/01)
+    assert ts.series("W")["period"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-29", "2024-02-05"]
+    assert ts.series("M")["units"].tolist() == [16.0, 2.0]
+    assert ts.skipped_rows == 1
+
+
+def test_series_by_category_within_a_range():
+    ts = SalesTimeSeries()
+    ts.update(SALES)
+
+    result = ts.series("D", by="category", start="2024-01-30", end="2024-01-30")
+
+    assert result[["category", "revenue"]].values.tolist() == [["Bolos", 40.0], ["Doces", 15.0]]
+    with pytest.raises(ValueError):
+        ts.series("Y")
+
+
+def test_appended_rows_update_only_the_touched_periods():
+    ts = SalesTimeSeries()
+    ts.update(SALES.iloc[:4])
+    novas = pd.DataFrame({
+        "Data": ["05/02/2024", "06/03/2024"], "Produto": ["Bolo", "Pudim"], "Categoria": ["Bolos", "Doces"],
+        "Quantidade": [1, 3], "Valor": [40.0, 24.0],
+    })
+
+    processed = ts.update(pd.concat([SALES.iloc[:4], novas], ignore_index=True))
+
+    assert processed == 2
+    assert (ts.full_rebuilds, ts.incremental_updates) == (1, 1)
+    assert ts.series("M")["revenue"].tolist() == [85.0, 120.0, 24.0]
+    assert ts.series("D", by="product").query("product == 'Bolo'")["sales"].tolist() == [1, 2]
+
+
+def test_edited_rows_trigger_a_full_rebuild():
+    ts = SalesTimeSeries()
+    ts.update(SALES)
+    edited = SALES.copy()
+    edited.loc[3, "Valor"] = 1.0
+
+    ts.update(edited)
+
+    assert ts.full_rebuilds == 2
+    assert ts.series("M")["revenue"].tolist() == [85.0, 1.0]
+
+
+def test_edit_to_an_early_row_is_not_taken_as_an_append():
+    sales = pd.concat([SALES.iloc[:4]] * 3, ignore_index=True)
+    ts = SalesTimeSeries()
+    ts.update(sales)
+    edited = pd.concat([sales, SALES.iloc[:1]], ignore_index=True)
+    edited.loc[0, "Valor"] = 130.0  # first sale, many rows above the new one
+
+    assert ts.update(edited) == len(edited)
+    assert ts.full_rebuilds == 2 and ts.incremental_updates == 0
+    assert ts.series("D")["revenue"].iloc[0] == 130.0 + 30.0 * 3
+
+
+def test_best_granularity_fits_the_number_of_points():
+    assert best_granularity("2024-01-01", "2024-03-01") == "D"
+    assert best_granularity("2024-01-01", "2025-06-30") == "W"
+    assert best_granularity("2020-01-01", "2024-12-31") == "M"
+
+
+class VersionedDataSource(DataSource):
+    def __init__(self):
+        self.version = "v1"
+        self.reads = 0
+
+    def get_data(self, sheet_name):
+        self.reads += 1
+        return SALES
+
+    def get_version(self, sheet_name):
+        return self.version
+
+
+def test_service_reads_the_sheet_only_when_its_version_changes():
+    source = VersionedDataSource()
+    service = SalesTimeSeriesService(source)
+
+    service.get()
+    service.get()
+    source.version = "v2"
+    ts = service.get()
+
+    assert source.reads == 2
+    assert (ts.full_rebuilds, ts.incremental_updates) == (1, 0)  # same rows: nothing to add
@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+from src.infrastructure.sheet_diff import diff_frames, row_hashes
+
+
+def custos():
+    return pd.DataFrame({
+        "recipe": ["Brigadeiro", "Brigadeiro", "Beijinho", "Bolo"],
+        "ingredient": ["Chocolate", "Leite Condensado", "Coco", "Farinha"],
+        "qty": [2.0, 1.0, 1.5, 3.0],
+        "unit_price": [3.5, 4.0, 2.0, 1.2],
+    })
+
+
+def test_unchanged_snapshots_have_no_changes():
+    df = custos()
+
+    diff = diff_frames(df, df.copy(), ["recipe", "ingredient"])
+
+    assert diff.empty and len(diff) == 0
+    assert not diff.schema_changed
+
+
+def test_keyed_diff_reports_inserted_updated_and_deleted_rows():
+    old = custos()
+    new = old.drop(index=3)
+    new.loc[1, "qty"] = 2.0
+    new = pd.concat([new, pd.DataFrame([{"recipe": "Bolo", "ingredient": "Ovo", "qty": 4.0, "unit_price": 0.8}])])
+
+    diff = diff_frames(old, new, ["recipe", "ingredient"])
+
+    assert diff.counts() == {"inserted": 1, "updated": 1, "deleted": 1}
+    assert list(diff.inserted["ingredient"]) == ["Ovo"]
+    assert list(diff.updated["qty"]) == [2.0]
+    assert list(diff.updated_before["qty"]) == [1.0]
+    assert list(diff.updated.index) == [1]
+    assert list(diff.deleted["ingredient"]) == ["Farinha"]
+
+
+def test_without_keys_an_edit_is_a_delete_and_an_insert():
+    old = custos()
+    new = old.copy()
+    new.loc[0, "unit_price"] = 3.9
+
+    diff = diff_frames(old, new)
+
+    assert diff.counts() == {"inserted": 1, "updated": 0, "deleted": 1}
+    assert diff.deleted["unit_price"].tolist() == [3.5]
+
+
+def test_reordered_rows_and_columns_are_not_changes():
+    old = custos()
+    new = old.iloc[::-1][["unit_price", "qty", "ingredient", "recipe"]]
+
+    assert diff_frames(old, new).empty
+    assert diff_frames(old, new, ["recipe", "ingredient"]).empty
+
+
+def test_repeated_rows_are_paired_in_order():
+    old = pd.concat([custos(), custos().iloc[:2]], ignore_index=True)
+
+    diff = diff_frames(old, custos())
+
+    assert diff.counts() == {"inserted": 0, "updated": 0, "deleted": 2}
+    assert list(diff.deleted.index) == [4, 5]
+
+
+def test_categorical_and_dtype_changes_compare_values():
+    old = custos()
+    new = old.astype({"recipe": "category", "qty": object})
+
+    assert diff_frames(old, new).empty
+    assert (row_hashes(old, ["recipe"]) == row_hashes(old.astype({"recipe": "category"}), ["recipe"])).all()
+
+
+def test_new_columns_replace_the_whole_snapshot():
+    old = custos()
+    new = old.assign(rendimento=1)
+
+    diff = diff_frames(old, new)
+
+    assert diff.schema_changed
+    assert len(diff.deleted) == len(diff.inserted) == 4
+    assert diff_frames(None, old).schema_changed
+    with pytest.raises(ValueError, match="nome"):
+        diff_frames(old, old.iloc[:2], ["nome"])
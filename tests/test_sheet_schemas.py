@@ -0,0 +1,58 @@
+import pandas as pd
+
+from src.infrastructure.sheet_schemas import SHEET_SCHEMAS, parse_brazilian_number
+
+
+def test_parse_brazilian_number_handles_currency_and_separators():
+    values = pd.Series(["R$ 1.234,56", "12,5", 7, "", "abc", "1.234.567", "15%"], dtype=object)
+
+    parsed = parse_brazilian_number(values)
+
+    assert parsed.iloc[0] == 1234.56
+    assert parsed.iloc[1] == 12.5
+    assert parsed.iloc[2] == 7
+    assert pd.isna(parsed.iloc[3]) and pd.isna(parsed.iloc[4])
+    assert parsed.iloc[5] == 1234567
+    assert parsed.iloc[6] == 15
+
+
+def test_vendas_schema_types_columns_and_reports_memory_saved():
+    n = 300
+    df = pd.DataFrame({
+        "Data": ["01/02/2024", "15/02/2024", "28/02/2024"] * (n // 3),
+        "produto": ["Brigadeiro", "Beijinho", "Bolo de Pote"] * (n // 3),
+        "Quantidade": [1, 2, 3] * (n // 3),
+        "Valor": ["R$ 10,50", "7", "1.200,00"] * (n // 3),
+        "Observação": ["x"] * n,
+    })
+
+    typed, report = SHEET_SCHEMAS["Vendas Diárias"].apply(df)
+
+    assert typed["Data"].iloc[1] == pd.Timestamp(2024, 2, 15)
+    assert isinstance(typed["produto"].dtype, pd.CategoricalDtype)
+    assert typed["Quantidade"].dtype == "int64"
+    assert typed["Valor"].iloc[2] == 1200.0
+    assert typed["Observação"].dtype == object
+    assert list(typed.select_dtypes(include=["number"]).columns) == ["Quantidade", "Valor"]
+    assert report.bytes_saved > 0
+    assert report.invalid_values == {}
+
+
+def test_unparseable_cells_are_counted_in_report():
+    df = pd.DataFrame({"recipe": ["Bolo", "Bolo"], "qty": [1, "dois"], "unit_price": [2.5, ""]})
+
+    typed, report = SHEET_SCHEMAS["Custos"].apply(df)
+
+    assert report.invalid_values == {"qty": 1}
+    assert typed["unit_price"].isna().iloc[1]
+
+
+def test_integral_columns_keep_one_dtype_whatever_their_size():
+    schema = SHEET_SCHEMAS["Vendas Diárias"]
+    small, _ = schema.apply(pd.DataFrame({"Quantidade": [1, 2], "Valor": ["10", "20"]}))
+    large, _ = schema.apply(pd.DataFrame({"Quantidade": [300, 70000], "Valor": ["10", "20"]}))
+
+    assert small["Quantidade"].dtype == large["Quantidade"].dtype == "int64"
+    assert pd.concat([small, large])["Quantidade"].dtype == "int64"
+    # 2 * 20000 would wrap around in int16
+    assert (small["Quantidade"] * 20000).tolist() == [20000, 40000]
@@ -0,0 +1,169 @@
+from decimal import Decimal
+
+import pytest
+
+from benchmarks.sheets_server import SheetsStubServer, _parse_range, _user_entered
+from src.infrastructure.background_refresher import BackgroundRefresher
+from src.infrastructure.cached_data_source import CachedDataSource
+from src.infrastructure.federated_data_source import FederatedDataSource
+from src.infrastructure.google_sheets_adapter import GoogleSheetsAdapter
+from src.infrastructure.incremental_sync import IncrementalSyncDataSource
+from src.infrastructure.sheet_schemas import SHEET_SCHEMAS
+from src.infrastructure.snapshot_data_source import SnapshotDataSource
+from src.infrastructure.throttling import Backoff
+from src.ports.data_source import DataSourceError, QuotaExceededError
+
+SHEETS = {
+    "Custos": [["recipe", "ingredient", "qty", "unit_price"], ["Brigadeiro", "Leite", 2, 5.5], ["Beijinho", "Coco", 1, 3]],
+    "Vendas Diárias": [["Data", "Produto", "Valor"], ["01/03/2024", "Brigadeiro", "10.5"]],
+}
+
+
+@pytest.fixture
+def server():
+    with SheetsStubServer(SHEETS) as stub:
+        yield stub
+
+
+def _adapter(server, max_retries=3):
+    return GoogleSheetsAdapter(
+        sheet_id="stub", endpoint=server.url, schemas=SHEET_SCHEMAS,
+        backoff=Backoff(max_retries=max_retries, sleep=lambda seconds: None),
+    )
+
+
+def test_adapter_reads_sheets_over_http(server):
+    adapter = _adapter(server)
+
+    df = adapter.get_data("Custos")
+    frames = adapter.get_many(["Custos", "Vendas Diárias"])
+
+    assert df["qty"].tolist() == [2, 1]
+    assert df["unit_price"].tolist() == [5.5, 3.0]
+    assert frames["Vendas Diárias"]["Valor"].iloc[0] == 10.5
+    assert server.request_counts["batchGet"] == 1
+    assert server.request_counts["metadata"] == 2  # open + worksheet lookup, once
+
+
+def test_version_changes_when_rows_are_appended(server):
+    adapter = _adapter(server)
+    before = adapter.get_version("Custos")
+
+    server.append_rows("Vendas Diárias", [["02/03/2024", "Beijinho", "4"]])
+
+    assert adapter.get_version("Custos") > before
+
+
+def test_injected_429_is_retried_then_surfaces_as_quota_error(server):
+    adapter = _adapter(server, max_retries=2)
+    adapter.get_version("Custos")
+
+    server.fail_next(429, 2)
+    assert len(adapter.get_many(["Custos"])["Custos"]) == 2
+    assert adapter.throttle_stats()["rate_limited_responses"] == 2
+
+    server.fail_next(429, 3)
+    with pytest.raises(QuotaExceededError):
+        adapter.get_many(["Custos"])
+
+
+def test_missing_worksheet_is_a_data_source_error(server):
+    with pytest.raises(DataSourceError):
+        _adapter(server).get_data("Nope")
+
+
+def test_incremental_sync_over_http_fetches_only_new_rows(server):
+    source = IncrementalSyncDataSource(_adapter(server), ["Vendas Diárias"], overlap=1)
+    source.get_data("Vendas Diárias")
+
+    server.append_rows("Vendas Diárias", [["02/03/2024", "Beijinho", "4"]])
+    df = source.get_data("Vendas Diárias")
+
+    assert df["Valor"].tolist() == [10.5, 4.0]
+    assert source.sync_stats()["rows_appended"] == 1
+
+
+def test_parse_range_handles_quoted_names_and_open_bounds():
+    assert _parse_range("'Vendas Diárias'!A5:F") == ("Vendas Diárias", (5, 1, None, 6))
+    assert _parse_range("'It''s'!1:1") == ("It's", (1, 1, 1, None))
+    assert _parse_range("Custos") == ("Custos", (1, 1, None, None))
+
+
+def test_appended_rows_go_out_in_one_batch_per_sheet(server, tmp_path):
+    adapter = GoogleSheetsAdapter(
+        sheet_id="stub", endpoint=server.url, schemas=SHEET_SCHEMAS,
+        write_batch_rows=100, write_delay=60, journal_path=str(tmp_path / "journal.jsonl"),
+    )
+    adapter.append_rows("Vendas Diárias", [["02/03/2024", "Beijinho", 4]])
+    adapter.append_rows("Vendas Diárias", [{"produto": "Bolo", "Valor": 30, "Data": "03/03/2024"}])
+
+    assert server.request_counts["append"] == 0
+    assert adapter.flush_writes() == 2
+    adapter.close()
+
+    assert server.request_counts["append"] == 1
+    assert server.sheets["Vendas Diárias"][-2:] == [["02/03/2024", "Beijinho", 4], ["03/03/2024", "Bolo", 30]]
+    assert (tmp_path / "journal.jsonl").read_text() == ""
+
+
+def test_failed_append_is_not_retried_in_place_and_the_retry_writes_once(server, tmp_path):
+    adapter = GoogleSheetsAdapter(
+        sheet_id="stub", endpoint=server.url, schemas=SHEET_SCHEMAS,
+        backoff=Backoff(max_retries=3, sleep=lambda seconds: None),
+        write_batch_rows=100, write_delay=60, journal_path=str(tmp_path / "journal.jsonl"),
+    )
+    adapter.append_rows("Vendas Diárias", [["02/03/2024", "Beijinho", Decimal("4.10")]])
+    rows_before = len(server.sheets["Vendas Diárias"])
+    adapter.spreadsheet  # opened (and retried) before the failure is injected
+
+    server.fail_next(503)
+    with pytest.raises(DataSourceError):
+        adapter.flush_writes()
+    assert server.status_counts[503] == 1
+    assert adapter.writer.pending() == 1
+
+    assert adapter.flush_writes() == 1
+    adapter.close()
+
+    assert server.request_counts["append"] == 2
+    assert server.sheets["Vendas Diárias"][rows_before:] == [["02/03/2024", "Beijinho", 4.1]]
+
+
+def test_appended_decimal_is_a_number_in_a_pt_br_sheet(server, tmp_path):
+    adapter = GoogleSheetsAdapter(
+        sheet_id="stub", endpoint=server.url, schemas=SHEET_SCHEMAS,
+        write_batch_rows=100, write_delay=60, journal_path=str(tmp_path / "journal.jsonl"),
+    )
+    adapter.append_rows("Vendas Diárias", [["02/03/2024", "Beijinho", Decimal("12.50")]])
+    adapter.flush_writes()
+
+    cell = adapter.spreadsheet.values_get(
+        "'Vendas Diárias'!C3", params={"valueRenderOption": "UNFORMATTED_VALUE"}
+    )["values"][0][0]
+    adapter.close()
+
+    assert cell == 12.5 and not isinstance(cell, str)
+    # Text with a "." decimal point would have stayed text in this locale
+    assert _user_entered("12.50") == "12.50"
+    assert _user_entered("1.234,50") == 1234.5
+
+
+def test_refresh_cycle_reads_the_revision_once_per_spreadsheet(server, tmp_path):
+    sheets = ["Custos", "Vendas Diárias"]
+    single = CachedDataSource(SnapshotDataSource(_adapter(server), str(tmp_path / "single")))
+    BackgroundRefresher(single, sheets).refresh_once()
+    before = server.request_counts["drive"]
+
+    BackgroundRefresher(single, sheets).refresh_once()
+    assert server.request_counts["drive"] - before == 1
+
+    stores = {
+        loja: CachedDataSource(SnapshotDataSource(_adapter(server), str(tmp_path / loja)))
+        for loja in ("Centro", "Shopping")
+    }
+    federated = CachedDataSource(FederatedDataSource(stores))
+    BackgroundRefresher(federated, sheets).refresh_once()
+    before = server.request_counts["drive"]
+
+    BackgroundRefresher(federated, sheets).refresh_once()
+    assert server.request_counts["drive"] - before == 2
@@ -0,0 +1,99 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.snapshot_data_source import SnapshotDataSource
+from src.ports.data_source import DataSource, DataSourceError
+
+
+class SwitchableDataSource(DataSource):
+    def __init__(self, frames, version="v1"):
+        self.frames = frames
+        self.version = version
+        self.online = True
+        self.data_calls = 0
+        self.gate = None
+
+    def get_data(self, sheet_name: str) -> pd.DataFrame:
+        if self.gate is not None:
+            self.gate.wait(5)
+        if not self.online:
+            raise DataSourceError("API indisponível")
+        self.data_calls += 1
+        return self.frames[sheet_name]
+
+    def get_version(self, sheet_name: str):
+        if not self.online:
+            raise DataSourceError("API indisponível")
+        return self.version
+
+
+def test_fetched_sheet_is_served_from_disk_after_restart_while_offline(tmp_path):
+    frames = {"Vendas Diárias": pd.DataFrame({"Produto": ["Bolo", "Torta"], "Valor": [10.5, 20.0]})}
+    inner = SwitchableDataSource(frames)
+    SnapshotDataSource(inner, str(tmp_path)).get_data("Vendas Diárias")
+
+    inner.online = False
+    restarted = SnapshotDataSource(inner, str(tmp_path), max_age=3600)
+    df = restarted.get_data("Vendas Diárias")
+
+    pd.testing.assert_frame_equal(df, frames["Vendas Diárias"])
+    assert restarted.get_version("Vendas Diárias") == "v1"
+
+
+def test_unknown_sheet_while_offline_raises(tmp_path):
+    inner = SwitchableDataSource({})
+    inner.online = False
+
+    with pytest.raises(DataSourceError):
+        SnapshotDataSource(inner, str(tmp_path)).get_data("Custos")
+
+
+def test_stale_snapshot_is_refreshed_in_background(tmp_path):
+    inner = SwitchableDataSource({"Custos": pd.DataFrame({"qty": [1]})})
+    snapshots = SnapshotDataSource(inner, str(tmp_path), max_age=0)
+    snapshots.get_data("Custos")
+
+    inner.version = "v2"
+    inner.frames["Custos"] = pd.DataFrame({"qty": [2]})
+    inner.gate = threading.Event()  # hold the background read until the stale copy was served
+    first = snapshots.get_data("Custos")
+    inner.gate.set()
+    snapshots.wait_for_refresh(timeout=5)
+
+    assert first.iloc[0]["qty"] == 1
+    assert snapshots.get_version("Custos") == "v2"
+    assert snapshots.get_data("Custos").iloc[0]["qty"] == 2
+
+
+def test_snapshot_frame_equals_the_live_frame_after_restart(tmp_path):
+    live = pd.DataFrame({
+        "codigo": [1, "A2", 2.5, None],
+        "Produto": pd.Categorical(["Bolo", "Torta", "Bolo", "Pudim"]),
+        "Data": pd.to_datetime(["2024-03-01", "2024-03-02", None, "2024-03-04"]),
+        "Valor": [10.5, 20.0, 7.25, 3.0],
+    })
+    inner = SwitchableDataSource({"Custos": live})
+    assert SnapshotDataSource(inner, str(tmp_path), max_age=3600).get_data("Custos") is live
+
+    inner.online = False
+    df = SnapshotDataSource(inner, str(tmp_path), max_age=3600).get_data("Custos")
+
+    pd.testing.assert_frame_equal(df, live)
+    assert [type(v) for v in df["codigo"]] == [int, str, float, type(None)]
+
+
+def test_snapshot_is_materialized_once_without_leaking_mappings(tmp_path):
+    inner = SwitchableDataSource({"Custos": pd.DataFrame({"qty": [1.0, 2.0]})})
+    SnapshotDataSource(inner, str(tmp_path)).get_data("Custos")
+    restarted = SnapshotDataSource(inner, str(tmp_path), max_age=3600)
+
+    open_files = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+    first = restarted.get_data("Custos")
+    for _ in range(20):
+        assert restarted.get_data("Custos") is first
+
+    if open_files is not None:
+        assert len(os.listdir("/proc/self/fd")) == open_files
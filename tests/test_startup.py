@@ -0,0 +1,33 @@
+from benchmarks import startup
+from benchmarks.startup import HEAVY_MODULES, check, main, measure_once
+
+
+def test_importing_app_does_not_load_heavy_modules_or_pages():
+    # One fresh interpreter; only what `import app` loads is asserted, not its timing
+    assert measure_once()["loaded"] == []
+
+
+def test_check_reports_budget_and_heavy_imports():
+    report = {"streamlit_s": 0.2, "app_s": 0.5, "loaded": ["gspread"]}
+
+    problems = check(report, budget=0.4)
+
+    assert len(problems) == 2
+    assert "gspread" in problems[1]
+    assert check({"streamlit_s": 0.2, "app_s": 0.1, "loaded": []}, budget=0.4) == []
+    assert "google.auth" in HEAVY_MODULES
+
+
+def test_main_exits_non_zero_over_budget_or_with_heavy_imports(monkeypatch, capsys):
+    reports = iter([
+        {"repeat": 1, "streamlit_s": 0.2, "app_s": 0.5, "loaded": []},
+        {"repeat": 1, "streamlit_s": 0.2, "app_s": 0.1, "loaded": ["pandas"]},
+        {"repeat": 1, "streamlit_s": 0.2, "app_s": 0.1, "loaded": []},
+    ])
+    monkeypatch.setattr(startup, "measure", lambda repeat: next(reports))
+
+    assert main(["--budget", "0.4"]) == 1
+    assert "budget is 400 ms" in capsys.readouterr().out
+    assert main(["--budget", "0.4"]) == 1
+    assert "imported at startup: pandas" in capsys.readouterr().out
+    assert main(["--budget", "0.4"]) == 0
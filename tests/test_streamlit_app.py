@@ -0,0 +1,76 @@
+import logging
+import os
+
+import pandas as pd
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+import app  # noqa: E402
+from src.ports.data_source import DataSource  # noqa: E402
+
+for _name in list(logging.root.manager.loggerDict):
+    if _name.startswith("streamlit"):
+        logging.getLogger(_name).setLevel(logging.ERROR)
+
+
+class CustosDataSource(DataSource):
+    def __init__(self):
+        self.reads = 0
+
+    def get_data(self, sheet_name):
+        self.reads += 1
+        return pd.DataFrame([
+            {"recipe": "Brigadeiro", "ingredient": "Chocolate", "qty": 2, "unit_price": 3.5},
+            {"recipe": "Beijinho", "ingredient": "Coco", "qty": 1, "unit_price": 2.0},
+        ])
+
+    def get_version(self, sheet_name):
+        return "v1"
+
+
+def test_get_service_is_shared_across_reruns_and_keeps_the_recipe_graph():
+    app.get_service.clear()
+    source = CustosDataSource()
+    try:
+        first = app.get_service(source)
+        graph = first.recipe_graph("Custos")
+        second = app.get_service(source)
+
+        assert second is first
+        assert second.recipe_graph("Custos") is graph
+        assert source.reads == 1
+    finally:
+        app.get_service.clear()
+
+
+def test_format_currency_uses_brazilian_separators():
+    assert app.format_currency(1234.5) == "R$ 1.234,50"
+
+
+class RefreshedMidReadDataSource(DataSource):
+    """The sheet changes right after the first read, before the page could ask for its version."""
+
+    def __init__(self):
+        self.version = 1
+
+    def get_data(self, sheet_name):
+        frame = pd.DataFrame({"Produto": ["Bolo"] * self.version})
+        self.version = 2
+        return frame
+
+    def get_version(self, sheet_name):
+        return f"v{self.version}"
+
+
+def test_view_model_is_keyed_by_the_versions_read_before_the_data():
+    from src.ui import common
+
+    common.get_view_cache.clear()
+    source = RefreshedMidReadDataSource()
+    totals = []
+    for _ in range(2):
+        versoes = common.sheet_versions(source, ["Cadastro Produtos"])
+        df = common.load_data_from_sheet(source, "Cadastro Produtos")
+        totals.append(common.view_model("produtos", versoes, (), lambda: len(df)))
+
+    assert totals == [1, 2]
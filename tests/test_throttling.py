@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.throttling import Backoff, SingleFlight, TokenBucket, read_once, read_once_scope
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_waits_at_quota_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_minute=60, burst=2, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(4)]
+
+    assert waits == [0.0, 0.0, 1.0, 1.0]
+    assert bucket.waits == 2
+    assert bucket.wait_seconds == 2.0
+
+
+def test_backoff_retries_retryable_errors_with_growing_jittered_delays():
+    clock = FakeClock()
+    backoff = Backoff(max_retries=3, base=1.0, cap=4.0, sleep=clock.sleep)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("429")
+        return "ok"
+
+    assert backoff.call(flaky, lambda e: isinstance(e, ConnectionError)) == "ok"
+    assert backoff.retries == 2
+    assert 0 <= clock.sleeps[0] <= 1.0 and 0 <= clock.sleeps[1] <= 2.0
+
+
+def test_backoff_gives_up_after_max_retries_and_skips_other_errors():
+    backoff = Backoff(max_retries=2, sleep=lambda _: None)
+
+    with pytest.raises(ConnectionError):
+        backoff.call(lambda: (_ for _ in ()).throw(ConnectionError()), lambda e: True)
+    with pytest.raises(KeyError):
+        backoff.call(lambda: {}["x"], lambda e: isinstance(e, ConnectionError))
+    assert backoff.retries == 2
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_fetch():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "dados"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("Custos", slow_fetch)))
+    leader.start()
+    started.wait(1)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("Custos", slow_fetch))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    for t in [leader] + followers:
+        t.join()
+
+    assert results == ["dados"] * 4
+    assert len(calls) == 1
+    assert flight.coalesced == 3
+
+
+def test_read_once_reuses_results_and_errors_only_inside_a_scope():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    def failing():
+        calls.append(1)
+        raise ValueError("offline")
+
+    assert read_once("v", fetch) == 1 and read_once("v", fetch) == 2
+    with read_once_scope():
+        assert [read_once("v", fetch) for _ in range(3)] == [3, 3, 3]
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                read_once("erro", failing)
+    assert len(calls) == 4
+    assert read_once("v", fetch) == 5
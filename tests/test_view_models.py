@@ -0,0 +1,70 @@
+import pandas as pd
+
+from src.ui.view_models import (
+    ViewModelCache, dashboard_view, get_value_column, materia_prima_view, produtos_filtered, produtos_options,
+)
+
+PRODUTOS = pd.DataFrame({
+    "Produto": ["Brigadeiro", "Beijinho", "Bolo", "Torta", "Pudim", "Brownie"],
+    "Categoria": ["Doces", "Doces", "Bolos", "Tortas", "Sobremesas", "Assados"],
+    "Preço": [3.0, 2.5, 40.0, 55.0, 30.0, 6.5],
+})
+VENDAS = pd.DataFrame({"Data": ["01/03/2024", "02/03/2024"], "Produto": ["Bolo", "Pudim"], "Valor": [40.0, 30.0]})
+
+
+def test_dashboard_view_derives_metrics_and_series():
+    vm = dashboard_view(PRODUTOS, VENDAS)
+
+    assert (vm["total_produtos"], vm["total_vendas"], vm["valor_vendas"], vm["categorias"]) == (6, 2, 70.0, 5)
+    assert vm["produtos_por_categoria"]["Doces"] == 2
+    assert len(vm["ultimos_produtos"]) == 5
+    assert dashboard_view(PRODUTOS, None)["ultimas_vendas"] is None
+
+
+def test_produtos_options_and_filter():
+    vm = produtos_options(PRODUTOS)
+
+    assert vm["preco_medio"] == PRODUTOS["Preço"].mean()
+    assert vm["categorias_padrao"] == ["Doces", "Bolos", "Tortas", "Sobremesas", "Assados"]
+    assert produtos_filtered(PRODUTOS, ("Bolos", "Tortas"))["Produto"].tolist() == ["Bolo", "Torta"]
+    assert produtos_filtered(PRODUTOS, ()) is PRODUTOS
+
+
+def test_missing_columns_yield_none_metrics():
+    vm = materia_prima_view(pd.DataFrame({"Item": ["Leite"]}))
+
+    assert vm == {"total": 1, "unidades": None, "preco_medio": None}
+    assert get_value_column(VENDAS, "Vendas Diárias") == "Valor"
+
+
+def test_cache_reuses_results_until_version_or_state_changes():
+    cache = ViewModelCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"total": len(builds)}
+
+    first = cache.get("produtos", ["v1"], ("Doces",), build)
+    assert cache.get("produtos", ["v1"], ("Doces",), build) is first
+    cache.get("produtos", ["v2"], ("Doces",), build)
+    cache.get("produtos", ["v2"], ("Bolos",), build)
+    cache.get("produtos", [None], (), build)
+    cache.get("produtos", [None], (), build)
+
+    assert len(builds) == 5
+    assert cache.stats()["entries"] == 3
+
+
+def test_cache_evicts_by_entries_and_by_frame_bytes():
+    cache = ViewModelCache(max_entries=2, max_bytes=PRODUTOS.memory_usage().sum() + 1)
+    for version in ["v1", "v2", "v3"]:
+        cache.get("p", [version], (), lambda: {"n": 1})
+    assert cache.stats()["entries"] == 2
+
+    cache.get("p", ["v4"], (), lambda: {"frame": PRODUTOS})
+    cache.get("p", ["v5"], (), lambda: {"frame": PRODUTOS.copy()})
+
+    assert cache.stats()["entries"] <= 2
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    assert cache.evictions >= 2
@@ -0,0 +1,114 @@
+import datetime as dt
+import json
+import time
+from decimal import Decimal
+
+import pytest
+
+from src.infrastructure.write_buffer import WriteBehindBuffer
+from src.ports.data_source import DataSourceError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Sink:
+    def __init__(self):
+        self.batches = []
+        self.failing = False
+
+    def __call__(self, sheet_name, rows):
+        if self.failing:
+            raise DataSourceError("API down")
+        self.batches.append((sheet_name, list(rows)))
+
+
+def test_flush_is_due_on_size_or_age_threshold():
+    clock = FakeClock()
+    buffer = WriteBehindBuffer(Sink(), max_rows=3, max_delay=5.0, clock=clock)
+
+    buffer.add("Vendas", [["a"], ["b"]])
+    assert not buffer.flush_due()
+    buffer.add("Vendas", [["c"]])
+    assert buffer.flush_due()
+
+    buffer.flush()
+    buffer.add("Vendas", [["d"]])
+    clock.now = 4.9
+    assert not buffer.flush_due()
+    clock.now = 5.0
+    assert buffer.flush_due()
+
+
+def test_flush_sends_one_ordered_batch_per_sheet():
+    sink = Sink()
+    buffer = WriteBehindBuffer(sink)
+    buffer.add("Vendas", [["a"]])
+    buffer.add("Custos", [["x"]])
+    buffer.add("Vendas", [{"Produto": "b"}])
+
+    assert buffer.flush() == 3
+    assert sink.batches == [("Vendas", [["a"], {"Produto": "b"}]), ("Custos", [["x"]])]
+    assert buffer.pending() == 0
+    assert buffer.stats()["flushes"] == 2
+
+
+def test_failed_write_keeps_rows_in_journal_and_they_survive_a_restart(tmp_path):
+    journal = tmp_path / "vendas.jsonl"
+    sink = Sink()
+    sink.failing = True
+    buffer = WriteBehindBuffer(sink, journal_path=str(journal), retry_delay=30.0)
+    buffer.add("Vendas", [["01/03/2024", "Brigadeiro", 10.5]])
+
+    with pytest.raises(DataSourceError):
+        buffer.flush()
+    assert buffer.pending("Vendas") == 1
+    assert buffer.stats()["last_error"] == "Vendas: API down"
+    assert not buffer.flush_due()  # waiting for the retry delay
+    assert len(journal.read_text().splitlines()) == 1
+
+    # A new process finds the unsent row in the journal
+    sink.failing = False
+    restarted = WriteBehindBuffer(sink, journal_path=str(journal))
+    assert restarted.pending() == 1
+    assert restarted.flush() == 1
+    assert sink.batches == [("Vendas", [["01/03/2024", "Brigadeiro", 10.5]])]
+    assert journal.read_text() == ""
+
+
+def test_journal_ignores_a_line_cut_short_by_a_crash(tmp_path):
+    journal = tmp_path / "vendas.jsonl"
+    journal.write_text(json.dumps({"id": "1", "sheet": "Vendas", "row": ["a"]}) + "\n" + '{"id": "2", "sh')
+
+    assert WriteBehindBuffer(Sink(), journal_path=str(journal)).pending() == 1
+
+
+def test_values_are_made_json_friendly():
+    sink = Sink()
+    buffer = WriteBehindBuffer(sink)
+    buffer.add("Vendas", [[dt.date(2024, 3, 1), Decimal("10.50"), float("nan"), None],
+                          {"Data": dt.datetime(2024, 3, 1, 14, 30)}])
+    buffer.flush()
+
+    assert sink.batches[0][1] == [["2024-03-01", 10.5, None, None], {"Data": "2024-03-01 14:30:00"}]
+
+
+def test_background_thread_flushes_after_delay_and_close_flushes_the_rest():
+    sink = Sink()
+    buffer = WriteBehindBuffer(sink, max_rows=100, max_delay=0.05).start()
+    buffer.add("Vendas", [["a"]])
+
+    deadline = time.monotonic() + 2
+    while not sink.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sink.batches == [("Vendas", [["a"]])]
+
+    buffer.max_delay = 60
+    buffer.add("Vendas", [["b"]])
+    buffer.close(timeout=2)
+    assert sink.batches[-1] == ("Vendas", [["b"]])